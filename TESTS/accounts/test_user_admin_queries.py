@@ -0,0 +1,44 @@
+"""Query-count regression tests for the user admin changelists."""
+
+import pytest
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+
+from accounts.models import UserProfile
+
+User = get_user_model()
+
+
+def _create_users(start, count):
+    """Create verified users with profiles."""
+    for index in range(start, start + count):
+        user = User.objects.create_user(
+            username=f"reader{index}",
+            email=f"reader{index}@test.com",
+        )
+        EmailAddress.objects.create(
+            user=user,
+            email=user.email,
+            verified=index % 2 == 0,
+            primary=True,
+        )
+        UserProfile.objects.get_or_create(
+            user=user, defaults={"display_name": f"Reader {index}"}
+        )
+
+
+@pytest.mark.django_db
+class TestUserAdminQueries:
+    """User changelist query count must not grow with the number of rows."""
+
+    def test_user_changelist_query_count_is_constant(
+        self, admin_changelist_queries
+    ):
+        """User changelist runs the same queries for 3 and 9 users."""
+        _create_users(0, 3)
+        baseline = admin_changelist_queries("admin:auth_user_changelist")
+
+        _create_users(3, 6)
+        assert (
+            admin_changelist_queries("admin:auth_user_changelist") == baseline
+        )
@@ -0,0 +1,51 @@
+"""Tests for the benchmark data generator and regression gate."""
+
+import pytest
+
+from benchmarks.data import generate_dataset
+from benchmarks.run import compare, percentile
+from orders.models import AccessEntitlement
+from products.models import Product
+from reviews.models import Review
+
+
+def test_percentile_uses_nearest_rank():
+    """Percentiles pick an observed sample."""
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_compare_flags_query_and_latency_regressions():
+    """More queries or a p95 beyond the tolerance count as regressions."""
+    baseline = {
+        "home": {"p95_ms": 10.0, "queries": 5},
+        "cart": {"p95_ms": 10.0, "queries": 5},
+    }
+    results = {
+        "home": {"p95_ms": 14.0, "queries": 6},
+        "cart": {"p95_ms": 16.0, "queries": 5},
+        "new": {"p95_ms": 99.0, "queries": 99},
+    }
+
+    regressions = compare(results, baseline, tolerance=0.5)
+
+    assert regressions == [
+        "home: 6 queries (baseline 5)",
+        "cart: p95 16.0ms (baseline 10.0ms, limit 15.00ms)",
+    ]
+
+
+@pytest.mark.django_db
+def test_generate_dataset_creates_requested_rows():
+    """The generator creates the requested volume with a clean shopper."""
+    dataset = generate_dataset(
+        products=20, categories=3, banners=4, users=5, orders=30, reviews=25
+    )
+
+    assert Product.objects.count() == 20
+    assert AccessEntitlement.objects.count() == 30
+    assert Review.objects.count() == 25
+    assert not AccessEntitlement.objects.filter(user=dataset.shopper).exists()
+    assert Product.objects.filter(is_deal=True).exists()
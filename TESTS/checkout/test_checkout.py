@@ -1,7 +1,9 @@
 from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 
@@ -153,9 +155,11 @@ def test_double_post_reuses_recent_pending_order_and_does_not_duplicate(
 
 
 @pytest.mark.django_db
-def test_checkout_marks_stale_pending_orders_as_failed(client, verified_user):
+def test_checkout_leaves_stale_pending_orders_to_the_sweeper(
+    client, verified_user
+):
     """
-    Ensure stale pending orders are marked as failed when starting checkout.
+    Ensure checkout no longer sweeps stale orders; the batch job does.
     """
 
     user = verified_user
@@ -203,5 +207,10 @@ def test_checkout_marks_stale_pending_orders_as_failed(client, verified_user):
 
     assert response.status_code in (302, 303)
 
+    stale_order.refresh_from_db()
+    assert stale_order.status == "pending"
+
+    call_command("expire_pending_orders", stdout=StringIO())
+
     stale_order.refresh_from_db()
     assert stale_order.status == "failed"
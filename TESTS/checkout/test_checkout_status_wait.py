@@ -0,0 +1,123 @@
+"""Tests for the long-poll checkout status endpoint."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from checkout.notifications import (
+    get_order_version,
+    notify_order_status,
+    wait_for_order_notification,
+)
+
+
+def _wait_url(order):
+    return reverse(
+        "checkout_status_wait",
+        kwargs={"order_number": order.order_number},
+    )
+
+
+@pytest.mark.django_db
+class TestCheckoutStatusWait:
+    """Test the held-open status request used by the success page."""
+
+    def test_returns_immediately_when_status_already_changed(
+        self, client, verified_user, order_paid
+    ):
+        """A client still showing pending gets the paid status at once."""
+        client.force_login(verified_user)
+
+        with patch("checkout.views.wait_for_order_notification") as waiter:
+            response = client.get(_wait_url(order_paid), {"since": "pending"})
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "paid", "changed": True}
+        waiter.assert_not_called()
+
+    def test_times_out_with_unchanged_status(
+        self, client, settings, verified_user, order_pending
+    ):
+        """The request is released with the same status after the wait."""
+        settings.CHECKOUT_STATUS_WAIT_SECONDS = 0.2
+        settings.CHECKOUT_STATUS_RECHECK_SECONDS = 0.05
+        client.force_login(verified_user)
+
+        with patch("checkout.views._set_stripe_key", return_value=False):
+            response = client.get(
+                _wait_url(order_pending), {"since": "pending"}
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "pending", "changed": False}
+
+    def test_other_users_order_is_not_found(self, client, order_pending):
+        """Users cannot wait on orders that belong to someone else."""
+        other = get_user_model().objects.create_user(
+            username="other",
+            email="other@test.com",
+            password=get_random_string(12),
+        )
+        EmailAddress.objects.create(
+            user=other, email=other.email, verified=True, primary=True
+        )
+        client.force_login(other)
+
+        response = client.get(_wait_url(order_pending))
+
+        assert response.status_code == 404
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_webhook_notifies_waiters_after_commit(
+        self,
+        mock_construct,
+        client,
+        order_pending,
+        django_capture_on_commit_callbacks,
+    ):
+        """Processing a paid webhook publishes the order status change."""
+        mock_construct.return_value = {
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "id": "cs_test_wait",
+                    "payment_intent": "pi_test_wait",
+                    "payment_status": "paid",
+                    "metadata": {"order_id": str(order_pending.id)},
+                }
+            },
+        }
+        before = get_order_version(order_pending.order_number)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(
+                reverse("stripe_webhook"),
+                data="{}",
+                content_type="application/json",
+                HTTP_STRIPE_SIGNATURE="test_sig",
+            )
+
+        assert get_order_version(order_pending.order_number) > before
+
+
+def test_notification_wakes_waiting_thread():
+    """A waiting thread returns as soon as the order is notified."""
+    order_number = "WAKEUPTEST000001"
+    version = get_order_version(order_number)
+    results = []
+
+    waiter = threading.Thread(
+        target=lambda: results.append(
+            wait_for_order_notification(order_number, version, timeout=5)
+        )
+    )
+    waiter.start()
+    notify_order_status(order_number)
+    waiter.join(timeout=5)
+
+    assert results == [True]
@@ -0,0 +1,192 @@
+"""Tests for the Stripe webhook inbox and its worker."""
+
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from checkout.models import ProcessedWebhookEvent, WebhookEvent
+from checkout.webhooks import process_webhook_event, webhook_queue_stats
+from orders.models import AccessEntitlement
+
+
+def _paid_event(order, event_id="evt_test_inbox"):
+    return {
+        "id": event_id,
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {
+                "id": "cs_test_inbox",
+                "payment_intent": "pi_test_inbox",
+                "payment_status": "paid",
+                "metadata": {"order_id": str(order.id)},
+            }
+        },
+    }
+
+
+def _post_webhook(client):
+    return client.post(
+        reverse("stripe_webhook"),
+        data="{}",
+        content_type="application/json",
+        HTTP_STRIPE_SIGNATURE="test_sig",
+    )
+
+
+@pytest.mark.django_db
+class TestWebhookInbox:
+    """Test durable storage and deferred processing of webhook events."""
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_async_mode_stores_event_and_returns_immediately(
+        self, mock_construct, client, settings, order_pending
+    ):
+        """In async mode the order is untouched until the worker runs."""
+        settings.STRIPE_WEBHOOK_ASYNC = True
+        mock_construct.return_value = _paid_event(order_pending)
+
+        response = _post_webhook(client)
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "queued"}
+        order_pending.refresh_from_db()
+        assert order_pending.status == "pending"
+
+        event = WebhookEvent.objects.get(stripe_event_id="evt_test_inbox")
+        assert event.status == WebhookEvent.STATUS_PENDING
+        assert event.event_type == "checkout.session.completed"
+        assert webhook_queue_stats()["pending"] == 1
+
+        out = StringIO()
+        call_command("process_webhooks", stdout=out)
+
+        order_pending.refresh_from_db()
+        event.refresh_from_db()
+        assert order_pending.status == "paid"
+        assert event.status == WebhookEvent.STATUS_PROCESSED
+        assert event.attempts == 1
+        assert "Processed 1" in out.getvalue()
+        assert webhook_queue_stats()["pending"] == 0
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_redelivery_is_stored_once(
+        self, mock_construct, client, settings, order_pending
+    ):
+        """Stripe retries of the same event do not create new inbox rows."""
+        settings.STRIPE_WEBHOOK_ASYNC = True
+        mock_construct.return_value = _paid_event(order_pending)
+
+        _post_webhook(client)
+        _post_webhook(client)
+
+        assert WebhookEvent.objects.count() == 1
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_failed_processing_is_retried_then_given_up(
+        self, mock_construct, client, settings, verified_user, order_pending
+    ):
+        """Handler errors schedule a retry and fail after max attempts."""
+        settings.STRIPE_WEBHOOK_ASYNC = True
+        mock_construct.return_value = _paid_event(order_pending)
+        _post_webhook(client)
+        event = WebhookEvent.objects.get()
+
+        with patch(
+            "checkout.webhooks.grant_entitlements_for_order",
+            side_effect=RuntimeError("database hiccup"),
+        ):
+            assert process_webhook_event(event.pk, max_attempts=2) is False
+            event.refresh_from_db()
+            assert event.status == WebhookEvent.STATUS_PENDING
+            assert event.attempts == 1
+            assert "database hiccup" in event.last_error
+            assert event.next_attempt_at > event.received_at
+
+            assert process_webhook_event(event.pk, max_attempts=2) is False
+            event.refresh_from_db()
+            assert event.status == WebhookEvent.STATUS_FAILED
+
+        # The failed attempt rolled back, so nothing was half-applied.
+        order_pending.refresh_from_db()
+        assert order_pending.status == "pending"
+        assert not AccessEntitlement.objects.filter(
+            user=verified_user
+        ).exists()
+        assert webhook_queue_stats()["failed"] == 1
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_inline_mode_processes_before_responding(
+        self, mock_construct, client, order_pending
+    ):
+        """Without async mode the event is stored and processed at once."""
+        mock_construct.return_value = _paid_event(order_pending)
+
+        response = _post_webhook(client)
+
+        assert response.status_code == 200
+        order_pending.refresh_from_db()
+        assert order_pending.status == "paid"
+        assert (
+            WebhookEvent.objects.get().status == WebhookEvent.STATUS_PROCESSED
+        )
+
+
+@pytest.mark.django_db
+class TestWebhookDeduplication:
+    """Test the processed-event ledger that short-circuits redeliveries."""
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_redelivery_costs_one_lookup_and_skips_handlers(
+        self, mock_construct, client, order_pending, django_assert_num_queries
+    ):
+        """A replayed event is answered from the ledger alone."""
+        mock_construct.return_value = _paid_event(order_pending)
+        _post_webhook(client)
+        assert ProcessedWebhookEvent.objects.filter(
+            pk="evt_test_inbox"
+        ).exists()
+
+        with patch("checkout.webhooks._dispatch_event") as dispatch:
+            with django_assert_num_queries(1):
+                response = _post_webhook(client)
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "duplicate"}
+        dispatch.assert_not_called()
+
+    @patch("checkout.webhooks.stripe.Webhook.construct_event")
+    def test_ledger_survives_inbox_pruning(
+        self, mock_construct, client, order_pending
+    ):
+        """Pruned inbox rows are still recognised as duplicates."""
+        mock_construct.return_value = _paid_event(order_pending)
+        _post_webhook(client)
+        WebhookEvent.objects.all().delete()
+
+        with patch("checkout.webhooks._dispatch_event") as dispatch:
+            response = _post_webhook(client)
+
+        assert response.json() == {"status": "duplicate"}
+        assert not WebhookEvent.objects.exists()
+        dispatch.assert_not_called()
+
+    def test_failed_attempt_does_not_record_event(self, order_pending):
+        """The ledger entry rolls back with a failed handler."""
+        event = WebhookEvent.objects.create(
+            stripe_event_id="evt_test_rollback",
+            event_type="checkout.session.completed",
+            payload=_paid_event(order_pending, "evt_test_rollback"),
+        )
+
+        with patch(
+            "checkout.webhooks._dispatch_event",
+            side_effect=RuntimeError("boom"),
+        ):
+            assert process_webhook_event(event.pk) is False
+
+        assert not ProcessedWebhookEvent.objects.filter(
+            pk="evt_test_rollback"
+        ).exists()
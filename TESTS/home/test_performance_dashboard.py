@@ -0,0 +1,119 @@
+"""Tests for the staff performance dashboard."""
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from checkout.models import WebhookEvent
+from elysium_archive import metrics
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    """Start every test with empty buffers."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestMetricBuffers:
+    """Test the in-process ring buffers."""
+
+    def test_percentiles_use_recent_samples_only(self):
+        """Old timings fall out of the per-view ring buffer."""
+        for _ in range(metrics.RECENT_SAMPLES):
+            metrics.record("view", 1000.0, 0, 0, 1)
+        for _ in range(metrics.RECENT_SAMPLES):
+            metrics.record("view", 10.0, 0, 0, 1)
+
+        stats = metrics.snapshot()["view"]
+        assert stats["count"] == 2 * metrics.RECENT_SAMPLES
+        assert stats["p99_ms"] == 10.0
+        assert stats["max_ms"] == 1000.0
+
+    def test_slow_query_buffer_is_bounded_and_sorted(self):
+        """Only the newest statements are kept, slowest first."""
+        for index in range(metrics.SLOW_QUERY_BUFFER + 10):
+            metrics.record_slow_query(f"SELECT {index}", index, "v", "x:1")
+
+        entries = metrics.slow_queries()
+        assert len(entries) == metrics.SLOW_QUERY_BUFFER
+        assert entries[0]["sql"] == f"SELECT {metrics.SLOW_QUERY_BUFFER + 9}"
+        assert entries[-1]["sql"] == "SELECT 10"
+
+    def test_cache_hit_rate(self):
+        """Hits and misses are counted per cache name."""
+        metrics.record_cache("entitlements", hit=True)
+        metrics.record_cache("entitlements", hit=True)
+        metrics.record_cache("entitlements", hit=False)
+
+        assert metrics.cache_stats()["entitlements"] == {
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": 0.6667,
+        }
+
+
+@pytest.mark.django_db
+class TestSlowQueryCapture:
+    """Test slow statement capture by the middleware."""
+
+    @override_settings(
+        REQUEST_METRICS_ENABLED=True, REQUEST_METRICS_SLOW_QUERY_MS=0
+    )
+    def test_slow_queries_record_project_call_site(
+        self, client, product_active
+    ):
+        """Captured statements point at the project code that ran them."""
+        client.get(reverse("archive"))
+
+        entries = metrics.slow_queries()
+        assert entries
+        assert {entry["view"] for entry in entries} == {
+            "products.views.ProductListView"
+        }
+        assert all(
+            not entry["call_site"].startswith("elysium_archive/metrics.py")
+            for entry in entries
+        )
+        assert any(
+            entry["call_site"].startswith(("products/", "templates/"))
+            for entry in entries
+        )
+
+
+@pytest.mark.django_db
+class TestPerformanceDashboard:
+    """Test access to and content of the dashboard."""
+
+    @override_settings(REQUEST_METRICS_ENABLED=True)
+    def test_staff_sees_endpoints_and_webhook_lag(self, client, staff_user):
+        """The dashboard lists recorded views and the webhook queue."""
+        WebhookEvent.objects.create(
+            stripe_event_id="evt_dash", event_type="x", payload={}
+        )
+        client.force_login(staff_user)
+        client.get(reverse("home"))
+
+        response = client.get(reverse("performance_dashboard"))
+
+        assert response.status_code == 200
+        assert "home.views.home_view" in response.context["views"]
+        assert response.context["webhooks"]["pending"] == 1
+        assert b"Performance Dashboard" in response.content
+
+    def test_reset_clears_metrics(self, client, staff_user):
+        """Staff can clear the buffers with a POST."""
+        metrics.record("view", 5.0, 0, 0, 1)
+        client.force_login(staff_user)
+
+        response = client.post(reverse("performance_dashboard_reset"))
+
+        assert response.status_code == 302
+        assert metrics.snapshot() == {}
+
+    def test_regular_user_is_redirected(self, client, verified_user):
+        """Non-staff users cannot see the dashboard."""
+        client.force_login(verified_user)
+        response = client.get(reverse("performance_dashboard"))
+        assert response.status_code == 302
@@ -0,0 +1,92 @@
+"""Tests for slow-query logging and repeated-query detection."""
+
+import logging
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from elysium_archive.querywatch import (
+    RepeatedQueryError,
+    sql_shape,
+    watch_queries,
+)
+from products.models import Product
+
+
+def test_sql_shape_collapses_placeholder_lists():
+    """Batches of different sizes share one shape."""
+    assert sql_shape("SELECT 1 WHERE id IN (%s, %s, %s)") == sql_shape(
+        "SELECT 1\n  WHERE id IN (%s,%s)"
+    )
+
+
+@pytest.mark.django_db
+class TestWatchQueries:
+    """Test the watcher used by the middleware."""
+
+    def test_repeated_query_raises_with_call_site(self, product_active):
+        """An N+1 loop fails with the stack that issued it."""
+        with pytest.raises(RepeatedQueryError) as excinfo:
+            with watch_queries("loop", duplicate_limit=3, raise_errors=True):
+                for _ in range(5):
+                    Product.objects.get(pk=product_active.pk)
+
+        message = str(excinfo.value)
+        assert "loop: 5x SELECT" in message
+        assert "test_query_watch.py" in message
+
+    def test_queries_under_the_limit_pass(self, product_active):
+        """Distinct or infrequent statements are not reported."""
+        with watch_queries(duplicate_limit=3, raise_errors=True) as watcher:
+            for _ in range(3):
+                Product.objects.get(pk=product_active.pk)
+            Product.objects.count()
+
+        assert watcher.problems() == []
+
+    def test_production_mode_logs_instead_of_raising(
+        self, product_active, caplog
+    ):
+        """Without raise_errors the problem is logged as a warning."""
+        logger = logging.getLogger("elysium_archive.querywatch")
+        logger.addHandler(caplog.handler)
+        try:
+            with watch_queries("loop", duplicate_limit=1, raise_errors=False):
+                Product.objects.get(pk=product_active.pk)
+                Product.objects.get(pk=product_active.pk)
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert any("Repeated queries" in m for m in caplog.messages)
+
+    def test_slow_statements_are_logged(self, product_active, caplog):
+        """Statements over the threshold are logged with their shape."""
+        logger = logging.getLogger("elysium_archive.querywatch")
+        logger.addHandler(caplog.handler)
+        try:
+            with watch_queries(slow_ms=0) as watcher:
+                Product.objects.count()
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert len(watcher.slow) == 1
+        assert any("Slow query" in m for m in caplog.messages)
+
+
+@pytest.mark.django_db
+class TestQueryWatchMiddleware:
+    """Test the middleware in the test settings."""
+
+    @override_settings(QUERY_WATCH_DUPLICATE_LIMIT=0)
+    def test_request_fails_on_repeated_queries(self, client, product_active):
+        """Tests fail when a request crosses the limit."""
+        with pytest.raises(RepeatedQueryError, match="GET /archive/"):
+            client.get(reverse("archive"))
+
+    @override_settings(QUERY_WATCH_ENABLED=False)
+    def test_can_be_disabled(self, client, product_active):
+        """The setting removes the middleware."""
+        with override_settings(QUERY_WATCH_DUPLICATE_LIMIT=0):
+            response = client.get(reverse("archive"))
+        assert response.status_code == 200
@@ -0,0 +1,85 @@
+"""Tests for the request metrics middleware and staff endpoint."""
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from elysium_archive import metrics
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    """Start every test with an empty histogram."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddleware:
+    """Test Server-Timing output and the per-view histogram."""
+
+    @override_settings(REQUEST_METRICS_ENABLED=True)
+    def test_server_timing_reports_queries_and_render_time(
+        self, client, product_active
+    ):
+        """Responses carry db, template and total timings."""
+        response = client.get(reverse("archive"))
+
+        timing = response["Server-Timing"]
+        assert "db;dur=" in timing
+        assert "tpl;dur=" in timing
+        assert "total;dur=" in timing
+
+        stats = metrics.snapshot()["products.views.ProductListView"]
+        assert stats["count"] == 1
+        assert stats["max_queries"] > 0
+        assert f'"{stats["max_queries"]} queries"' in timing
+        assert stats["avg_template_ms"] > 0
+
+    @override_settings(REQUEST_METRICS_ENABLED=True)
+    def test_requests_are_logged_per_view(self, client, caplog):
+        """Each request produces one structured log line."""
+        # The metrics logger does not propagate, so listen on it directly.
+        metrics.logger.addHandler(caplog.handler)
+        try:
+            with caplog.at_level("INFO", logger="elysium_archive.metrics"):
+                client.get(reverse("home"))
+        finally:
+            metrics.logger.removeHandler(caplog.handler)
+
+        assert any(
+            "view=home.views.home_view method=GET status=200" in message
+            for message in caplog.messages
+        )
+
+    def test_disabled_by_default(self, client):
+        """Without the setting no header or histogram entry is produced."""
+        response = client.get(reverse("home"))
+
+        assert "Server-Timing" not in response
+        assert metrics.snapshot() == {}
+
+
+@pytest.mark.django_db
+class TestRequestMetricsView:
+    """Test access to the staff metrics endpoint."""
+
+    @override_settings(REQUEST_METRICS_ENABLED=True)
+    def test_staff_can_read_histogram(self, client, staff_user):
+        """Staff get the histogram as JSON."""
+        client.force_login(staff_user)
+        client.get(reverse("home"))
+
+        response = client.get(reverse("request_metrics"))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert data["views"]["home.views.home_view"]["count"] == 1
+
+    def test_regular_user_is_redirected(self, client, verified_user):
+        """Non-staff users cannot see the metrics."""
+        client.force_login(verified_user)
+        response = client.get(reverse("request_metrics"))
+        assert response.status_code == 302
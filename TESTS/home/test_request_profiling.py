@@ -0,0 +1,91 @@
+"""Tests for on-demand request profiling."""
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from elysium_archive import profiling
+
+
+@pytest.fixture(autouse=True)
+def _clean_profiles():
+    """Start every test with an empty profile buffer."""
+    profiling.clear_profiles()
+    yield
+    profiling.clear_profiles()
+
+
+@pytest.mark.django_db
+class TestRequestProfiler:
+    """Test the profiling middleware."""
+
+    def test_staff_profile_is_stored_and_linked(
+        self, client, staff_user, product_active
+    ):
+        """The page is served and the report is kept for the dashboard."""
+        client.force_login(staff_user)
+
+        response = client.get(reverse("archive"), {"_profile": "1"})
+
+        assert response.status_code == 200
+        assert b"<html" in response.content.lower()
+        (profile,) = profiling.recent_profiles()
+        assert profile["path"].startswith(reverse("archive"))
+        assert profile["queries"] > 0
+        assert response["X-Profile-Report"] == reverse(
+            "profile_report", args=[profile["id"]]
+        )
+
+        report = client.get(response["X-Profile-Report"])
+        assert report.status_code == 200
+        assert "attachment" in report["Content-Disposition"]
+        text = report.content.decode()
+        assert "== Profile (cumulative time) ==" in text
+        assert "== SQL trace ==" in text
+        assert "SELECT" in text
+        assert "products/views.py" in text
+
+    def test_header_with_download_returns_report(self, client, staff_user):
+        """The header triggers profiling; download mode returns the text."""
+        client.force_login(staff_user)
+
+        response = client.get(reverse("home"), HTTP_X_PROFILE="download")
+
+        assert response["Content-Type"].startswith("text/plain")
+        assert response.content.startswith(b"GET /")
+
+    def test_non_staff_requests_are_not_profiled(self, client, verified_user):
+        """Regular users cannot trigger profiling."""
+        client.force_login(verified_user)
+
+        response = client.get(reverse("home"), {"_profile": "download"})
+
+        assert response["Content-Type"].startswith("text/html")
+        assert "X-Profile-Report" not in response
+        assert profiling.recent_profiles() == []
+
+    @override_settings(REQUEST_PROFILING_ENABLED=False)
+    def test_disabled_by_setting(self, client, staff_user):
+        """The setting switches the hook off."""
+        client.force_login(staff_user)
+
+        response = client.get(reverse("home"), {"_profile": "1"})
+
+        assert "X-Profile-Report" not in response
+        assert profiling.recent_profiles() == []
+
+    def test_buffer_keeps_newest_profiles(self):
+        """Old profiles drop out of the ring buffer."""
+        for index in range(profiling.PROFILE_BUFFER + 5):
+            profiling.store_profile({"id": str(index), "report": ""})
+
+        profiles = profiling.recent_profiles()
+        assert len(profiles) == profiling.PROFILE_BUFFER
+        assert profiles[0]["id"] == str(profiling.PROFILE_BUFFER + 4)
+        assert profiling.get_profile("0") is None
+
+    def test_unknown_report_is_404(self, client, staff_user):
+        """Expired reports are not found."""
+        client.force_login(staff_user)
+        response = client.get(reverse("profile_report", args=["missing"]))
+        assert response.status_code == 404
@@ -0,0 +1,115 @@
+"""Tests for bulk order payment reconciliation."""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from orders.models import AccessEntitlement, Order, OrderLineItem
+from orders.services import mark_orders_paid
+from products.models import Product
+
+User = get_user_model()
+
+
+def _create_order(product, user, status="pending"):
+    """Create an order with a single line item."""
+    order = Order.objects.create(user=user, total=product.price, status=status)
+    OrderLineItem.objects.create(
+        order=order,
+        product=product,
+        product_title=product.title,
+        product_price=product.price,
+        quantity=1,
+        line_total=product.price,
+    )
+    return order
+
+
+def _create_pending_orders(category, start, count):
+    """Create pending orders, each with its own buyer and product."""
+    orders = []
+    for index in range(start, start + count):
+        user = User.objects.create_user(
+            username=f"payer{index}",
+            email=f"payer{index}@test.com",
+        )
+        product = Product.objects.create(
+            title=f"Reconciled Product {index}",
+            slug=f"reconciled-product-{index}",
+            tagline="Test tagline",
+            description="Test description",
+            content="<p>Test premium content.</p>",
+            price=Decimal("9.99"),
+            image_alt="Test image",
+            category=category,
+        )
+        orders.append(_create_order(product, user))
+    return orders
+
+
+@pytest.mark.django_db
+class TestMarkOrdersPaid:
+    """Test the bulk mark-as-paid service."""
+
+    def test_reports_outcome_per_order(
+        self, verified_user, product_active, order_pending, order_paid
+    ):
+        """Pending orders are paid, paid orders report already_paid."""
+        orphan = _create_order(product_active, None, status="failed")
+
+        outcomes = mark_orders_paid(
+            [order_pending.pk, order_paid.pk, orphan.pk]
+        )
+
+        assert outcomes[order_pending.order_number]["outcome"] == "paid"
+        assert outcomes[order_paid.order_number] == {
+            "outcome": "already_paid",
+            "granted": 0,
+            "no_user": False,
+        }
+        assert outcomes[orphan.order_number]["no_user"] is True
+        assert not Order.objects.exclude(status="paid").exists()
+
+    def test_grants_missing_entitlements_once(
+        self, verified_user, product_active, order_pending
+    ):
+        """Two orders for the same product grant a single entitlement."""
+        second = _create_order(product_active, verified_user)
+
+        outcomes = mark_orders_paid([order_pending.pk, second.pk])
+
+        entitlement = AccessEntitlement.objects.get(user=verified_user)
+        assert entitlement.order_id == order_pending.pk
+        assert outcomes[order_pending.order_number]["granted"] == 1
+        assert outcomes[second.order_number]["granted"] == 0
+
+
+@pytest.mark.django_db
+def test_mark_as_paid_action_query_count_is_constant(
+    client, staff_user, category
+):
+    """Admin action runs the same queries for 2 and 8 orders."""
+    client.force_login(staff_user)
+
+    def _mark_paid(orders):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                reverse("admin:orders_order_changelist"),
+                {
+                    "action": "mark_as_paid",
+                    "_selected_action": [str(order.pk) for order in orders],
+                    "index": "0",
+                    "select_across": "0",
+                },
+            )
+        assert response.status_code == 302
+        return len(queries)
+
+    baseline = _mark_paid(_create_pending_orders(category, 0, 2))
+    assert _mark_paid(_create_pending_orders(category, 2, 6)) == baseline
+    assert AccessEntitlement.objects.count() == 8
+    assert not Order.objects.filter(status="pending").exists()
@@ -0,0 +1,109 @@
+"""Tests for the stale pending-order sweeper command."""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from orders.models import AccessEntitlement, Order
+
+
+def _age(order, minutes):
+    """Backdate an order's creation time."""
+    Order.objects.filter(pk=order.pk).update(
+        created_at=timezone.now() - timedelta(minutes=minutes)
+    )
+
+
+@pytest.mark.django_db
+class TestExpirePendingOrders:
+    """Test the site-wide batch expiry of abandoned orders."""
+
+    def test_expires_only_stale_pending_orders(
+        self, verified_user, order_pending
+    ):
+        """Fresh pending and paid orders are left alone."""
+        stale = Order.objects.create(user=verified_user, status="pending")
+        old_paid = Order.objects.create(user=verified_user, status="paid")
+        guest = Order.objects.create(user=None, status="pending")
+        for order in (stale, old_paid, guest):
+            _age(order, 120)
+
+        out = StringIO()
+        call_command("expire_pending_orders", "--batch-size=1", stdout=out)
+
+        statuses = dict(Order.objects.values_list("pk", "status"))
+        assert statuses[stale.pk] == "failed"
+        assert statuses[guest.pk] == "failed"
+        assert statuses[old_paid.pk] == "paid"
+        assert statuses[order_pending.pk] == "pending"
+        assert "Expired 2 pending order(s)" in out.getvalue()
+
+    def test_reconcile_finalizes_orders_stripe_reports_paid(
+        self, verified_user, product_active, order_pending
+    ):
+        """Reconciling asks Stripe once per session with a shared client."""
+        order_pending.stripe_session_id = "cs_test_paid"
+        order_pending.save(update_fields=["stripe_session_id"])
+        unpaid = Order.objects.create(
+            user=verified_user,
+            status="pending",
+            stripe_session_id="cs_test_open",
+        )
+        _age(order_pending, 120)
+        _age(unpaid, 120)
+
+        sessions = {
+            "cs_test_paid": {
+                "payment_status": "paid",
+                "payment_intent": "pi_test_reconciled",
+            },
+            "cs_test_open": {"payment_status": "unpaid"},
+        }
+        client = MagicMock()
+        client.v1.checkout.sessions.retrieve.side_effect = sessions.get
+
+        with patch(
+            "orders.management.commands.expire_pending_orders."
+            "stripe.StripeClient",
+            return_value=client,
+        ) as client_class:
+            call_command(
+                "expire_pending_orders", "--reconcile", stdout=StringIO()
+            )
+
+        client_class.assert_called_once()
+        order_pending.refresh_from_db()
+        unpaid.refresh_from_db()
+        assert order_pending.status == "paid"
+        assert order_pending.stripe_payment_intent_id == "pi_test_reconciled"
+        assert AccessEntitlement.objects.filter(
+            user=verified_user, product=product_active
+        ).exists()
+        assert unpaid.status == "failed"
+
+    def test_reconcile_errors_leave_orders_pending(self, order_pending):
+        """Orders are not failed when Stripe cannot be reached."""
+        order_pending.stripe_session_id = "cs_test_unreachable"
+        order_pending.save(update_fields=["stripe_session_id"])
+        _age(order_pending, 120)
+
+        client = MagicMock()
+        client.v1.checkout.sessions.retrieve.side_effect = RuntimeError(
+            "network down"
+        )
+
+        with patch(
+            "orders.management.commands.expire_pending_orders."
+            "stripe.StripeClient",
+            return_value=client,
+        ):
+            call_command(
+                "expire_pending_orders", "--reconcile", stdout=StringIO()
+            )
+
+        order_pending.refresh_from_db()
+        assert order_pending.status == "pending"
@@ -0,0 +1,55 @@
+"""Query-count regression tests for the order admin changelists."""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from orders.models import AccessEntitlement, Order
+from products.models import Product
+
+User = get_user_model()
+
+
+def _create_orders(category, start, count):
+    """Create paid orders, each with its own buyer and entitlement."""
+    for index in range(start, start + count):
+        user = User.objects.create_user(
+            username=f"buyer{index}",
+            email=f"buyer{index}@test.com",
+        )
+        product = Product.objects.create(
+            title=f"Ordered Product {index}",
+            slug=f"ordered-product-{index}",
+            tagline="Test tagline",
+            description="Test description",
+            content="<p>Test premium content.</p>",
+            price=Decimal("9.99"),
+            image_alt="Test image",
+            category=category,
+        )
+        order = Order.objects.create(
+            user=user, total=product.price, status="paid"
+        )
+        AccessEntitlement.objects.create(
+            user=user, product=product, order=order
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name",
+    [
+        "admin:orders_order_changelist",
+        "admin:orders_accessentitlement_changelist",
+    ],
+)
+def test_changelist_query_count_is_constant(
+    admin_changelist_queries, category, url_name
+):
+    """Changelist runs the same queries for 3 and 9 rows."""
+    _create_orders(category, 0, 3)
+    baseline = admin_changelist_queries(url_name)
+
+    _create_orders(category, 3, 6)
+    assert admin_changelist_queries(url_name) == baseline
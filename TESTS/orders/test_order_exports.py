@@ -0,0 +1,93 @@
+"""Tests for streaming order exports."""
+
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from orders.exports import export_queryset, iter_export_lines
+from orders.models import Order
+
+
+@pytest.mark.django_db
+class TestOrderExports:
+    """Test export rows, filters and output formats."""
+
+    def test_csv_export_has_header_and_one_row_per_order(
+        self, order_pending, order_paid
+    ):
+        """CSV export writes a header and one line per order."""
+        lines = iter_export_lines(export_queryset("orders"), "orders", "csv")
+        rows = list(csv.DictReader(io.StringIO("".join(lines))))
+
+        assert [row["order_number"] for row in rows] == [
+            order_pending.order_number,
+            order_paid.order_number,
+        ]
+        assert rows[1]["status"] == "paid"
+        assert rows[1]["email"] == "verified@test.com"
+
+    def test_jsonl_export_filters_by_status_and_date(
+        self, order_pending, order_paid
+    ):
+        """Status and date range filters narrow the exported rows."""
+        Order.objects.filter(pk=order_pending.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+
+        queryset = export_queryset(
+            "line_items",
+            since=timezone.now() - timedelta(days=1),
+            status="paid",
+        )
+        lines = list(iter_export_lines(queryset, "line_items", "jsonl"))
+
+        assert len(lines) == 1
+        row = json.loads(lines[0])
+        assert row["order_number"] == order_paid.order_number
+        assert row["quantity"] == 1
+
+    def test_admin_action_streams_selected_orders(
+        self, client, staff_user, order_pending, order_paid
+    ):
+        """Admin export action returns a streaming CSV download."""
+        client.force_login(staff_user)
+        response = client.post(
+            reverse("admin:orders_order_changelist"),
+            {
+                "action": "export_as_csv",
+                "_selected_action": [str(order_paid.pk)],
+                "index": "0",
+                "select_across": "0",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.streaming is True
+        assert response["Content-Type"] == "text/csv"
+        body = b"".join(response.streaming_content).decode()
+        assert order_paid.order_number in body
+        assert order_pending.order_number not in body
+
+    def test_command_writes_entitlements_to_file(self, order_paid, tmp_path):
+        """export_orders writes the chosen dataset to a file."""
+        output = tmp_path / "entitlements.csv"
+        stderr = io.StringIO()
+
+        call_command(
+            "export_orders",
+            "--dataset=entitlements",
+            f"--output={output}",
+            stderr=stderr,
+        )
+
+        rows = list(csv.DictReader(output.open(encoding="utf-8")))
+        assert [row["order_number"] for row in rows] == [
+            order_paid.order_number
+        ]
+        assert "Exported 1 entitlements row(s)." in stderr.getvalue()
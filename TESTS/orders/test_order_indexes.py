@@ -0,0 +1,40 @@
+"""Check that order lookups used by checkout are served by indexes."""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from orders.models import Order
+
+
+@pytest.mark.django_db
+class TestOrderIndexes:
+    """EXPLAIN the pending-order and Stripe session lookups."""
+
+    def test_recent_pending_order_lookup_uses_user_status_index(
+        self, query_plan, verified_user
+    ):
+        """Recent pending orders per user are found through the index."""
+        queryset = Order.objects.filter(
+            user=verified_user,
+            status="pending",
+            created_at__gte=timezone.now() - timedelta(minutes=15),
+        ).order_by("-created_at")
+
+        assert "order_user_status_idx" in query_plan(queryset)
+
+    def test_stale_pending_sweep_uses_pending_index(self, query_plan):
+        """The site-wide stale pending sweep uses the partial index."""
+        queryset = Order.objects.filter(
+            status="pending",
+            created_at__lt=timezone.now() - timedelta(minutes=30),
+        )
+
+        assert "order_pending_created_idx" in query_plan(queryset)
+
+    def test_stripe_session_lookup_uses_session_index(self, query_plan):
+        """Orders are found by Stripe session ID without a scan."""
+        queryset = Order.objects.filter(stripe_session_id="cs_test_lookup")
+
+        assert "order_stripe_session_idx" in query_plan(queryset)
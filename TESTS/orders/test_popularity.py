@@ -0,0 +1,124 @@
+"""Tests for time-decayed product popularity and homepage bestsellers."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from orders.models import AccessEntitlement
+from orders.services import (
+    mark_orders_paid,
+    record_sales,
+    refresh_popularity_scores,
+)
+from products.models import Product
+
+User = get_user_model()
+
+
+def _score(product):
+    """Return the stored popularity score of a product."""
+    return Product.objects.get(pk=product.pk).popularity_score
+
+
+def _sell(product, days_ago, now, buyer_index):
+    """Create an entitlement granted the given number of days ago."""
+    buyer = User.objects.create_user(username=f"fan{buyer_index}")
+    entitlement = AccessEntitlement.objects.create(user=buyer, product=product)
+    AccessEntitlement.objects.filter(pk=entitlement.pk).update(
+        granted_at=now - timedelta(days=days_ago)
+    )
+
+
+@pytest.mark.django_db
+class TestPopularityScores:
+    """Scores decay with age and follow new sales."""
+
+    def test_refresh_decays_by_half_life(self, product_active):
+        """A sale one half-life old counts half; ancient sales drop out."""
+        now = timezone.now()
+        _sell(product_active, 0, now, 0)
+        _sell(product_active, 30, now, 1)
+        _sell(product_active, 3650, now, 2)
+
+        assert refresh_popularity_scores(now=now, half_life_days=30) == 1
+        assert _score(product_active) == pytest.approx(1.5)
+
+    def test_refresh_resets_products_without_recent_sales(
+        self, product_active
+    ):
+        """Stale scores fall to zero on refresh."""
+        Product.objects.filter(pk=product_active.pk).update(popularity_score=7)
+
+        assert refresh_popularity_scores() == 0
+        assert _score(product_active) == 0
+
+    def test_new_sales_add_to_the_score(self, product_active):
+        """Each recorded sale adds one until the next refresh."""
+        record_sales([product_active.pk, product_active.pk])
+
+        product = Product.objects.get(pk=product_active.pk)
+        assert product.popularity_score == 2
+        assert product.sales_count == 0
+
+    def test_paying_orders_scores_the_products(
+        self, order_pending, product_active
+    ):
+        """Bulk payment grants access and bumps popularity."""
+        mark_orders_paid([order_pending.pk])
+
+        assert _score(product_active) == 1
+
+    def test_refresh_command(self, product_active, verified_user, capsys):
+        """The command rebuilds scores and reports the products scored."""
+        AccessEntitlement.objects.create(
+            user=verified_user, product=product_active
+        )
+
+        call_command("refresh_popularity", "--half-life-days", "7")
+
+        assert _score(product_active) == pytest.approx(1, rel=1e-3)
+        assert "1 product(s)" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestHomepageBestsellers:
+    """The homepage lists bestsellers from the stored score."""
+
+    def test_bestsellers_ranked_without_entitlement_queries(
+        self, client, category
+    ):
+        """Bestsellers come from the indexed column, not a GROUP BY."""
+        for index, score in enumerate([3, 0, 5]):
+            Product.objects.create(
+                title=f"Seller {index}",
+                slug=f"seller-{index}",
+                tagline="Test tagline",
+                description="Test description",
+                content="<p>Test premium content.</p>",
+                price=Decimal("9.99"),
+                image_alt="Test image",
+                category=category,
+            )
+            Product.objects.filter(slug=f"seller-{index}").update(
+                popularity_score=score
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("home"))
+
+        slugs = [
+            product.slug for product in response.context["bestseller_products"]
+        ]
+        assert slugs == ["seller-2", "seller-0"]
+        assert b"Bestsellers" in response.content
+        assert not any(
+            "orders_accessentitlement" in query["sql"]
+            for query in queries.captured_queries
+        )
@@ -0,0 +1,180 @@
+"""Tests for set-based product and deal banner admin actions."""
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from products.models import Category, DealBanner, Product
+
+
+def _create_products(category, count, start=0, **fields):
+    """Create products in the given category."""
+    return [
+        Product.objects.create(
+            title=f"Bulk Product {index}",
+            slug=f"bulk-product-{index}",
+            tagline="Test tagline",
+            description="Test description",
+            content="<p>Test premium content.</p>",
+            price=Decimal("9.99"),
+            image_alt="Test image",
+            category=category,
+            **fields,
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def _run_action(client, url_name, action, objects):
+    """Post an admin action for the given objects."""
+    return client.post(
+        reverse(url_name),
+        {
+            "action": action,
+            "_selected_action": [str(obj.pk) for obj in objects],
+            "index": "0",
+            "select_across": "0",
+        },
+        follow=True,
+    )
+
+
+@pytest.mark.django_db
+class TestProductBulkActions:
+    """Product actions update rows in bulk and keep deal status correct."""
+
+    def test_unpublish_and_publish_resync_deal_status(
+        self, client, staff_user, category
+    ):
+        """Publishing toggles is_deal for products under a category deal."""
+        products = _create_products(category, 3)
+        DealBanner.objects.create(
+            title="CATEGORY",
+            message="Category deal",
+            category=category,
+            is_active=True,
+            order=0,
+        )
+        client.force_login(staff_user)
+        url_name = "admin:products_product_changelist"
+
+        _run_action(client, url_name, "unpublish_products", products)
+        assert not Product.objects.filter(is_deal=True).exists()
+
+        _run_action(client, url_name, "publish_products", products)
+        assert Product.objects.filter(is_deal=True).count() == 3
+
+    def test_publish_skips_removed_products(
+        self, client, staff_user, category
+    ):
+        """Removed products are not republished by the bulk action."""
+        products = _create_products(category, 1, is_removed=True)
+        client.force_login(staff_user)
+
+        _run_action(
+            client,
+            "admin:products_product_changelist",
+            "publish_products",
+            products,
+        )
+
+        products[0].refresh_from_db()
+        assert products[0].is_active is False
+
+    def test_mark_as_featured_updates_banners_with_constant_queries(
+        self, client, staff_user, category
+    ):
+        """Featuring products mirrors onto banners without per-row saves."""
+        client.force_login(staff_user)
+        url_name = "admin:products_product_changelist"
+
+        def _feature(products):
+            for product in products:
+                DealBanner.objects.create(
+                    title="DEAL",
+                    message=product.title,
+                    product=product,
+                    is_featured=False,
+                    is_active=True,
+                    order=0,
+                )
+            with CaptureQueriesContext(connection) as queries:
+                _run_action(client, url_name, "mark_as_featured", products)
+            return len(queries)
+
+        baseline = _feature(_create_products(category, 2))
+        assert _feature(_create_products(category, 8, start=2)) == baseline
+
+        assert Product.objects.filter(is_featured=False).count() == 0
+        assert DealBanner.objects.filter(is_featured=False).count() == 0
+
+
+@pytest.mark.django_db
+class TestDealBannerBulkActions:
+    """Banner actions resync featured and deal status once per batch."""
+
+    def test_deactivating_one_of_two_category_banners_keeps_featured(
+        self, client, staff_user
+    ):
+        """Category products stay featured while a featured banner remains."""
+        category = Category.objects.create(name="Shared", slug="shared")
+        products = _create_products(category, 2)
+        first = DealBanner.objects.create(
+            title="FIRST",
+            message="First",
+            category=category,
+            is_active=True,
+            order=0,
+        )
+        DealBanner.objects.create(
+            title="SECOND",
+            message="Second",
+            category=category,
+            is_active=True,
+            order=1,
+        )
+        client.force_login(staff_user)
+
+        _run_action(
+            client,
+            "admin:products_dealbanner_changelist",
+            "mark_selected_deal_banners_inactive",
+            [first],
+        )
+
+        for product in products:
+            product.refresh_from_db()
+            assert product.is_featured is True
+            assert product.is_deal is True
+
+    def test_deactivating_product_banners_clears_deals(
+        self, client, staff_user, category
+    ):
+        """Deactivating product banners clears is_deal on their products."""
+        products = _create_products(category, 3)
+        banners = [
+            DealBanner.objects.create(
+                title="DEAL",
+                message=product.title,
+                product=product,
+                is_active=True,
+                order=0,
+            )
+            for product in products
+        ]
+        client.force_login(staff_user)
+
+        response = _run_action(
+            client,
+            "admin:products_dealbanner_changelist",
+            "mark_selected_deal_banners_inactive",
+            banners,
+        )
+
+        assert "3 deal banner(s) marked as inactive." in (
+            response.content.decode()
+        )
+        assert not Product.objects.filter(is_deal=True).exists()
@@ -0,0 +1,217 @@
+"""Tests for the archive price, discount and popularity sorts."""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from orders.models import AccessEntitlement, Order, OrderLineItem
+from orders.services import mark_order_paid
+from products.models import DealBanner, Product
+from products.views import ARCHIVE_SORTS
+
+User = get_user_model()
+
+
+def _make_product(category, slug, price):
+    """Create an active product."""
+    return Product.objects.create(
+        title=slug.replace("-", " ").title(),
+        slug=slug,
+        tagline="Test tagline",
+        description="Test description",
+        content="<p>Test premium content.</p>",
+        price=Decimal(price),
+        image_alt="Test image",
+        category=category,
+    )
+
+
+def _pricing(product):
+    """Return the stored discount and effective price of a product."""
+    product = Product.objects.get(pk=product.pk)
+    return product.discount_percent, product.effective_price
+
+
+def _archive_slugs(client, **params):
+    """Return the archive product slugs in display order."""
+    response = client.get(reverse("archive"), params)
+    assert response.status_code == 200
+    return [product.slug for product in response.context["products"]]
+
+
+@pytest.mark.django_db
+class TestStoredPricing:
+    """The stored discount and price follow banners and price edits."""
+
+    def test_new_product_sells_at_list_price(self, product_active):
+        """A product without banners stores its list price."""
+        assert _pricing(product_active) == (0, Decimal("9.99"))
+
+    def test_banner_changes_update_pricing(self, product_active):
+        """Creating, editing and deleting a banner reprices the product."""
+        banner = DealBanner.objects.create(
+            title="DEAL",
+            message="Limited offer",
+            product=product_active,
+            discount_percentage=Decimal("20"),
+        )
+        assert _pricing(product_active) == (20, Decimal("7.99"))
+
+        banner.discount_percentage = Decimal("50")
+        banner.save()
+        assert _pricing(product_active) == (50, Decimal("5.00"))
+
+        banner.delete()
+        assert _pricing(product_active) == (0, Decimal("9.99"))
+
+    def test_category_banner_prices_its_products(self, category):
+        """A category banner discounts every product in the category."""
+        products = [
+            _make_product(category, f"shelf-entry-{index}", "10.00")
+            for index in range(2)
+        ]
+        DealBanner.objects.create(
+            title="DEAL",
+            message="Category offer",
+            category=category,
+            discount_percentage=Decimal("25"),
+        )
+
+        for product in products:
+            assert _pricing(product) == (25, Decimal("7.50"))
+
+    def test_price_edit_keeps_discount(self, product_active):
+        """Changing the list price recomputes the discounted price."""
+        DealBanner.objects.create(
+            title="DEAL",
+            message="Limited offer",
+            product=product_active,
+            discount_percentage=Decimal("10"),
+        )
+        product = Product.objects.get(pk=product_active.pk)
+        product.price = Decimal("20.00")
+        product.save(update_fields=["price", "updated_at"])
+
+        assert _pricing(product) == (10, Decimal("18.00"))
+
+    def test_discount_reads_need_no_queries(
+        self, product_active, django_assert_num_queries
+    ):
+        """Rendering a discount reads the stored columns only."""
+        DealBanner.objects.create(
+            title="DEAL",
+            message="Limited offer",
+            product=product_active,
+            discount_percentage=Decimal("15"),
+        )
+        product = Product.objects.get(pk=product_active.pk)
+
+        with django_assert_num_queries(0):
+            assert product.get_discount_percentage() == 15
+            assert product.get_discounted_price() == Decimal("8.49")
+
+
+@pytest.mark.django_db
+class TestSalesCount:
+    """Product.sales_count follows granted entitlements."""
+
+    def test_paying_an_order_counts_the_sale(
+        self, order_pending, product_active
+    ):
+        """Marking an order paid counts one sale per product."""
+        assert mark_order_paid(order_pending.pk)
+
+        assert Product.objects.get(pk=product_active.pk).sales_count == 1
+
+    def test_repair_command(self, product_active, verified_user, capsys):
+        """The repair command recounts entitlements."""
+        AccessEntitlement.objects.create(
+            user=verified_user, product=product_active
+        )
+        Product.objects.filter(pk=product_active.pk).update(sales_count=9)
+
+        call_command("repair_sales_counts")
+
+        assert Product.objects.get(pk=product_active.pk).sales_count == 1
+        assert "refreshed" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestArchiveSorting:
+    """The archive sorts and filters on the stored columns."""
+
+    @pytest.fixture
+    def catalog(self, category):
+        """Create three products, one discounted and one best seller."""
+        cheap = _make_product(category, "cheap-entry", "5.00")
+        middle = _make_product(category, "middle-entry", "12.00")
+        dear = _make_product(category, "dear-entry", "20.00")
+        DealBanner.objects.create(
+            title="DEAL",
+            message="Half off",
+            product=dear,
+            discount_percentage=Decimal("50"),
+        )
+        for index in range(2):
+            buyer = User.objects.create_user(username=f"buyer{index}")
+            order = Order.objects.create(
+                user=buyer, total=middle.price, status="pending"
+            )
+            OrderLineItem.objects.create(
+                order=order,
+                product=middle,
+                product_title=middle.title,
+                product_price=middle.price,
+                line_total=middle.price,
+            )
+            mark_order_paid(order.pk)
+        return cheap, middle, dear
+
+    @pytest.mark.parametrize(
+        ("sort", "expected"),
+        [
+            ("price_low", ["cheap-entry", "dear-entry", "middle-entry"]),
+            ("price_high", ["middle-entry", "dear-entry", "cheap-entry"]),
+            ("discount", ["dear-entry", "middle-entry", "cheap-entry"]),
+            ("popular", ["middle-entry", "dear-entry", "cheap-entry"]),
+            ("bestselling", ["middle-entry", "dear-entry", "cheap-entry"]),
+        ],
+    )
+    def test_sorts(self, client, catalog, sort, expected):
+        """Each sort orders by its stored column."""
+        assert _archive_slugs(client, sort=sort) == expected
+
+    def test_price_range_uses_discounted_price(self, client, catalog):
+        """The price filter matches the price the buyer pays."""
+        slugs = _archive_slugs(
+            client, min_price="8", max_price="10.50", sort="price_low"
+        )
+
+        assert slugs == ["dear-entry"]
+
+    def test_invalid_price_bounds_are_ignored(self, client, catalog):
+        """Malformed or negative bounds do not filter."""
+        slugs = _archive_slugs(client, min_price="abc", max_price="-1")
+
+        assert len(slugs) == 3
+
+    @pytest.mark.parametrize(
+        ("sort", "index"),
+        [
+            ("price_low", "product_price_idx"),
+            ("price_high", "product_price_idx"),
+            ("discount", "product_discount_idx"),
+            ("popular", "product_popularity_idx"),
+            ("bestselling", "product_sales_idx"),
+        ],
+    )
+    def test_sorts_use_their_index(self, query_plan, sort, index):
+        """Each sort is served by its partial index."""
+        queryset = Product.objects.filter(
+            is_active=True, is_removed=False
+        ).order_by(*ARCHIVE_SORTS[sort])
+
+        assert index in query_plan(queryset)
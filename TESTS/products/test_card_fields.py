@@ -0,0 +1,98 @@
+"""Tests that catalog pages load only the product card columns."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from products.models import DealBanner, Product
+from reviews.models import Review
+
+HEAVY_COLUMNS = ("content", "content_html", "content_toc")
+
+
+def _heavy_reads(client, url, columns=HEAVY_COLUMNS, **params):
+    """Return the SQL of a page's queries that select the given columns."""
+    qualified = [f'"products_product"."{column}"' for column in columns]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and any(column in query["sql"] for column in qualified)
+    ]
+
+
+@pytest.mark.django_db
+class TestCardProjection:
+    """Listing, cart and detail pages never read the content columns."""
+
+    def test_catalog_pages_skip_content(
+        self, client, verified_user, product_active
+    ):
+        """Archive, home, cart, detail and review pages skip content."""
+        Product.objects.filter(pk=product_active.pk).update(
+            is_featured=True, popularity_score=1
+        )
+        DealBanner.objects.create(
+            title="Sale", product=product_active, discount_percentage=10
+        )
+        client.force_login(verified_user)
+        session = client.session
+        session["cart"] = {str(product_active.pk): 1}
+        session.save()
+
+        for url in (
+            reverse("archive"),
+            reverse("home"),
+            reverse("cart"),
+            reverse("product_detail", args=[product_active.slug]),
+            reverse("review_list", args=[product_active.slug]),
+        ):
+            assert _heavy_reads(client, url) == [], url
+
+    def test_account_dashboard_skips_product_bodies(
+        self, client, verified_user, order_paid, product_active
+    ):
+        """Library, order and review cards load no product text."""
+        Review.objects.create(
+            user=verified_user, product=product_active, rating=5
+        )
+        client.force_login(verified_user)
+
+        assert (
+            _heavy_reads(
+                client,
+                reverse("account_dashboard"),
+                columns=("description", *HEAVY_COLUMNS),
+                tab="archive",
+            )
+            == []
+        )
+
+    def test_listing_renders_without_deferred_loads(
+        self, client, product_active
+    ):
+        """Card templates touch no column outside the projection."""
+        response = client.get(reverse("archive"))
+        product = response.context["products"][0]
+
+        assert "content" in product.get_deferred_fields()
+        assert "description" in product.get_deferred_fields()
+        assert product_active.tagline.encode() in response.content
+
+    def test_reader_still_loads_rendered_html(
+        self, client, verified_user, entitlement, product_active
+    ):
+        """The full reading page is the one place the HTML is read."""
+        client.force_login(verified_user)
+
+        reads = _heavy_reads(
+            client,
+            reverse("archive_read", args=[product_active.slug]),
+            full="1",
+        )
+
+        assert reads
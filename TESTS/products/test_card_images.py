@@ -0,0 +1,131 @@
+"""Tests for memoised Cloudinary URLs and stored card image URLs."""
+
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from products import images
+from products.images import (
+    _fill_url,
+    build_cloudinary_fill_url,
+    image_backend,
+)
+from products.models import Product
+
+CLOUDINARY_BASE = "http://res.cloudinary.com/demo/image/upload/"
+
+
+class CountingStorage:
+    """Storage stand-in that counts URL lookups."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def url(self, name):
+        self.calls += 1
+        return f"{CLOUDINARY_BASE}{name}"
+
+
+@pytest.fixture(autouse=True)
+def empty_url_cache():
+    """Start each test with an empty fill URL cache."""
+    _fill_url.cache_clear()
+
+
+class TestFillUrls:
+    """Fill URLs are built once per file name and size."""
+
+    def test_urls_are_memoised_per_name_and_size(self):
+        """Repeated sizes reuse the cached URL; new sizes build one."""
+        storage = CountingStorage()
+        image = SimpleNamespace(name="v1/scroll.jpg", storage=storage)
+
+        first = build_cloudinary_fill_url(image, 400, 225)
+        again = build_cloudinary_fill_url(image, 400, 225)
+        build_cloudinary_fill_url(image, 800, 450)
+
+        assert (
+            first
+            == again
+            == (
+                "https://res.cloudinary.com/demo/image/upload/"
+                "c_fill,g_auto,w_400,h_225,q_auto,f_auto/v1/scroll.jpg"
+            )
+        )
+        assert storage.calls == 2
+
+    def test_non_cloudinary_urls_are_returned_unchanged(self):
+        """Local media URLs have no transformation to add."""
+        assert (
+            build_cloudinary_fill_url("/media/products/a.jpg", 400, 225)
+            == "/media/products/a.jpg"
+        )
+        assert build_cloudinary_fill_url(None, 400, 225) == ""
+
+
+@pytest.mark.django_db
+class TestStoredCardUrls:
+    """Card URLs are stored on save and read by the listing."""
+
+    def test_save_stores_and_clears_card_urls(self, product_active):
+        """Setting an image stores its URLs; removing it clears them."""
+        product_active.image = "products/scroll.jpg"
+        product_active.save()
+
+        stored = Product.objects.get(pk=product_active.pk).image_urls
+        assert stored["card"] == "/media/products/scroll.jpg"
+        assert stored["srcset"].endswith("scroll.jpg 800w")
+
+        product_active.image = None
+        product_active.save(update_fields=["image", "updated_at"])
+
+        assert Product.objects.get(pk=product_active.pk).image_urls == {}
+
+    def test_listing_uses_stored_urls(
+        self, client, product_active, monkeypatch
+    ):
+        """Rendering the archive builds no URLs for stored products."""
+        product_active.image = "products/scroll.jpg"
+        product_active.save()
+        Product.objects.filter(pk=product_active.pk).update(
+            image_urls={
+                "card": "https://cdn.test/card.jpg",
+                "srcset": "",
+                "backend": image_backend(product_active.image),
+            }
+        )
+
+        def fail(image):
+            raise AssertionError("card URLs were rebuilt")
+
+        monkeypatch.setattr(images, "card_image_urls", fail)
+        response = client.get(reverse("archive"))
+
+        assert b'src="https://cdn.test/card.jpg"' in response.content
+
+    def test_urls_from_another_backend_are_rebuilt(
+        self, client, product_active, settings, capsys
+    ):
+        """Switching backends bypasses stale URLs until they are stored."""
+        product_active.image = "products/scroll.jpg"
+        product_active.save()
+        Product.objects.filter(pk=product_active.pk).update(
+            image_urls={
+                "card": "/archive/images/400x225/products/scroll.jpg?v=old",
+                "srcset": "",
+                "backend": "FileSystemStorage+derivatives",
+            }
+        )
+        settings.IMAGE_DERIVATIVES_ENABLED = False
+
+        response = client.get(reverse("archive"))
+        assert b"?v=old" not in response.content
+        assert b'src="/media/products/scroll.jpg"' in response.content
+
+        call_command("refresh_image_urls")
+
+        stored = Product.objects.get(pk=product_active.pk).image_urls
+        assert stored["backend"] == "FileSystemStorage"
+        assert "1 product(s)" in capsys.readouterr().out
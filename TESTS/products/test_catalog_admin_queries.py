@@ -0,0 +1,75 @@
+"""Query-count regression tests for the catalog admin changelists."""
+
+from decimal import Decimal
+
+import pytest
+
+from products.models import (
+    Category,
+    DealBanner,
+    Product,
+    with_banner_discounts,
+)
+
+
+def _create_catalog(start, count):
+    """Create categories with discounted products and banners."""
+    for index in range(start, start + count):
+        category = Category.objects.create(
+            name=f"Shelf {index}",
+            slug=f"shelf-{index}",
+        )
+        product = Product.objects.create(
+            title=f"Catalog Product {index}",
+            slug=f"catalog-product-{index}",
+            tagline="Test tagline",
+            description="Test description",
+            content="<p>Test premium content.</p>",
+            price=Decimal("9.99"),
+            image_alt="Test image",
+            category=category,
+        )
+        DealBanner.objects.create(
+            title=f"DEAL {index}",
+            message="Limited offer",
+            product=product if index % 2 == 0 else None,
+            category=None if index % 2 == 0 else category,
+            discount_percentage=Decimal("15"),
+            is_active=True,
+            order=index,
+        )
+
+
+@pytest.mark.django_db
+class TestCatalogAdminQueries:
+    """Changelist query counts must not grow with the number of rows."""
+
+    @pytest.mark.parametrize(
+        "url_name",
+        [
+            "admin:products_category_changelist",
+            "admin:products_product_changelist",
+            "admin:products_dealbanner_changelist",
+        ],
+    )
+    def test_changelist_query_count_is_constant(
+        self, admin_changelist_queries, url_name
+    ):
+        """Changelist runs the same queries for 3 and 9 rows."""
+        _create_catalog(0, 3)
+        baseline = admin_changelist_queries(url_name)
+
+        _create_catalog(3, 6)
+        assert admin_changelist_queries(url_name) == baseline
+
+    def test_annotated_discount_matches_banner_lookup(self):
+        """Annotated discounts agree with the per-product banner lookup."""
+        _create_catalog(0, 4)
+
+        for product in with_banner_discounts(Product.objects.all()):
+            fresh = Product.objects.get(pk=product.pk)
+            assert product.get_discount_percentage() == 15
+            assert (
+                product.get_discount_percentage()
+                == fresh.get_discount_percentage()
+            )
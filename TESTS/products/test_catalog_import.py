@@ -0,0 +1,127 @@
+"""Tests for the bulk catalog importer."""
+
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from products.models import Category, DealBanner, Product
+
+CSV_HEADER = "title,slug,tagline,description,content,price,category\n"
+
+
+def _csv_row(index, category="Imported Texts", price="4.99"):
+    """Return one CSV catalog line."""
+    return (
+        f"Imported {index},imported-{index},Tagline,Description,"
+        f"<p>Body</p>,{price},{category}\n"
+    )
+
+
+@pytest.mark.django_db
+class TestImportCatalog:
+    """Test the import_catalog management command."""
+
+    def test_csv_import_creates_products_and_categories(self, tmp_path):
+        """Rows become products and unknown categories are created."""
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            CSV_HEADER + "".join(_csv_row(index) for index in range(5)),
+            encoding="utf-8",
+        )
+        stdout = io.StringIO()
+
+        call_command("import_catalog", str(path), stdout=stdout)
+
+        category = Category.objects.get(name="Imported Texts")
+        assert category.slug == "imported-texts"
+        assert category.products.count() == 5
+        assert "Imported 5 of 5 row(s)" in stdout.getvalue()
+
+    def test_reimport_updates_by_slug_and_keeps_other_columns(
+        self, tmp_path, product_active
+    ):
+        """Existing slugs are updated in place; absent columns are kept."""
+        path = tmp_path / "catalog.jsonl"
+        path.write_text(
+            json.dumps(
+                {
+                    "title": "Renamed",
+                    "slug": product_active.slug,
+                    "tagline": "New tagline",
+                    "description": "New description",
+                    "content": "<p>New</p>",
+                    "price": "1.50",
+                }
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+        call_command("import_catalog", str(path), stdout=io.StringIO())
+
+        product = Product.objects.get(pk=product_active.pk)
+        assert product.title == "Renamed"
+        assert product.price == Decimal("1.50")
+        assert product.category == product_active.category
+        assert Product.objects.count() == 1
+
+    def test_invalid_rows_are_reported_and_skipped(self, tmp_path):
+        """Rows that fail validation are listed with their line number."""
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            CSV_HEADER + _csv_row(1) + _csv_row(2, price="free"),
+            encoding="utf-8",
+        )
+        stderr = io.StringIO()
+
+        call_command(
+            "import_catalog",
+            str(path),
+            stdout=io.StringIO(),
+            stderr=stderr,
+        )
+
+        assert Product.objects.filter(slug="imported-1").exists()
+        assert not Product.objects.filter(slug="imported-2").exists()
+        assert "Line 3: price:" in stderr.getvalue()
+
+    def test_import_resyncs_deals_once_for_category_banners(self, tmp_path):
+        """Imported products under a category deal come out as deals."""
+        category = Category.objects.create(
+            name="Imported Texts", slug="imported-texts"
+        )
+        DealBanner.objects.create(
+            title="CATEGORY",
+            message="Category deal",
+            category=category,
+            is_active=True,
+            order=0,
+        )
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            CSV_HEADER + "".join(_csv_row(index) for index in range(3)),
+            encoding="utf-8",
+        )
+
+        call_command(
+            "import_catalog", str(path), "--batch-size=2", stdout=io.StringIO()
+        )
+
+        assert (
+            Product.objects.filter(is_deal=True, is_featured=True).count() == 3
+        )
+
+    def test_dry_run_rolls_back(self, tmp_path):
+        """A dry run validates rows without keeping any changes."""
+        path = tmp_path / "catalog.csv"
+        path.write_text(CSV_HEADER + _csv_row(1), encoding="utf-8")
+        stdout = io.StringIO()
+
+        call_command("import_catalog", str(path), "--dry-run", stdout=stdout)
+
+        assert not Product.objects.exists()
+        assert not Category.objects.exists()
+        assert "Validated 1 of 1 row(s)" in stdout.getvalue()
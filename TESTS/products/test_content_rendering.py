@@ -0,0 +1,175 @@
+"""Tests for the pre-rendered archive reader HTML."""
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from products.content import render_content
+from products.models import Product
+
+CLOUDINARY_IMAGE = "http://res.cloudinary.com/demo/image/upload/v1/scroll.jpg"
+
+
+class TestRenderContent:
+    """render_content() sanitises and post-processes editor HTML."""
+
+    def test_active_content_is_stripped(self):
+        """Scripts, handlers and script URLs do not survive."""
+        html = render_content(
+            '<p onclick="steal()">Hello</p>'
+            "<script>alert(1)</script>"
+            '<a href="javascript:alert(1)">bad</a>'
+            '<a href="https://example.com" target="_blank">good</a>'
+        ).html
+
+        assert "script" not in html
+        assert "onclick" not in html
+        assert "javascript:" not in html
+        assert "<a>bad</a>" in html
+        assert 'rel="noopener noreferrer"' in html
+        assert "<p>Hello</p>" in html
+
+    def test_only_allowed_markup_survives(self):
+        """Foreign content, unknown attributes and SVG data are dropped."""
+        html = render_content(
+            '<svg><a xlink:href="javascript:alert(1)"><text>x</text></a>'
+            "<style>@import url(//evil.example)</style></svg>"
+            "<math><mtext><img src=x onerror=alert(1)></mtext></math>"
+            '<p style="text-align:center;background:url(//evil.example)" '
+            'data-x="1">Centred</p>'
+            '<img src="data:image/svg+xml;base64,PHN2Zz4=" alt="vector">'
+            '<img src="data:image/png;base64,iVBORw0=" alt="png">'
+            "<blink>Kept text</blink>"
+        ).html
+
+        for fragment in ("svg", "math", "xlink", "url(", "data-x", "blink"):
+            assert fragment not in html
+        assert '<p style="text-align:center">Centred</p>' in html
+        assert '<img alt="vector"' in html and 'src="data:image/png' in html
+        assert "Kept text" in html
+
+    def test_text_is_escaped_and_unterminated_tags_dropped(self):
+        """Text cannot become markup and a trailing open tag is dropped."""
+        assert (
+            render_content("<p>hi</p><img src=x onerror=alert(1) x=").html
+            == "<p>hi</p>"
+        )
+        assert (
+            render_content("<p>1 < 2 &amp; 3 &gt; 2</p><!-- open").html
+            == "<p>1 &lt; 2 &amp; 3 &gt; 2</p>"
+        )
+
+    def test_control_characters_do_not_hide_url_schemes(self):
+        """Schemes behind control characters or escapes are checked."""
+        html = render_content(
+            '<a href="\x01javascript:alert(1)">a</a>'
+            '<a href="java&#9;script:alert(1)">b</a>'
+            '<a href="javascript%3Aalert(1)">c</a>'
+            '<a href="/archive/?page=2">d</a>'
+        ).html
+
+        assert (
+            html == '<a>a</a><a>b</a><a>c</a><a href="/archive/?page=2">d</a>'
+        )
+
+    def test_images_lazy_load_with_cloudinary_srcset(self):
+        """Images lazy-load and Cloudinary images get responsive widths."""
+        html = render_content(
+            f'<img src="{CLOUDINARY_IMAGE}" alt="Scroll">'
+        ).html
+
+        assert 'loading="lazy"' in html
+        assert 'decoding="async"' in html
+        assert "upload/c_limit,w_800,q_auto,f_auto/v1/scroll.jpg" in html
+        assert "w_480,q_auto,f_auto/v1/scroll.jpg 480w" in html
+        assert "http://" not in html
+
+    def test_headings_get_unique_anchors_and_toc(self):
+        """h2 and h3 headings get ids and are listed in order."""
+        rendered = render_content(
+            "<h2>Origins &amp; Myths</h2><p>Text</p>"
+            "<h3>Details</h3><h2>Origins &amp; Myths</h2>"
+        )
+
+        assert '<h2 id="origins-myths">' in rendered.html
+        assert '<h2 id="origins-myths-2">' in rendered.html
+        assert rendered.toc == [
+            {
+                "id": "origins-myths",
+                "title": "Origins & Myths",
+                "level": 2,
+                "section": 0,
+            },
+            {"id": "details", "title": "Details", "level": 3, "section": 0},
+            {
+                "id": "origins-myths-2",
+                "title": "Origins & Myths",
+                "level": 2,
+                "section": 1,
+            },
+        ]
+
+
+@pytest.mark.django_db
+class TestStoredContent:
+    """Products store the rendered HTML and the reader page serves it."""
+
+    def test_save_renders_content(self, product_active):
+        """Saving new content re-renders the companion columns."""
+        product_active.content = "<h2>Chapter One</h2><p>Begin.</p>"
+        product_active.save(update_fields=["content", "updated_at"])
+
+        product = Product.objects.get(pk=product_active.pk)
+        assert product.content_html.startswith('<h2 id="chapter-one">')
+        assert product.content_toc[0]["title"] == "Chapter One"
+
+    def test_full_reader_serves_stored_html(
+        self, client, verified_user, entitlement, product_active
+    ):
+        """The full reading page renders the stored HTML and contents."""
+        Product.objects.filter(pk=product_active.pk).update(
+            content_html='<h2 id="stored">Stored Chapter</h2>',
+            content_toc=[
+                {"id": "stored", "title": "Stored Chapter", "level": 2}
+            ],
+        )
+        client.force_login(verified_user)
+
+        response = client.get(
+            reverse("archive_read", kwargs={"slug": product_active.slug}),
+            {"full": "1"},
+        )
+
+        assert response.status_code == 200
+        assert b'<h2 id="stored">Stored Chapter</h2>' in response.content
+        assert b'href="#stored"' in response.content
+        assert "content" in response.context["product"].get_deferred_fields()
+
+    def test_render_command_rebuilds_columns(self, product_active, capsys):
+        """The command re-renders products whose HTML is stale."""
+        Product.objects.filter(pk=product_active.pk).update(content_html="")
+
+        call_command("render_content")
+
+        assert Product.objects.get(pk=product_active.pk).content_html
+        assert "1 product(s)" in capsys.readouterr().out
+
+    def test_import_renders_content(self, tmp_path):
+        """Imported rows are rendered without calling save()."""
+        path = tmp_path / "catalog.jsonl"
+        path.write_text(
+            '{"title": "Imported", "tagline": "t", "description": "d", '
+            '"content": "<h2>Imported Part</h2>", "price": "4.99"}\n'
+        )
+
+        call_command("import_catalog", str(path))
+
+        product = Product.objects.get(slug="imported")
+        assert product.content_toc == [
+            {
+                "id": "imported-part",
+                "title": "Imported Part",
+                "level": 2,
+                "section": 0,
+            }
+        ]
@@ -0,0 +1,122 @@
+"""Tests for local card image derivatives."""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, features
+
+from products.derivatives import (
+    content_digest,
+    ensure_derivative,
+    schedule_derivatives,
+)
+from products.images import CARD_IMAGE_SIZES, _fill_url, card_image_urls
+from products.models import Product
+
+
+@pytest.fixture
+def upload(settings, tmp_path):
+    """Store a 1000x500 JPEG upload in a temporary media root."""
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_DERIVATIVES_ENABLED = True
+    content_digest.cache_clear()
+    _fill_url.cache_clear()
+    buffer = io.BytesIO()
+    Image.new("RGB", (1000, 500), "crimson").save(buffer, format="JPEG")
+    return default_storage.save(
+        "products/scroll.jpg", ContentFile(buffer.getvalue())
+    )
+
+
+def _open(path):
+    with default_storage.open(path, "rb") as stored:
+        image = Image.open(io.BytesIO(stored.read()))
+        image.load()
+    return image
+
+
+class TestDerivativeGeneration:
+    """Uploads are cropped to card sizes and cached by content hash."""
+
+    def test_fill_crop_to_webp(self, upload):
+        """The derivative has the card size and is stored once."""
+        path = ensure_derivative(default_storage, upload, 400, 225, "webp")
+
+        image = _open(path)
+        assert (image.format, image.size) == ("WEBP", (400, 225))
+        assert content_digest(default_storage, upload) in path
+        assert (
+            ensure_derivative(default_storage, upload, 400, 225, "webp")
+            == path
+        )
+        assert len(default_storage.listdir(path.rsplit("/", 1)[0])[1]) == 1
+
+    def test_thread_pool_generates_every_card_size(self, upload):
+        """Scheduling an upload builds all card sizes in the background."""
+        assert schedule_derivatives(upload, CARD_IMAGE_SIZES).result() == 3
+
+
+@pytest.mark.django_db
+class TestDerivativeView:
+    """Card URLs point at derivatives generated on first request."""
+
+    def test_card_url_serves_negotiated_format(self, client, upload):
+        """AVIF is served to browsers that accept it."""
+        card_url = card_image_urls(
+            SimpleNamespace(name=upload, storage=default_storage)
+        )["card"]
+        assert card_url.startswith("/archive/images/400x225/products/")
+
+        response = client.get(card_url, HTTP_ACCEPT="image/avif,image/webp")
+
+        expected = "avif" if features.check("avif") else "webp"
+        assert response.status_code == 200
+        assert response["Content-Type"] == f"image/{expected}"
+        assert "Accept" in response["Vary"]
+        assert "immutable" in response["Cache-Control"]
+
+    def test_only_card_sizes_of_product_images(self, client, upload):
+        """Other sizes, other files and missing files are not found."""
+        for width, height, name in (
+            (123, 45, upload),
+            (400, 225, "ckeditor5/other.jpg"),
+            (400, 225, "products/missing.jpg"),
+        ):
+            url = reverse(
+                "image_derivative",
+                kwargs={"width": width, "height": height, "name": name},
+            )
+            assert client.get(url).status_code == 404
+
+    def test_undecodable_uploads_are_not_found(
+        self, client, upload, monkeypatch
+    ):
+        """Corrupt and oversized uploads are a 404, not a server error."""
+        corrupt = default_storage.save(
+            "products/corrupt.jpg", ContentFile(b"\xff\xd8 not a picture")
+        )
+        # 1000x500 is over twice this limit, so Pillow refuses it.
+        monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+        for name in (corrupt, upload):
+            url = reverse(
+                "image_derivative",
+                kwargs={"width": 400, "height": 225, "name": name},
+            )
+            assert client.get(url).status_code == 404
+
+    def test_saved_product_stores_derivative_urls(
+        self, upload, product_active
+    ):
+        """The stored card URLs carry the upload's content hash."""
+        product_active.image = upload
+        product_active.save()
+
+        urls = Product.objects.get(pk=product_active.pk).image_urls
+        digest = content_digest(default_storage, upload)
+        assert urls["card"].endswith(f"?v={digest}")
+        assert "/800x450/" in urls["feature"]
@@ -0,0 +1,42 @@
+"""Check that the hot catalog queries are served by their indexes."""
+
+import pytest
+
+from products.models import DealBanner, Product
+
+
+@pytest.mark.django_db
+class TestCatalogIndexes:
+    """EXPLAIN the archive, homepage and banner queries."""
+
+    def test_archive_listing_uses_listing_index(self, query_plan):
+        """The archive listing filters and sorts through one index."""
+        queryset = Product.objects.filter(
+            is_active=True, is_removed=False
+        ).order_by("-created_at")
+
+        assert "product_listing_idx" in query_plan(queryset)
+
+    def test_homepage_featured_uses_featured_index(self, query_plan):
+        """Featured products on the homepage use the featured index."""
+        queryset = Product.objects.filter(
+            is_active=True, is_removed=False, is_featured=True
+        ).order_by("-created_at")
+
+        assert "product_featured_idx" in query_plan(queryset)
+
+    def test_deal_filter_uses_deal_index(self, query_plan):
+        """Deal lookups use the deal index."""
+        queryset = Product.objects.filter(
+            is_active=True, is_removed=False, is_deal=True
+        )
+
+        assert "product_deal_idx" in query_plan(queryset)
+
+    def test_active_banners_use_banner_index(self, query_plan):
+        """Active banners are read in carousel order from the index."""
+        queryset = DealBanner.objects.filter(is_active=True).order_by(
+            "-is_featured", "order", "-created_at"
+        )
+
+        assert "dealbanner_active_idx" in query_plan(queryset)
@@ -0,0 +1,200 @@
+"""Tests for the sectioned archive reader and reading progress."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
+
+from elysium_archive import metrics
+from orders.models import AccessEntitlement
+from products.content import render_content
+from products.models import Product, ProductSection, ReadingProgress
+
+User = get_user_model()
+
+LONG_CONTENT = (
+    "<p>Prologue.</p>"
+    "<h2>First</h2><p>One.</p><h3>Aside</h3>"
+    "<div><h2>Nested</h2></div>"
+    "<h2>Second</h2><p>Two.</p>"
+)
+
+
+@pytest.fixture
+def long_entry(product_active):
+    """Give the test product three sections."""
+    product_active.content = LONG_CONTENT
+    product_active.save(update_fields=["content", "updated_at"])
+    return product_active
+
+
+def _section_url(product, position):
+    return reverse(
+        "archive_section",
+        kwargs={"slug": product.slug, "position": position},
+    )
+
+
+class TestSplitSections:
+    """render_content() splits at top-level h2 headings."""
+
+    def test_prologue_becomes_untitled_first_section(self):
+        """Content before the first h2 is section 0; nested h2s stay put."""
+        rendered = render_content(LONG_CONTENT)
+
+        assert [section["title"] for section in rendered.sections] == [
+            "",
+            "First",
+            "Second",
+        ]
+        assert rendered.sections[1]["anchor"] == "first"
+        assert '<h2 id="nested">' in rendered.sections[1]["html"]
+        assert "".join(s["html"] for s in rendered.sections) == rendered.html
+        assert [entry["section"] for entry in rendered.toc] == [1, 1, 1, 2]
+
+    def test_content_without_headings_is_one_section(self):
+        """An entry without h2 headings is a single section."""
+        rendered = render_content("<p>Short.</p>")
+
+        assert len(rendered.sections) == 1
+        assert rendered.sections[0]["html"] == "<p>Short.</p>"
+
+
+@pytest.mark.django_db
+class TestStoredSections:
+    """Sections are stored when the content changes."""
+
+    def test_save_replaces_sections(self, long_entry):
+        """Saving new content rewrites the section rows and count."""
+        assert long_entry.section_count == 3
+        assert list(
+            ProductSection.objects.filter(product=long_entry).values_list(
+                "position", "title"
+            )
+        ) == [(0, ""), (1, "First"), (2, "Second")]
+
+        long_entry.content = "<p>Rewritten.</p>"
+        long_entry.save()
+
+        assert Product.objects.get(pk=long_entry.pk).section_count == 1
+        assert ProductSection.objects.filter(product=long_entry).count() == 1
+
+    def test_import_stores_sections(self, tmp_path):
+        """Imported rows get their sections without calling save()."""
+        path = tmp_path / "catalog.jsonl"
+        path.write_text(
+            '{"title": "Imported", "tagline": "t", "description": "d", '
+            '"content": "<h2>A</h2><h2>B</h2>", "price": "4.99"}\n'
+        )
+
+        call_command("import_catalog", str(path))
+        call_command("import_catalog", str(path))
+
+        product = Product.objects.get(slug="imported")
+        assert product.section_count == 2
+        assert product.sections.count() == 2
+
+
+@pytest.mark.django_db
+class TestSectionEndpoint:
+    """Sections after the first are served to entitled readers."""
+
+    def test_reader_page_sends_only_the_first_section(
+        self, client, verified_user, entitlement, long_entry
+    ):
+        """The page renders section 0 and links the rest."""
+        client.force_login(verified_user)
+
+        response = client.get(
+            reverse("archive_read", kwargs={"slug": long_entry.slug})
+        )
+
+        assert b"Prologue." in response.content
+        assert b"Two." not in response.content
+        assert b'data-next-section="1"' in response.content
+        assert "content_html" in (
+            response.context["product"].get_deferred_fields()
+        )
+
+    def test_section_json_with_cached_access(
+        self,
+        client,
+        verified_user,
+        entitlement,
+        long_entry,
+        django_assert_num_queries,
+    ):
+        """A warm access cache leaves one query per section."""
+        client.force_login(verified_user)
+        client.get(_section_url(long_entry, 1))
+        metrics.reset()
+
+        with django_assert_num_queries(3):
+            # Session and user lookups, then the section itself.
+            response = client.get(_section_url(long_entry, 2))
+
+        assert response.json() == {
+            "position": 2,
+            "title": "Second",
+            "anchor": "second",
+            "html": '<h2 id="second">Second</h2><p>Two.</p>',
+            "next": None,
+        }
+        assert metrics.cache_stats()["entitlements"]["hits"] == 1
+
+    def test_section_requires_entitlement(
+        self, client, verified_user, long_entry
+    ):
+        """Readers without access are refused; missing sections are 404."""
+        client.force_login(verified_user)
+
+        assert client.get(_section_url(long_entry, 1)).status_code == 403
+        assert client.get(_section_url(long_entry, 9)).status_code == 404
+
+    def test_revoked_access_is_forgotten(
+        self, admin_client, client, verified_user, entitlement, long_entry
+    ):
+        """Deleting an entitlement in the admin clears the cached grant."""
+        client.force_login(verified_user)
+        assert client.get(_section_url(long_entry, 1)).status_code == 200
+        key = f"access:{verified_user.pk}:{long_entry.pk}"
+        assert caches["entitlements"].get(key) is True
+
+        admin_client.post(
+            reverse(
+                "admin:orders_accessentitlement_delete",
+                args=[entitlement.pk],
+            ),
+            {"post": "yes"},
+        )
+
+        assert not AccessEntitlement.objects.exists()
+        assert caches["entitlements"].get(key) is None
+        assert client.get(_section_url(long_entry, 1)).status_code == 403
+
+
+@pytest.mark.django_db
+class TestReadingProgress:
+    """Progress keeps the furthest section reached."""
+
+    def test_progress_only_moves_forward(
+        self, client, verified_user, entitlement, long_entry
+    ):
+        """Earlier sections do not lower the stored progress."""
+        client.force_login(verified_user)
+        url = reverse("archive_progress", kwargs={"slug": long_entry.slug})
+
+        assert client.post(url, {"section": 1}).json() == {
+            "section": 1,
+            "percent": 67,
+        }
+        assert client.post(url, {"section": 0}).json()["section"] == 1
+        assert client.post(url, {"section": 3}).status_code == 400
+        assert ReadingProgress.objects.get().section == 1
+
+        response = client.get(
+            reverse("archive_read", kwargs={"slug": long_entry.slug})
+        )
+        assert response.context["reading_percent"] == 67
+        assert b"Continue where you left off" in response.content
@@ -0,0 +1,167 @@
+"""Tests for the co-purchase recommendation index."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from orders.models import AccessEntitlement
+from products.models import Product, ProductRecommendation
+from products.recommendations import (
+    rebuild_recommendations,
+    recommendations_for,
+    refresh_recommendations,
+)
+
+User = get_user_model()
+
+
+def _neighbours(product):
+    """Return the stored (slug, co-purchases) neighbours of a product."""
+    return [
+        (row.recommended.slug, row.co_purchases)
+        for row in ProductRecommendation.objects.filter(
+            product=product
+        ).select_related("recommended")
+    ]
+
+
+@pytest.fixture
+def shelf(category):
+    """Create four products named a to d."""
+    return {
+        name: Product.objects.create(
+            title=f"Entry {name}",
+            slug=f"entry-{name}",
+            tagline="Test tagline",
+            description="Test description",
+            content="<p>Test premium content.</p>",
+            price=Decimal("9.99"),
+            image_alt="Test image",
+            category=category,
+        )
+        for name in "abcd"
+    }
+
+
+@pytest.fixture
+def grant(shelf):
+    """Return a helper that gives a new or existing user some products."""
+    users = {}
+
+    def _grant(username, names, granted_at=None):
+        user = users.get(username)
+        if user is None:
+            user = users[username] = User.objects.create_user(
+                username=username
+            )
+        for name in names:
+            entitlement = AccessEntitlement.objects.create(
+                user=user, product=shelf[name]
+            )
+            if granted_at is not None:
+                AccessEntitlement.objects.filter(pk=entitlement.pk).update(
+                    granted_at=granted_at
+                )
+
+    return _grant
+
+
+@pytest.mark.django_db
+class TestRecommendationIndex:
+    """Neighbours are ranked by cosine similarity of buyer sets."""
+
+    def test_rebuild_ranks_by_similarity(self, shelf, grant):
+        """The product bought together most often ranks first."""
+        grant("ann", "ab")
+        grant("bob", "ab")
+        grant("cat", "ac")
+        grant("dan", "d")
+
+        assert rebuild_recommendations() == 4
+        assert _neighbours(shelf["a"]) == [("entry-b", 2), ("entry-c", 1)]
+        assert _neighbours(shelf["b"]) == [("entry-a", 2)]
+        assert _neighbours(shelf["d"]) == []
+
+        scores = {
+            row.recommended.slug: row.score
+            for row in ProductRecommendation.objects.filter(product=shelf["a"])
+        }
+        assert scores["entry-b"] == pytest.approx(2 / (3 * 2) ** 0.5)
+
+    def test_incremental_refresh_touches_only_new_baskets(self, shelf, grant):
+        """A refresh rebuilds the rows of products the new buyers own."""
+        old = timezone.now() - timedelta(days=3)
+        grant("ann", "ab", granted_at=old)
+        grant("bob", "cd", granted_at=old)
+        rebuild_recommendations()
+        ProductRecommendation.objects.filter(product=shelf["c"]).update(
+            score=0.123
+        )
+
+        grant("ann", "c")
+        refreshed = refresh_recommendations(
+            timezone.now() - timedelta(hours=1)
+        )
+
+        assert refreshed == 3
+        assert [slug for slug, _ in _neighbours(shelf["a"])] == [
+            "entry-b",
+            "entry-c",
+        ]
+        assert {slug for slug, _ in _neighbours(shelf["c"])} == {
+            "entry-a",
+            "entry-b",
+            "entry-d",
+        }
+        # d was not bought by a new buyer, so its row is left alone.
+        assert _neighbours(shelf["d"]) == [("entry-c", 1)]
+
+    def test_refresh_without_new_sales_is_a_noop(self, grant):
+        """Nothing is recomputed when no entitlement is new."""
+        grant("ann", "ab", granted_at=timezone.now() - timedelta(days=3))
+
+        assert refresh_recommendations(timezone.now()) == 0
+        assert not ProductRecommendation.objects.exists()
+
+    def test_command_full_and_since(self, grant, capsys):
+        """The command rebuilds, or refreshes with --since."""
+        grant("ann", "ab")
+
+        call_command("build_recommendations")
+        assert "2 recommendation(s) stored" in capsys.readouterr().out
+
+        call_command("build_recommendations", "--since", "2000-01-01")
+        assert "refreshed for 2 product(s)" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestRecommendationDisplay:
+    """The detail page shows public neighbours with one query."""
+
+    def test_hidden_products_are_not_recommended(
+        self, shelf, grant, django_assert_num_queries
+    ):
+        """Inactive neighbours are filtered by the lookup."""
+        grant("ann", "abc")
+        rebuild_recommendations()
+        Product.objects.filter(pk=shelf["c"].pk).update(is_active=False)
+
+        with django_assert_num_queries(1):
+            recommended = recommendations_for(shelf["a"])
+
+        assert [product.slug for product in recommended] == ["entry-b"]
+
+    def test_detail_page_renders_recommendations(self, client, shelf, grant):
+        """The detail page lists the stored neighbours."""
+        grant("ann", "ab")
+        rebuild_recommendations()
+
+        response = client.get(reverse("product_detail", args=["entry-a"]))
+
+        assert response.context["recommended_products"] == [shelf["b"]]
+        assert b"Customers Also Unlocked" in response.content
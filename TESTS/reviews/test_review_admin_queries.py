@@ -0,0 +1,54 @@
+"""Query-count regression tests for the review admin changelist."""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from orders.models import AccessEntitlement
+from products.models import Product
+from reviews.models import Review
+
+User = get_user_model()
+
+
+def _create_reviews(category, start, count):
+    """Create reviews on separate products, half of them verified."""
+    for index in range(start, start + count):
+        user = User.objects.create_user(
+            username=f"critic{index}",
+            email=f"critic{index}@test.com",
+        )
+        product = Product.objects.create(
+            title=f"Reviewed Product {index}",
+            slug=f"reviewed-product-{index}",
+            tagline="Test tagline",
+            description="Test description",
+            content="<p>Test premium content.</p>",
+            price=Decimal("9.99"),
+            image_alt="Test image",
+            category=category,
+        )
+        if index % 2 == 0:
+            AccessEntitlement.objects.create(user=user, product=product)
+        Review.objects.create(
+            user=user,
+            product=product,
+            rating=4,
+            title=f"Review {index}",
+            body="A thoughtful review body.",
+        )
+
+
+@pytest.mark.django_db
+def test_review_changelist_query_count_is_constant(
+    admin_changelist_queries, category
+):
+    """Review changelist runs the same queries for 3 and 9 reviews."""
+    _create_reviews(category, 0, 3)
+    baseline = admin_changelist_queries("admin:reviews_review_changelist")
+
+    _create_reviews(category, 3, 6)
+    assert (
+        admin_changelist_queries("admin:reviews_review_changelist") == baseline
+    )
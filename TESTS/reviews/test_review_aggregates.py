@@ -0,0 +1,218 @@
+"""Tests for the denormalized product review aggregates."""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from orders.models import AccessEntitlement
+from orders.services import record_sales
+from products.models import Product
+from reviews.models import Review
+from reviews.services import (
+    add_review,
+    refresh_review_aggregates,
+    remove_review,
+    remove_reviews,
+    update_review,
+)
+
+User = get_user_model()
+
+
+def _aggregates(product):
+    """Return the stored aggregates of a product."""
+    product = Product.objects.get(pk=product.pk)
+    return {
+        "count": product.review_count,
+        "sum": product.rating_sum,
+        "avg": product.rating_avg,
+        "histogram": dict(product.rating_histogram),
+    }
+
+
+def _make_users(count):
+    """Create plain users."""
+    return [
+        User.objects.create_user(username=f"rater{index}")
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestReviewServices:
+    """Test that every write keeps the aggregates exact."""
+
+    def test_add_update_and_remove(self, product_active):
+        """Counts, sum, average and histogram follow each write."""
+        first, second = _make_users(2)
+        review = add_review(
+            Review(user=first, product=product_active, rating=5)
+        )
+        add_review(Review(user=second, product=product_active, rating=2))
+
+        stats = _aggregates(product_active)
+        assert stats["count"] == 2
+        assert stats["sum"] == 7
+        assert stats["avg"] == Decimal("3.50")
+        assert stats["histogram"] == {5: 1, 4: 0, 3: 0, 2: 1, 1: 0}
+
+        review.rating = 4
+        update_review(review)
+        stats = _aggregates(product_active)
+        assert stats["avg"] == Decimal("3.00")
+        assert stats["histogram"][5] == 0
+        assert stats["histogram"][4] == 1
+
+        remove_review(review)
+        stats = _aggregates(product_active)
+        assert stats["count"] == 1
+        assert stats["avg"] == Decimal("2.00")
+
+    def test_moving_a_review_updates_both_products(
+        self, product_active, product_inactive
+    ):
+        """Changing a review's product moves its rating."""
+        (user,) = _make_users(1)
+        review = add_review(
+            Review(user=user, product=product_active, rating=3)
+        )
+
+        review.product = product_inactive
+        update_review(review)
+
+        assert _aggregates(product_active)["count"] == 0
+        assert _aggregates(product_inactive)["sum"] == 3
+
+    def test_bulk_remove_recomputes(self, product_active):
+        """Deleting a queryset leaves exact aggregates."""
+        users = _make_users(3)
+        for user, rating in zip(users, (1, 4, 5)):
+            add_review(
+                Review(user=user, product=product_active, rating=rating)
+            )
+
+        remove_reviews(Review.objects.filter(rating__gte=4))
+
+        stats = _aggregates(product_active)
+        assert stats["count"] == 1
+        assert stats["avg"] == Decimal("1.00")
+
+    def test_refresh_repairs_drift_in_one_pass(
+        self, product_active, product_inactive, django_assert_max_num_queries
+    ):
+        """The repair recomputes everything, including stale products."""
+        users = _make_users(3)
+        Review.objects.bulk_create(
+            [
+                Review(user=user, product=product_active, rating=rating)
+                for user, rating in zip(users, (2, 3, 5))
+            ]
+        )
+        Product.objects.filter(pk=product_inactive.pk).update(
+            review_count=9, rating_sum=45, rating_5=9
+        )
+
+        with django_assert_max_num_queries(6):
+            refreshed = refresh_review_aggregates()
+
+        assert refreshed == 1
+        assert _aggregates(product_active)["avg"] == Decimal("3.33")
+        assert _aggregates(product_inactive)["count"] == 0
+        assert _aggregates(product_inactive)["histogram"][5] == 0
+
+    def test_stale_full_save_keeps_aggregates(self, product_active):
+        """Saving an instance loaded before a review keeps its count."""
+        stale = Product.objects.get(pk=product_active.pk)
+        (user,) = _make_users(1)
+        add_review(Review(user=user, product=product_active, rating=4))
+        record_sales([product_active.pk])
+
+        stale.title = "Renamed"
+        stale.save()
+
+        product = Product.objects.get(pk=product_active.pk)
+        assert product.title == "Renamed"
+        assert _aggregates(product)["count"] == 1
+        assert product.popularity_score == 1
+
+    def test_repair_command(self, product_active, capsys):
+        """The command rebuilds the aggregates and reports a count."""
+        (user,) = _make_users(1)
+        Review.objects.create(user=user, product=product_active, rating=4)
+
+        call_command("repair_review_aggregates")
+
+        assert _aggregates(product_active)["count"] == 1
+        assert "1 product(s)" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestReviewAggregateViews:
+    """Test the aggregates through the user-facing flows."""
+
+    def test_review_views_maintain_aggregates(
+        self, client, verified_user, product_active
+    ):
+        """Create, edit and delete requests keep the aggregates in step."""
+        AccessEntitlement.objects.create(
+            user=verified_user, product=product_active
+        )
+        client.force_login(verified_user)
+
+        client.post(
+            reverse("create_review", args=[product_active.slug]),
+            {"rating": 5, "title": "", "body": ""},
+        )
+        review = Review.objects.get(user=verified_user)
+        assert _aggregates(product_active)["sum"] == 5
+
+        client.post(
+            reverse("edit_review", args=[product_active.slug, review.pk]),
+            {"rating": 1, "title": "", "body": ""},
+        )
+        assert _aggregates(product_active)["sum"] == 1
+
+        client.post(
+            reverse("delete_review", args=[product_active.slug, review.pk])
+        )
+        assert _aggregates(product_active)["count"] == 0
+
+    def test_account_deletion_removes_ratings(
+        self, client, verified_user, product_active
+    ):
+        """Deleting an account takes its reviews out of the aggregates."""
+        add_review(
+            Review(user=verified_user, product=product_active, rating=5)
+        )
+        client.force_login(verified_user)
+
+        client.post(reverse("account_delete"))
+
+        assert not User.objects.filter(pk=verified_user.pk).exists()
+        assert _aggregates(product_active)["count"] == 0
+
+    def test_archive_sorts_by_rating(self, client, category):
+        """sort=rating orders by the stored average."""
+        low, high = (
+            Product.objects.create(
+                title=title,
+                tagline="t",
+                description="d",
+                content="c",
+                price=Decimal("5.00"),
+                category=category,
+            )
+            for title in ("Low Rated", "High Rated")
+        )
+        first, second = _make_users(2)
+        add_review(Review(user=first, product=low, rating=2))
+        add_review(Review(user=second, product=high, rating=5))
+
+        response = client.get(reverse("archive"), {"sort": "rating"})
+
+        titles = [product.title for product in response.context["products"]]
+        assert titles[:2] == ["High Rated", "Low Rated"]
+        assert "★ 5.0 (1)" in response.content.decode()
@@ -0,0 +1,181 @@
+"""Tests for keyset-paginated product reviews."""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from orders.models import AccessEntitlement
+from products.models import Product
+from reviews.models import Review
+from reviews.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    review_page,
+)
+from reviews.services import refresh_review_aggregates
+
+User = get_user_model()
+
+
+@pytest.fixture
+def many_reviews(product_active):
+    """Create 25 reviews with distinct, descending timestamps."""
+    now = timezone.now()
+    users = [
+        User.objects.create_user(username=f"reader{index}")
+        for index in range(25)
+    ]
+    reviews = Review.objects.bulk_create(
+        [
+            Review(user=user, product=product_active, rating=1 + index % 5)
+            for index, user in enumerate(users)
+        ]
+    )
+    for index, review in enumerate(reviews):
+        # Two reviews share each timestamp to exercise the id tie-break.
+        Review.objects.filter(pk=review.pk).update(
+            created_at=now - timedelta(minutes=index // 2)
+        )
+    refresh_review_aggregates([product_active.pk])
+    return list(
+        Review.objects.filter(product=product_active).order_by(
+            "-created_at", "-pk"
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestReviewPage:
+    """Test the keyset pagination helper."""
+
+    def test_pages_cover_every_review_once(self, product_active, many_reviews):
+        """Walking the cursors returns each review exactly once, in order."""
+        seen = []
+        cursor = None
+        while True:
+            page = review_page(product_active, cursor=cursor, page_size=10)
+            seen.extend(page.reviews)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert [review.pk for review in seen] == [
+            review.pk for review in many_reviews
+        ]
+
+    def test_viewer_review_comes_with_the_page_in_one_query(
+        self, product_active, many_reviews, django_assert_num_queries
+    ):
+        """The viewer's review is found even when it is not on the page."""
+        oldest = many_reviews[-1]
+        viewer = oldest.user
+
+        with django_assert_num_queries(1):
+            page = review_page(product_active, viewer=viewer)
+            authors = [review.user.username for review in page.reviews]
+
+        assert page.viewer_review == oldest
+        assert oldest not in page.reviews
+        assert [review.pk for review in page.reviews] == [
+            review.pk for review in many_reviews[:10]
+        ]
+        assert page.next_cursor is not None
+        assert len(authors) == 10
+
+    def test_viewer_review_stays_in_order_on_its_page(
+        self, product_active, many_reviews
+    ):
+        """A viewer review inside the page keeps its position."""
+        viewer_review = many_reviews[3]
+
+        page = review_page(product_active, viewer=viewer_review.user)
+
+        assert page.viewer_review == viewer_review
+        assert page.reviews == many_reviews[:10]
+
+    def test_cursor_round_trip_and_rejection(self, many_reviews):
+        """Cursors decode to their review's position; junk is rejected."""
+        review = many_reviews[0]
+        assert decode_cursor(encode_cursor(review)) == (
+            review.created_at,
+            review.pk,
+        )
+        with pytest.raises(InvalidCursor):
+            decode_cursor("not-a-cursor")
+
+
+@pytest.mark.django_db
+class TestReviewEndpoints:
+    """Test the detail page and the review list endpoint."""
+
+    def test_detail_embeds_first_page_only(
+        self, client, product_active, many_reviews
+    ):
+        """The detail page renders one page and a load-more cursor."""
+        response = client.get(product_active.get_absolute_url())
+
+        assert len(response.context["reviews"]) == 10
+        assert response.context["reviews_next_cursor"]
+        assert b'id="load-more-reviews"' in response.content
+
+    def test_detail_finds_owner_review_beyond_first_page(
+        self, client, verified_user, product_active, many_reviews
+    ):
+        """A buyer's old review is still shown as their own."""
+        AccessEntitlement.objects.create(
+            user=verified_user, product=product_active
+        )
+        own = Review.objects.create(
+            user=verified_user,
+            product=product_active,
+            rating=4,
+            title="Mine",
+        )
+        Review.objects.filter(pk=own.pk).update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+        client.force_login(verified_user)
+
+        response = client.get(product_active.get_absolute_url())
+
+        assert response.context["user_review"].pk == own.pk
+        assert response.context["can_review"] is False
+
+    def test_review_list_returns_next_page(
+        self, client, product_active, many_reviews
+    ):
+        """The endpoint continues from a cursor with JSON and HTML."""
+        first = review_page(product_active, page_size=10)
+
+        response = client.get(
+            reverse("review_list", args=[product_active.slug]),
+            {"after": first.next_cursor},
+        )
+
+        data = response.json()
+        assert [item["id"] for item in data["reviews"]] == [
+            review.pk for review in many_reviews[10:20]
+        ]
+        assert data["html"].count('class="review-card"') == 10
+        assert data["next"]
+
+    def test_review_list_rejects_bad_cursor(self, client, product_active):
+        """A malformed cursor is a client error."""
+        response = client.get(
+            reverse("review_list", args=[product_active.slug]),
+            {"after": "%%%"},
+        )
+        assert response.status_code == 400
+
+    def test_review_list_hides_inactive_products(self, client, product_active):
+        """Inactive entries have no public review list."""
+        Product.objects.filter(pk=product_active.pk).update(is_active=False)
+
+        response = client.get(
+            reverse("review_list", args=[product_active.slug])
+        )
+        assert response.status_code == 404
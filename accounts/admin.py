@@ -6,7 +6,7 @@ from django.contrib import admin
 from django.contrib.admin.sites import NotRegistered
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef
 from django.utils.html import format_html
 
 User = get_user_model()
@@ -63,9 +63,18 @@ class UserAdmin(BaseUserAdmin):
     search_fields = ("username", "email", "first_name", "last_name")
 
     def get_queryset(self, request):
-        """Annotate users with entitlement count."""
+        """Annotate users with entitlement count and verification status."""
+        from allauth.account.models import EmailAddress
+
         queryset = super().get_queryset(request)
-        return queryset.annotate(entitlement_total=Count("entitlements"))
+        verified_emails = EmailAddress.objects.filter(
+            user=OuterRef("pk"), verified=True
+        )
+        return (
+            queryset.select_related("profile")
+            .annotate(entitlement_total=Count("entitlements"))
+            .annotate(email_verified=Exists(verified_emails))
+        )
 
     def user_display(self, obj):
         """Display user with avatar/placeholder."""
@@ -113,9 +122,11 @@ class UserAdmin(BaseUserAdmin):
         try:
             from allauth.account.models import EmailAddress
 
-            verified = EmailAddress.objects.filter(
-                user=obj, verified=True
-            ).exists()
+            verified = getattr(obj, "email_verified", None)
+            if verified is None:
+                verified = EmailAddress.objects.filter(
+                    user=obj, verified=True
+                ).exists()
         except Exception as exc:
             verified = False
             logger.warning(
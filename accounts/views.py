@@ -3,13 +3,18 @@
 from allauth.account.utils import has_verified_email
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.db.models import Prefetch
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
+from elysium_archive.helpers import forget_access
 from orders.models import AccessEntitlement, Order, OrderLineItem
+from orders.services import refresh_sales_counts
+from products.models import defer_product_bodies
 from reviews.models import Review
+from reviews.services import remove_reviews
 
 from .forms import UserProfileForm
 from .models import UserProfile
@@ -79,29 +84,25 @@ def dashboard(request):
         }
         active_tab = tab_map.get(requested_tab, "profile")
 
-    entitlements = (
+    entitlements = defer_product_bodies(
         AccessEntitlement.objects.filter(user=request.user)
-        .select_related("product")
-        .order_by("-granted_at")
-    )
+    ).order_by("-granted_at")
 
     unlocked_products = [
         {"product": e.product, "purchase_date": e.granted_at}
         for e in entitlements
     ]
 
-    line_items_qs = OrderLineItem.objects.select_related("product")
+    line_items_qs = defer_product_bodies(OrderLineItem.objects.all())
     orders = (
         Order.objects.filter(user=request.user)
         .prefetch_related(Prefetch("line_items", queryset=line_items_qs))
         .order_by("-created_at")
     )
 
-    reviews = (
+    reviews = defer_product_bodies(
         Review.objects.filter(user=request.user)
-        .select_related("product")
-        .order_by("-created_at")
-    )
+    ).order_by("-created_at")
 
     # Build a dict for quick lookup of user reviews by product ID
     user_reviews_by_product = {review.product_id: review for review in reviews}
@@ -170,7 +171,18 @@ def delete_account(request):
             )
             return redirect("account_dashboard")
 
-        request.user.delete()
+        with transaction.atomic():
+            # Keep product aggregates right for the cascaded rows.
+            remove_reviews(Review.objects.filter(user=request.user))
+            product_pks = list(
+                AccessEntitlement.objects.filter(
+                    user=request.user
+                ).values_list("product_id", flat=True)
+            )
+            user_pk = request.user.pk
+            request.user.delete()
+            refresh_sales_counts(product_pks)
+        forget_access((user_pk, product_pk) for product_pk in product_pks)
         messages.success(request, "Your account has been deleted.")
         return redirect("home")
 
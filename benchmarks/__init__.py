@@ -0,0 +1,4 @@
+"""Request benchmarks for the main storefront endpoints.
+
+Run with ``python -m benchmarks.run``; see TESTING.md for the options.
+"""
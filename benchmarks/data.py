@@ -0,0 +1,202 @@
+"""Synthetic catalog, user and order data for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils.crypto import get_random_string
+
+from orders.models import AccessEntitlement, Order, OrderLineItem
+from orders.services import refresh_popularity_scores, refresh_sales_counts
+from products.models import (
+    Category,
+    DealBanner,
+    Product,
+    sync_banner_targets,
+    sync_product_pricing,
+)
+from products.recommendations import rebuild_recommendations
+from reviews.models import Review
+from reviews.services import refresh_review_aggregates
+
+User = get_user_model()
+
+WORDS = (
+    "ancient lost secret royal forgotten hidden imperial sacred golden "
+    "celestial scroll codex letters atlas chronicle ledger maps manuscript"
+).split()
+
+
+@dataclass
+class Dataset:
+    """Handles to generated rows that the scenarios need."""
+
+    categories: list[Category] = field(default_factory=list)
+    products: list[Product] = field(default_factory=list)
+    users: list = field(default_factory=list)
+    shopper: object = None
+
+
+def _title(rng: random.Random, index: int) -> str:
+    """Return a readable, unique product title."""
+    words = rng.sample(WORDS, 3)
+    return f"{' '.join(words).title()} {index}"
+
+
+def generate_dataset(
+    products: int = 500,
+    categories: int = 12,
+    banners: int = 10,
+    users: int = 200,
+    orders: int = 1000,
+    reviews: int = 1500,
+    seed: int = 42,
+) -> Dataset:
+    """Create a deterministic dataset with bulk inserts."""
+    rng = random.Random(seed)
+    dataset = Dataset()
+
+    dataset.categories = Category.objects.bulk_create(
+        [
+            Category(name=f"Collection {index}", slug=f"collection-{index}")
+            for index in range(categories)
+        ]
+    )
+
+    dataset.products = Product.objects.bulk_create(
+        [
+            Product(
+                title=_title(rng, index),
+                slug=f"bench-product-{index}",
+                tagline="A benchmark archive entry",
+                description=" ".join(rng.choices(WORDS, k=40)),
+                content="<p>" + " ".join(rng.choices(WORDS, k=400)) + "</p>",
+                price=Decimal(rng.randrange(299, 4999)) / 100,
+                image_alt="Benchmark cover",
+                category=rng.choice(dataset.categories),
+                is_featured=index % 25 == 0,
+            )
+            for index in range(products)
+        ]
+    )
+
+    banner_targets = rng.sample(dataset.products, min(banners, products))
+    DealBanner.objects.bulk_create(
+        [
+            DealBanner(
+                title="DEAL",
+                message=f"Save on {product.title}",
+                product=product if index % 2 else None,
+                category=None if index % 2 else product.category,
+                discount_percentage=Decimal(rng.choice([10, 15, 20, 25])),
+                order=index,
+            )
+            for index, product in enumerate(banner_targets)
+        ]
+    )
+    sync_banner_targets(
+        product_pks=[product.pk for product in banner_targets],
+        category_pks=[product.category_id for product in banner_targets],
+    )
+    # Bulk inserts skip Product.save(), so store every list price too.
+    sync_product_pricing(Product.objects.all())
+
+    password = make_password(get_random_string(16))
+    dataset.users = User.objects.bulk_create(
+        [
+            User(
+                username=f"reader{index}",
+                email=f"reader{index}@bench.test",
+                password=password,
+            )
+            for index in range(users)
+        ]
+    )
+    EmailAddress.objects.bulk_create(
+        [
+            EmailAddress(
+                user=user, email=user.email, verified=True, primary=True
+            )
+            for user in dataset.users
+        ]
+    )
+    dataset.shopper = dataset.users[0]
+
+    _generate_orders(rng, dataset, orders)
+    _generate_reviews(rng, dataset, reviews)
+    return dataset
+
+
+def _generate_orders(rng: random.Random, dataset: Dataset, count: int):
+    """Create paid orders with one line item and entitlement each."""
+    # The shopper owns nothing, so cart and checkout stay representative.
+    buyers = dataset.users[1:]
+    target = min(count, len(buyers) * len(dataset.products))
+    owned = set()
+    purchases = []
+    while len(purchases) < target:
+        user, product = rng.choice(buyers), rng.choice(dataset.products)
+        if (user.pk, product.pk) not in owned:
+            owned.add((user.pk, product.pk))
+            purchases.append((user, product))
+
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                user=user,
+                order_number=f"BENCH{index:011d}",
+                total=product.price,
+                status="paid",
+            )
+            for index, (user, product) in enumerate(purchases)
+        ]
+    )
+    OrderLineItem.objects.bulk_create(
+        [
+            OrderLineItem(
+                order=order,
+                product=product,
+                product_title=product.title,
+                product_price=product.price,
+                line_total=product.price,
+            )
+            for order, (_, product) in zip(orders, purchases)
+        ]
+    )
+    AccessEntitlement.objects.bulk_create(
+        [
+            AccessEntitlement(user=user, product=product, order=order)
+            for order, (user, product) in zip(orders, purchases)
+        ]
+    )
+    refresh_sales_counts()
+    refresh_popularity_scores()
+    rebuild_recommendations()
+
+
+def _generate_reviews(rng: random.Random, dataset: Dataset, count: int):
+    """Create reviews from distinct user/product pairs."""
+    buyers = dataset.users[1:]
+    target = min(count, len(buyers) * len(dataset.products))
+    pairs = set()
+    while len(pairs) < target:
+        pairs.add((rng.choice(buyers).pk, rng.choice(dataset.products).pk))
+
+    Review.objects.bulk_create(
+        [
+            Review(
+                user_id=user_pk,
+                product_id=product_pk,
+                rating=rng.randint(1, 5),
+                title="Benchmark review",
+                body=" ".join(rng.choices(WORDS, k=30)),
+            )
+            for user_pk, product_pk in sorted(pairs)
+        ]
+    )
+    refresh_review_aggregates()
@@ -0,0 +1,352 @@
+"""Benchmark the storefront endpoints against a synthetic dataset.
+
+Creates a throwaway test database, fills it with benchmarks.data, drives the
+Django test client through each scenario and records latency percentiles
+and query counts. Stripe is replaced by a local stub, so no network is used.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --products 2000 --iterations 50
+    python -m benchmarks.run --update-baseline
+
+The run exits with status 1 when an endpoint issues more queries than the
+baseline or its p95 latency grows beyond the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Scenario:
+    """One benchmarked request."""
+
+    name: str
+    method: str
+    url: Callable[[int], str]
+    login: bool = False
+    setup: Callable[[int], object] | None = None
+    data: Callable[[object], dict] | None = None
+    expected_status: tuple[int, ...] = (200,)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _stripe_stub():
+    """Patch the Stripe calls made by checkout and the webhook."""
+    session_counter = iter(range(1, 10**9))
+
+    def create_session(**_kwargs):
+        number = next(session_counter)
+        return SimpleNamespace(
+            id=f"cs_bench_{number}",
+            url=f"https://checkout.stripe.test/pay/cs_bench_{number}",
+        )
+
+    def construct_event(payload, _signature, _secret):
+        return json.loads(payload)
+
+    stack = ExitStack()
+    stack.enter_context(
+        patch("checkout.views._set_stripe_key", return_value=True)
+    )
+    stack.enter_context(
+        patch(
+            "checkout.views.stripe.checkout.Session.create",
+            side_effect=create_session,
+        )
+    )
+    stack.enter_context(
+        patch(
+            "checkout.webhooks.stripe.Webhook.construct_event",
+            side_effect=construct_event,
+        )
+    )
+    return stack
+
+
+def build_scenarios(dataset) -> list[Scenario]:
+    """Return the benchmarked endpoints for a generated dataset."""
+    from django.urls import reverse
+
+    from orders.models import Order, OrderLineItem
+
+    products = dataset.products
+    category_slug = dataset.categories[0].slug
+    archive_url = reverse("archive")
+
+    def fill_cart(client):
+        session = client.session
+        session["cart"] = {str(product.pk): 1 for product in products[:3]}
+        session.save()
+
+    def fresh_checkout(_iteration):
+        Order.objects.filter(user=dataset.shopper, status="pending").update(
+            status="failed"
+        )
+        fill_cart(_CLIENTS["shopper"])
+
+    def pending_order(iteration):
+        order = Order.objects.create(
+            user=dataset.shopper,
+            total=products[0].price,
+            status="pending",
+        )
+        OrderLineItem.objects.create(
+            order=order,
+            product=products[iteration % len(products)],
+            product_title="Benchmark",
+            product_price=products[0].price,
+        )
+        return order
+
+    def webhook_event(order):
+        return {
+            "id": f"evt_bench_{order.pk}",
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "id": f"cs_bench_wh_{order.pk}",
+                    "payment_intent": f"pi_bench_{order.pk}",
+                    "payment_status": "paid",
+                    "metadata": {"order_id": str(order.pk)},
+                }
+            },
+        }
+
+    return [
+        Scenario("home", "get", lambda _i: reverse("home")),
+        Scenario("archive", "get", lambda _i: archive_url),
+        Scenario("archive_search", "get", lambda _i: f"{archive_url}?q=codex"),
+        Scenario(
+            "archive_category",
+            "get",
+            lambda _i: f"{archive_url}?cat={category_slug}",
+        ),
+        Scenario(
+            "archive_deals", "get", lambda _i: f"{archive_url}?deals=true"
+        ),
+        Scenario(
+            "product_detail",
+            "get",
+            lambda i: products[i % len(products)].get_absolute_url(),
+        ),
+        Scenario(
+            "cart",
+            "get",
+            lambda _i: reverse("cart"),
+            login=True,
+            setup=lambda _i: fill_cart(_CLIENTS["shopper"]),
+        ),
+        Scenario(
+            "checkout",
+            "post",
+            lambda _i: reverse("checkout"),
+            login=True,
+            setup=fresh_checkout,
+            expected_status=(302,),
+        ),
+        Scenario(
+            "webhook",
+            "post",
+            lambda _i: reverse("stripe_webhook"),
+            setup=pending_order,
+            data=webhook_event,
+        ),
+    ]
+
+
+# Clients shared by scenarios: an anonymous visitor and a logged-in shopper.
+_CLIENTS: dict = {}
+
+
+def run_scenario(scenario: Scenario, iterations: int, warmup: int) -> dict:
+    """Run one scenario and return its latency and query statistics."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    client = _CLIENTS["shopper" if scenario.login else "anonymous"]
+    timings = []
+    queries = []
+
+    for iteration in range(warmup + iterations):
+        prepared = scenario.setup(iteration) if scenario.setup else None
+        kwargs = {}
+        if scenario.data is not None:
+            kwargs = {
+                "data": json.dumps(scenario.data(prepared)),
+                "content_type": "application/json",
+                "HTTP_STRIPE_SIGNATURE": "bench",
+            }
+
+        request = getattr(client, scenario.method)
+        # The query log is a bounded deque; a full one breaks the counts.
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request(scenario.url(iteration), **kwargs)
+            elapsed = time.perf_counter() - started
+
+        if response.status_code not in scenario.expected_status:
+            raise RuntimeError(
+                f"{scenario.name}: unexpected status {response.status_code}"
+            )
+        if iteration >= warmup:
+            timings.append(elapsed * 1000)
+            queries.append(len(captured))
+
+    return {
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+        "queries": max(queries),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a message for every endpoint that regressed."""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries "
+                f"(baseline {expected['queries']})"
+            )
+        limit = expected["p95_ms"] * (1 + tolerance)
+        if result["p95_ms"] > limit:
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']}ms "
+                f"(baseline {expected['p95_ms']}ms, limit {limit:.2f}ms)"
+            )
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=1500)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Run only the named scenario (repeatable)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed p95 growth over the baseline (default: 0.5 = 50%%)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run's results as the new baseline",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks and return the process exit status."""
+    args = parse_args(argv)
+
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE", "elysium_archive.settings_test"
+    )
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    from benchmarks.data import generate_dataset
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True
+    )
+    try:
+        dataset = generate_dataset(
+            products=args.products,
+            users=args.users,
+            orders=args.orders,
+            reviews=args.reviews,
+        )
+        _CLIENTS["anonymous"] = Client()
+        _CLIENTS["shopper"] = Client()
+        _CLIENTS["shopper"].force_login(dataset.shopper)
+
+        results = {}
+        # The benchmarks measure known N+1 pages; keep them running and
+        # keep the watcher's own overhead out of the timings.
+        with _stripe_stub(), override_settings(QUERY_WATCH_ENABLED=False):
+            for scenario in build_scenarios(dataset):
+                if args.only and scenario.name not in args.only:
+                    continue
+                results[scenario.name] = run_scenario(
+                    scenario, args.iterations, args.warmup
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    print(f"{'endpoint':<18}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}{result['queries']:>9}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.tolerance
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 
 from decimal import Decimal
 
-from products.models import Product
+from products.models import Product, only_card_fields
 
 from .models import Cart, CartItem
 
@@ -66,12 +66,12 @@ def merge_db_cart_into_session(session, user):
 
     db_cart = _get_or_create_user_cart(user)
 
-    db_items = (
-        CartItem.objects.filter(cart=db_cart)
-        .select_related("product")
-        .filter(product__is_active=True, product__is_removed=False)
-    )
-    db_ids = {str(item.product.pk) for item in db_items if item.product}
+    db_ids = {
+        str(product_pk)
+        for product_pk in CartItem.objects.filter(
+            cart=db_cart, product__is_active=True, product__is_removed=False
+        ).values_list("product_id", flat=True)
+    }
 
     merged = dict(session_cart)
     for pid_str in db_ids:
@@ -149,11 +149,14 @@ def get_cart_items(session, user=None):
         session.modified = True
         return []
 
-    qs = Product.objects.filter(
-        id__in=valid_ids, is_active=True, is_removed=False
+    products = list(
+        only_card_fields(
+            Product.objects.filter(
+                id__in=valid_ids, is_active=True, is_removed=False
+            )
+        )
     )
-    products = list(qs)
-    active_ids = set(qs.values_list("id", flat=True))
+    active_ids = {product.pk for product in products}
 
     removed = 0
     for product_id_str in list(cart.keys()):
@@ -21,11 +21,9 @@ def restore_cart_to_session(sender, request, user, **kwargs):
 
     cart, _ = Cart.objects.get_or_create(user=user)
 
-    items = (
-        CartItem.objects.filter(cart=cart)
-        .select_related("product")
-        .filter(product__is_active=True, product__is_removed=False)
-    )
+    product_pks = CartItem.objects.filter(
+        cart=cart, product__is_active=True, product__is_removed=False
+    ).values_list("product_id", flat=True)
 
-    request.session["cart"] = {str(item.product.pk): 1 for item in items}
+    request.session["cart"] = {str(pk): 1 for pk in product_pks}
     request.session.modified = True
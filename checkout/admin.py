@@ -1 +1,65 @@
 """Admin configuration for the checkout app."""
+
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .models import WebhookEvent
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    """Admin interface for the Stripe webhook inbox."""
+
+    class Media:
+        css = {
+            "all": ("css/admin/admin-orders.css",),
+        }
+
+    list_display = [
+        "stripe_event_id",
+        "event_type",
+        "status_badge",
+        "attempts",
+        "received_at",
+        "processed_at",
+    ]
+    list_filter = ["status", "event_type"]
+    search_fields = ["stripe_event_id", "event_type"]
+    readonly_fields = [
+        "stripe_event_id",
+        "event_type",
+        "payload",
+        "status",
+        "attempts",
+        "last_error",
+        "received_at",
+        "next_attempt_at",
+        "processed_at",
+    ]
+    date_hierarchy = "received_at"
+    actions = ["requeue_events"]
+
+    def has_add_permission(self, request):
+        """Events only arrive through the webhook endpoint."""
+        return False
+
+    @admin.display(description="Status")
+    def status_badge(self, obj):
+        """Display inbox status with colored badge."""
+        return format_html(
+            '<span class="order-status-badge {}">{}</span>',
+            obj.status,
+            obj.get_status_display(),
+        )
+
+    @admin.action(description="Requeue selected events")
+    def requeue_events(self, request, queryset):
+        """Send failed or stuck events back to the queue."""
+        updated = queryset.exclude(
+            status=WebhookEvent.STATUS_PROCESSED
+        ).update(
+            status=WebhookEvent.STATUS_PENDING,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} event(s) requeued.")
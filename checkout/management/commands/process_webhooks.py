@@ -0,0 +1,99 @@
+"""Management command to process the Stripe webhook inbox."""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from checkout.webhooks import (
+    process_pending_webhook_events,
+    prune_processed_webhook_events,
+    webhook_queue_stats,
+)
+
+
+class Command(BaseCommand):
+    """Process stored Stripe webhook events and retry failures."""
+
+    help = "Process pending Stripe webhook events from the inbox"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Maximum events handled per batch (default: 50)",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=None,
+            help="Attempts before an event is marked failed",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the inbox for new events",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep between empty polls (default: 2)",
+        )
+        parser.add_argument(
+            "--prune-days",
+            type=int,
+            default=None,
+            help="Delete processed inbox rows older than this many days",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print queue depth and processing lag",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        if options["stats"]:
+            self._write_stats()
+            return
+
+        if options["prune_days"] is not None:
+            deleted = prune_processed_webhook_events(
+                timedelta(days=options["prune_days"])
+            )
+            self.stdout.write(f"Pruned {deleted} processed event(s).")
+
+        while True:
+            summary = process_pending_webhook_events(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+            )
+            handled = summary["processed"] + summary["failed"]
+
+            if handled or not options["loop"]:
+                self.stdout.write(
+                    f"Processed {summary['processed']}, "
+                    f"failed {summary['failed']}, "
+                    f"skipped {summary['skipped']}."
+                )
+
+            if not options["loop"]:
+                break
+
+            if not handled:
+                time.sleep(options["interval"])
+
+        self._write_stats()
+
+    def _write_stats(self):
+        """Print inbox depth and lag."""
+        stats = webhook_queue_stats()
+        self.stdout.write(
+            f"Queue depth: {stats['pending']} pending "
+            f"({stats['retrying']} retrying), {stats['failed']} failed. "
+            f"Oldest pending: {stats['oldest_pending_seconds']:.1f}s. "
+            f"Average lag (1h): {stats['avg_lag_seconds']:.2f}s."
+        )
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checkout", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProcessedWebhookEvent",
+            fields=[
+                (
+                    "event_id",
+                    models.CharField(
+                        max_length=255, primary_key=True, serialize=False
+                    ),
+                ),
+                ("processed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -1 +1,85 @@
 """Models for the checkout app."""
+
+from typing import Any
+
+from django.db import models
+from django.utils import timezone
+
+
+class WebhookEvent(models.Model):
+    """Store a verified Stripe webhook event until it is processed."""
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSED = "processed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSED, "Processed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    # Type hints for fields
+    stripe_event_id: models.CharField
+    event_type: models.CharField
+    payload: models.JSONField
+    status: models.CharField
+    attempts: models.PositiveIntegerField
+    last_error: models.TextField
+    received_at: models.DateTimeField
+    next_attempt_at: models.DateTimeField
+    processed_at: models.DateTimeField
+
+    # Django auto-generated
+    id: int
+
+    stripe_event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(help_text="Verified Stripe event body")
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["received_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="webhook_event_queue_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} ({self.stripe_event_id})"
+
+    @property
+    def data_object(self) -> dict[str, Any]:
+        """Return the Stripe object the event is about."""
+        data = self.payload.get("data", {}) if self.payload else {}
+        obj = data.get("object", {}) if isinstance(data, dict) else {}
+        return obj if isinstance(obj, dict) else {}
+
+
+class ProcessedWebhookEvent(models.Model):
+    """Record a Stripe event ID once its effects have been committed.
+
+    Keyed on the event ID so repeat deliveries are recognised with a single
+    primary-key lookup, without touching orders or the inbox.
+    """
+
+    # Type hints for fields
+    event_id: models.CharField
+    processed_at: models.DateTimeField
+
+    event_id = models.CharField(max_length=255, primary_key=True)
+    processed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.event_id
@@ -0,0 +1,61 @@
+"""In-process notifications for order status changes.
+
+Webhook handlers publish order status changes here and long-poll requests
+wait on them. The hub is local to the process, so waiters still re-check the
+database periodically to pick up changes made by other workers.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from django.db import transaction
+
+_condition = threading.Condition()
+_versions: dict[str, int] = {}
+
+# Keep the version map bounded on long-running workers.
+_MAX_TRACKED_ORDERS = 1000
+
+
+def get_order_version(order_number: str) -> int:
+    """Return the current notification version for an order."""
+    with _condition:
+        return _versions.get(order_number, 0)
+
+
+def notify_order_status(order_number: str) -> None:
+    """Wake up every request waiting on the given order."""
+    if not order_number:
+        return
+
+    with _condition:
+        if (
+            order_number not in _versions
+            and len(_versions) >= _MAX_TRACKED_ORDERS
+        ):
+            # Dicts keep insertion order, so this drops the oldest entry.
+            _versions.pop(next(iter(_versions)))
+        _versions[order_number] = _versions.get(order_number, 0) + 1
+        _condition.notify_all()
+
+
+def notify_order_status_on_commit(order_number: str) -> None:
+    """Notify waiters once the current transaction commits."""
+    transaction.on_commit(lambda: notify_order_status(order_number))
+
+
+def wait_for_order_notification(
+    order_number: str,
+    since_version: int,
+    timeout: float,
+) -> bool:
+    """Block until the order version moves past since_version.
+
+    Return True when a notification arrived, False on timeout.
+    """
+    with _condition:
+        return _condition.wait_for(
+            lambda: _versions.get(order_number, 0) != since_version,
+            timeout=max(timeout, 0),
+        )
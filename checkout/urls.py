@@ -2,7 +2,13 @@
 
 from django.urls import path
 
-from .views import checkout, checkout_cancel, checkout_status, checkout_success
+from .views import (
+    checkout,
+    checkout_cancel,
+    checkout_status,
+    checkout_status_wait,
+    checkout_success,
+)
 from .webhooks import stripe_webhook
 
 urlpatterns = [
@@ -15,6 +21,11 @@ urlpatterns = [
     path(
         "status/<str:order_number>/", checkout_status, name="checkout_status"
     ),
+    path(
+        "status/<str:order_number>/wait/",
+        checkout_status_wait,
+        name="checkout_status_wait",
+    ),
     path("cancel/", checkout_cancel, name="checkout_cancel"),
     path("webhook/", stripe_webhook, name="stripe_webhook"),
     path("wh/", stripe_webhook, name="stripe_webhook_alias"),
@@ -1,6 +1,7 @@
 """Views for checkout and Stripe integration."""
 
 import logging
+import time
 from datetime import timedelta
 
 import stripe
@@ -17,7 +18,13 @@ from accounts.decorators import verified_email_required
 from cart.cart import clear_cart, get_cart_items, get_cart_total
 from orders.models import AccessEntitlement, Order, OrderLineItem
 from orders.services import grant_entitlements_for_order
-from products.models import Product
+from products.models import Product, only_card_fields
+
+from .notifications import (
+    get_order_version,
+    notify_order_status_on_commit,
+    wait_for_order_notification,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -119,16 +126,6 @@ def _fail_recent_pending_order(request, minutes=30):
     return order
 
 
-def _fail_stale_pending_orders(request, minutes=30):
-    """Mark stale pending orders for the current user as failed."""
-    cutoff = timezone.now() - timedelta(minutes=minutes)
-    Order.objects.filter(
-        user=request.user,
-        status="pending",
-        created_at__lt=cutoff,
-    ).update(status="failed")
-
-
 def _verify_and_finalize_order_if_paid(user, order):
     """Verify Stripe session and finalize order if Stripe reports paid."""
     if order.status != "pending":
@@ -167,6 +164,7 @@ def _verify_and_finalize_order_if_paid(user, order):
         )
 
         grant_entitlements_for_order(locked, user=user)
+        notify_order_status_on_commit(locked.order_number)
 
     return True
 
@@ -182,8 +180,6 @@ def checkout(request):
         )
         return redirect("cart")
 
-    _fail_stale_pending_orders(request)
-
     cart_items = get_cart_items(request.session)
     if not cart_items:
         messages.warning(request, "Your cart is empty.")
@@ -216,10 +212,12 @@ def checkout(request):
         return redirect("cart")
 
     valid_products = list(
-        Product.objects.filter(
-            pk__in=[p.pk for p in cart_products],
-            is_active=True,
-            is_removed=False,
+        only_card_fields(
+            Product.objects.filter(
+                pk__in=[p.pk for p in cart_products],
+                is_active=True,
+                is_removed=False,
+            )
         )
     )
     if not valid_products:
@@ -378,6 +376,56 @@ def checkout_status(request, order_number):
     return JsonResponse({"status": order.status})
 
 
+@verified_email_required
+@require_http_methods(["GET"])
+def checkout_status_wait(request, order_number):
+    """Hold the request until the order status changes, then return it.
+
+    The client passes the status it already knows as ``since``. Webhook
+    handlers wake the request through the notification hub, and the order
+    row is re-read every few seconds to catch changes from other workers.
+    """
+    stripe_ready = _set_stripe_key()
+    version = get_order_version(order_number)
+
+    try:
+        order = Order.objects.get(order_number=order_number, user=request.user)
+    except Order.DoesNotExist:
+        return JsonResponse({"error": "not_found"}, status=404)
+
+    known_status = request.GET.get("since", "").strip() or order.status
+
+    if stripe_ready and order.status == "pending":
+        paid_now = _verify_and_finalize_order_if_paid(request.user, order)
+        if paid_now:
+            order.refresh_from_db()
+
+    wait_seconds = getattr(settings, "CHECKOUT_STATUS_WAIT_SECONDS", 20)
+    recheck_seconds = getattr(settings, "CHECKOUT_STATUS_RECHECK_SECONDS", 2)
+    deadline = time.monotonic() + wait_seconds
+
+    status = order.status
+    while status == known_status:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        if wait_for_order_notification(
+            order.order_number,
+            version,
+            min(remaining, recheck_seconds),
+        ):
+            version = get_order_version(order.order_number)
+
+        status = (
+            Order.objects.filter(pk=order.pk)
+            .values_list("status", flat=True)
+            .first()
+        ) or status
+
+    return JsonResponse({"status": status, "changed": status != known_status})
+
+
 @verified_email_required
 def checkout_cancel(request):
     """Display cancellation message when user cancels payment."""
@@ -1,17 +1,25 @@
 """Handle Stripe webhook events for checkout."""
 
+import hashlib
+import json
 import logging
+from datetime import timedelta
 
 import stripe
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Avg, F, Min
 from django.http import JsonResponse
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from stripe import SignatureVerificationError
 
 from orders.models import Order
 from orders.services import grant_entitlements_for_order
 
+from .models import ProcessedWebhookEvent, WebhookEvent
+from .notifications import notify_order_status_on_commit
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +77,7 @@ def _mark_order_paid(order, data):
         )
 
         grant_entitlements_for_order(order)
+        notify_order_status_on_commit(order.order_number)
 
 
 def _ensure_paid_order_consistency(order, data):
@@ -175,6 +184,7 @@ def _handle_checkout_expired(data):
         locked.save(
             update_fields=["status", "stripe_session_id", "updated_at"]
         )
+        notify_order_status_on_commit(locked.order_number)
 
 
 def _handle_payment_failed(data):
@@ -191,11 +201,206 @@ def _handle_payment_failed(data):
 
         locked.status = "failed"
         locked.save(update_fields=["status", "updated_at"])
+        notify_order_status_on_commit(locked.order_number)
+
+
+def _dispatch_event(event_type, data):
+    """Run the handler registered for a Stripe event type."""
+    if event_type == "checkout.session.completed":
+        _handle_checkout_completed(data)
+    elif event_type == "checkout.session.async_payment_succeeded":
+        _handle_async_payment_succeeded(data)
+    elif event_type == "checkout.session.expired":
+        _handle_checkout_expired(data)
+    elif event_type in (
+        "payment_intent.payment_failed",
+        "checkout.session.async_payment_failed",
+    ):
+        _handle_payment_failed(data)
+
+
+def _event_id(event_body):
+    """Return the Stripe event ID, or a stable hash when it is missing."""
+    event_id = event_body.get("id")
+    if event_id:
+        return str(event_id)
+
+    digest = hashlib.sha256(
+        json.dumps(event_body, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return f"local_{digest[:40]}"
+
+
+def _event_body(event):
+    """Return a verified Stripe event as a plain JSON-safe dict."""
+    # Stripe objects are dict subclasses, so a JSON round trip unwraps them.
+    return json.loads(json.dumps(event))
+
+
+def is_duplicate_event(event_id):
+    """Return True when the event's effects have already been committed."""
+    return ProcessedWebhookEvent.objects.filter(pk=event_id).exists()
+
+
+def store_webhook_event(event_body):
+    """Persist a verified event in the inbox and return (event, created)."""
+    webhook_event, created = WebhookEvent.objects.get_or_create(
+        stripe_event_id=_event_id(event_body),
+        defaults={
+            "event_type": event_body.get("type") or "",
+            "payload": event_body,
+        },
+    )
+
+    if not created and webhook_event.status == WebhookEvent.STATUS_FAILED:
+        # Stripe is retrying an event we gave up on; give it another go.
+        webhook_event.status = WebhookEvent.STATUS_PENDING
+        webhook_event.next_attempt_at = timezone.now()
+        webhook_event.save(update_fields=["status", "next_attempt_at"])
+
+    return webhook_event, created
+
+
+def _retry_delay(attempts):
+    """Return the backoff before the next attempt (30s doubling, max 1h)."""
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def process_webhook_event(event_pk, max_attempts=None):
+    """Process one pending inbox event.
+
+    Return True when processed, False when it failed, and None when the event
+    is not pending or another worker holds it.
+    """
+    if max_attempts is None:
+        max_attempts = getattr(settings, "STRIPE_WEBHOOK_MAX_ATTEMPTS", 8)
+
+    with transaction.atomic():
+        webhook_event = (
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(pk=event_pk, status=WebhookEvent.STATUS_PENDING)
+            .first()
+        )
+        if webhook_event is None:
+            return None
+
+        now = timezone.now()
+        webhook_event.attempts += 1
+
+        try:
+            with transaction.atomic():
+                # The ledger row commits together with the handler's
+                # effects, so a replay can never apply them twice.
+                _ledger, created = ProcessedWebhookEvent.objects.get_or_create(
+                    event_id=webhook_event.stripe_event_id
+                )
+                if created:
+                    _dispatch_event(
+                        webhook_event.event_type,
+                        webhook_event.data_object,
+                    )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception(
+                "Error processing Stripe webhook %s: %s",
+                webhook_event.stripe_event_id,
+                exc,
+            )
+            webhook_event.last_error = f"{type(exc).__name__}: {exc}"
+            if webhook_event.attempts >= max_attempts:
+                webhook_event.status = WebhookEvent.STATUS_FAILED
+            else:
+                webhook_event.next_attempt_at = now + _retry_delay(
+                    webhook_event.attempts
+                )
+            webhook_event.save(
+                update_fields=[
+                    "attempts",
+                    "last_error",
+                    "status",
+                    "next_attempt_at",
+                ]
+            )
+            return False
+
+        webhook_event.status = WebhookEvent.STATUS_PROCESSED
+        webhook_event.processed_at = now
+        webhook_event.last_error = ""
+        webhook_event.save(
+            update_fields=["attempts", "status", "processed_at", "last_error"]
+        )
+
+    return True
+
+
+def process_pending_webhook_events(batch_size=50, max_attempts=None):
+    """Process due inbox events in arrival order and return a summary."""
+    due_pks = list(
+        WebhookEvent.objects.filter(
+            status=WebhookEvent.STATUS_PENDING,
+            next_attempt_at__lte=timezone.now(),
+        )
+        .order_by("received_at")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+
+    summary = {"processed": 0, "failed": 0, "skipped": 0}
+    for event_pk in due_pks:
+        result = process_webhook_event(event_pk, max_attempts=max_attempts)
+        if result is True:
+            summary["processed"] += 1
+        elif result is False:
+            summary["failed"] += 1
+        else:
+            summary["skipped"] += 1
+
+    return summary
+
+
+def prune_processed_webhook_events(older_than):
+    """Delete processed inbox rows older than the given age.
+
+    The ProcessedWebhookEvent ledger is kept, so pruned events are still
+    recognised as duplicates.
+    """
+    deleted, _details = WebhookEvent.objects.filter(
+        status=WebhookEvent.STATUS_PROCESSED,
+        processed_at__lt=timezone.now() - older_than,
+    ).delete()
+    return deleted
+
+
+def webhook_queue_stats(window=timedelta(hours=1)):
+    """Return inbox depth and processing lag figures."""
+    now = timezone.now()
+    pending = WebhookEvent.objects.filter(status=WebhookEvent.STATUS_PENDING)
+
+    oldest_pending = pending.aggregate(oldest=Min("received_at"))["oldest"]
+    recent_lag = WebhookEvent.objects.filter(
+        status=WebhookEvent.STATUS_PROCESSED,
+        processed_at__gte=now - window,
+    ).aggregate(lag=Avg(F("processed_at") - F("received_at")))["lag"]
+
+    return {
+        "pending": pending.count(),
+        "retrying": pending.filter(attempts__gt=0).count(),
+        "failed": WebhookEvent.objects.filter(
+            status=WebhookEvent.STATUS_FAILED
+        ).count(),
+        "oldest_pending_seconds": (
+            (now - oldest_pending).total_seconds() if oldest_pending else 0.0
+        ),
+        "avg_lag_seconds": recent_lag.total_seconds() if recent_lag else 0.0,
+    }
 
 
 @csrf_exempt
 def stripe_webhook(request):
-    """Process Stripe webhooks with signature verification."""
+    """Verify a Stripe webhook, store it in the inbox and process it.
+
+    With STRIPE_WEBHOOK_ASYNC enabled the event is only stored and the
+    process_webhooks worker picks it up, so Stripe gets its 200 straight
+    away.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "Method not allowed"}, status=405)
 
@@ -228,23 +433,16 @@ def stripe_webhook(request):
         logger.warning("Invalid signature for Stripe webhook")
         return JsonResponse({"error": "Invalid signature"}, status=400)
 
-    event_type = event.get("type")
-    data = event.get("data", {}).get("object", {})
+    event_body = _event_body(event)
+    if is_duplicate_event(_event_id(event_body)):
+        return JsonResponse({"status": "duplicate"})
 
-    try:
-        if event_type == "checkout.session.completed":
-            _handle_checkout_completed(data)
-        elif event_type == "checkout.session.async_payment_succeeded":
-            _handle_async_payment_succeeded(data)
-        elif event_type == "checkout.session.expired":
-            _handle_checkout_expired(data)
-        elif event_type in (
-            "payment_intent.payment_failed",
-            "checkout.session.async_payment_failed",
-        ):
-            _handle_payment_failed(data)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Error processing Stripe webhook: %s", exc)
+    webhook_event, _created = store_webhook_event(event_body)
+
+    if getattr(settings, "STRIPE_WEBHOOK_ASYNC", False):
+        return JsonResponse({"status": "queued"})
+
+    if process_webhook_event(webhook_event.pk) is False:
         return JsonResponse({"error": "Webhook processing error"}, status=500)
 
     return JsonResponse({"status": "ok"})
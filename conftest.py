@@ -6,6 +6,10 @@ from typing import Any, cast
 import pytest
 from allauth.account.models import EmailAddress
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.utils.crypto import get_random_string
 
 from orders.models import AccessEntitlement, Order
@@ -19,6 +23,13 @@ def _make_test_password():
     return get_random_string(12)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Empty the caches between tests; granted access is cached."""
+    for cache in caches.all():
+        cache.clear()
+
+
 @pytest.fixture
 def category():
     """Create a test category."""
@@ -174,3 +185,36 @@ def order_paid(verified_user, product_active):
         order=order,
     )
     return order
+
+
+@pytest.fixture
+def query_plan():
+    """Return a helper that EXPLAINs a queryset on the test database.
+
+    PostgreSQL prefers sequential scans on tiny test tables, so they are
+    switched off while the plan is built.
+    """
+
+    def _plan(queryset):
+        if connection.vendor == "postgresql":
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                return queryset.explain()
+        return queryset.explain()
+
+    return _plan
+
+
+@pytest.fixture
+def admin_changelist_queries(client, staff_user):
+    """Return a helper that counts the queries of an admin changelist."""
+    client.force_login(staff_user)
+
+    def _count(url_name):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse(url_name))
+        assert response.status_code == 200
+        return len(queries)
+
+    return _count
@@ -30,11 +30,13 @@ def cart_context(request):
 def deals_context(request):
     """Add deal products to context for banner display."""
     try:
-        from products.models import Product
+        from products.models import Product, only_card_fields
 
-        deal_products = Product.objects.filter(
-            is_active=True, is_removed=False, is_deal=True
-        ).select_related("category")[:10]
+        deal_products = only_card_fields(
+            Product.objects.filter(
+                is_active=True, is_removed=False, is_deal=True
+            )
+        )[:10]
     except Exception:  # noqa: BLE001
         deal_products = []
 
@@ -1,7 +1,12 @@
 """Shared utility functions for access control and entitlements."""
 
+from django.conf import settings
+from django.core.cache import caches
+
 from orders.models import AccessEntitlement
 
+from . import metrics
+
 
 def user_has_access(user, product):
     """Check if a user has purchased and has access to a product.
@@ -19,3 +24,42 @@ def user_has_access(user, product):
     return AccessEntitlement.objects.filter(
         user=user, product=product
     ).exists()
+
+
+def _access_key(user_pk, product_pk):
+    return f"access:{user_pk}:{product_pk}"
+
+
+def cached_user_has_access(user, product_pk):
+    """Check access like user_has_access(), remembering granted access.
+
+    Only positive answers are cached, for ENTITLEMENT_CACHE_SECONDS, so a
+    purchase is visible at once. Revoking an entitlement must call
+    forget_access() for the pair; without a shared cache that only
+    reaches the current process.
+    """
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+
+    cache = caches["entitlements"]
+    key = _access_key(user.pk, product_pk)
+    if cache.get(key):
+        metrics.record_cache("entitlements", hit=True)
+        return True
+    metrics.record_cache("entitlements", hit=False)
+
+    has_access = AccessEntitlement.objects.filter(
+        user=user, product_id=product_pk
+    ).exists()
+    if has_access:
+        cache.set(key, True, settings.ENTITLEMENT_CACHE_SECONDS)
+    return has_access
+
+
+def forget_access(pairs):
+    """Drop cached access for (user pk, product pk) pairs."""
+    caches["entitlements"].delete_many(
+        [_access_key(user_pk, product_pk) for user_pk, product_pk in pairs]
+    )
@@ -0,0 +1,333 @@
+"""Per-request timing and query instrumentation.
+
+RequestMetricsMiddleware measures wall time, database queries and time, and
+template render time for every request. It reports them in a Server-Timing
+header and a log line, and keeps in-process figures for the staff pages: a
+latency histogram and a ring buffer of recent timings per view, a ring
+buffer of slow SQL statements with their call sites, and cache hit counters.
+It is enabled with the REQUEST_METRICS_ENABLED setting.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Keep the histogram bounded if many distinct views are hit.
+_MAX_TRACKED_VIEWS = 200
+
+# Recent timings kept per view for the percentiles.
+RECENT_SAMPLES = 500
+
+# Slow SQL statements kept for the performance dashboard.
+SLOW_QUERY_BUFFER = 100
+
+# Statements are truncated to this many characters in the buffer.
+_MAX_SQL_LENGTH = 500
+
+
+@dataclass
+class RequestMetrics:
+    """Counters for the request being handled."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    template_seconds: float = 0.0
+    template_depth: int = 0
+    view: str = "unresolved"
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+class _ViewStats:
+    """Aggregated metrics for one view."""
+
+    def __init__(self):
+        self.count = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = deque(maxlen=RECENT_SAMPLES)
+        self.wall_ms = 0.0
+        self.max_wall_ms = 0.0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+
+    def add(self, wall_ms, db_ms, template_ms, queries):
+        self.count += 1
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, wall_ms)] += 1
+        self.samples.append(wall_ms)
+        self.wall_ms += wall_ms
+        self.max_wall_ms = max(self.max_wall_ms, wall_ms)
+        self.db_ms += db_ms
+        self.template_ms += template_ms
+        self.queries += queries
+        self.max_queries = max(self.max_queries, queries)
+
+    def percentile_ms(self, pct):
+        """Return the nearest-rank percentile of the recent timings."""
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+        return round(ordered[rank - 1], 2)
+
+    def as_dict(self):
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "avg_ms": round(self.wall_ms / count, 2),
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "p99_ms": self.percentile_ms(99),
+            "max_ms": round(self.max_wall_ms, 2),
+            "avg_db_ms": round(self.db_ms / count, 2),
+            "avg_template_ms": round(self.template_ms / count, 2),
+            "avg_queries": round(self.queries / count, 2),
+            "max_queries": self.max_queries,
+            "buckets": dict(
+                zip(
+                    [str(bound) for bound in LATENCY_BUCKETS_MS] + ["inf"],
+                    self.buckets,
+                )
+            ),
+        }
+
+
+_lock = threading.Lock()
+_stats: dict[str, _ViewStats] = {}
+_slow_queries: deque[dict] = deque(maxlen=SLOW_QUERY_BUFFER)
+_cache_counts: dict[str, list[int]] = {}
+
+
+def record(view, wall_ms, db_ms, template_ms, queries):
+    """Add one request to the histogram of its view."""
+    with _lock:
+        stats = _stats.get(view)
+        if stats is None:
+            if len(_stats) >= _MAX_TRACKED_VIEWS:
+                view = "other"
+            stats = _stats.setdefault(view, _ViewStats())
+        stats.add(wall_ms, db_ms, template_ms, queries)
+
+
+def snapshot():
+    """Return the aggregated metrics per view, slowest average first."""
+    with _lock:
+        views = {view: stats.as_dict() for view, stats in _stats.items()}
+    return dict(
+        sorted(views.items(), key=lambda item: item[1]["avg_ms"], reverse=True)
+    )
+
+
+def record_slow_query(sql, duration_ms, view, call_site):
+    """Add a slow SQL statement to the ring buffer."""
+    entry = {
+        "sql": sql[:_MAX_SQL_LENGTH],
+        "duration_ms": round(duration_ms, 2),
+        "view": view,
+        "call_site": call_site,
+        "at": time.time(),
+    }
+    with _lock:
+        _slow_queries.append(entry)
+
+
+def slow_queries():
+    """Return the buffered slow SQL statements, slowest first."""
+    with _lock:
+        entries = list(_slow_queries)
+    return sorted(
+        entries, key=lambda entry: entry["duration_ms"], reverse=True
+    )
+
+
+def record_cache(name, hit):
+    """Count one lookup in the named cache."""
+    with _lock:
+        counts = _cache_counts.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+def cache_stats():
+    """Return hits, misses and hit rate per cache name."""
+    with _lock:
+        counts = {name: tuple(pair) for name, pair in _cache_counts.items()}
+    return {
+        name: {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4),
+        }
+        for name, (hits, misses) in sorted(counts.items())
+    }
+
+
+def reset():
+    """Clear the aggregated metrics."""
+    with _lock:
+        _stats.clear()
+        _slow_queries.clear()
+        _cache_counts.clear()
+
+
+def _view_name(view_func):
+    """Return a dotted name for a view function or class-based view."""
+    view = getattr(view_func, "view_class", view_func)
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+# Instrumentation wrappers never count as the code that ran a query.
+_INSTRUMENTATION_FILES = frozenset(
+    str(Path(__file__).with_name(name))
+    for name in ("metrics.py", "profiling.py", "querywatch.py")
+)
+
+
+def is_project_frame(filename):
+    """Return True for project source files outside the instrumentation."""
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and filename not in _INSTRUMENTATION_FILES
+        and "site-packages" not in filename
+    )
+
+
+def call_site():
+    """Return the innermost project frame of the current stack."""
+    root = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if is_project_frame(filename):
+            relative = Path(filename).relative_to(root)
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class _TimedTemplate:
+    """Template wrapper that adds its render time to the current request."""
+
+    def __init__(self, template):
+        self._template = template
+
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return self._template.render(context, request)
+
+        # Only the outermost render is timed; nested renders are inside it.
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return self._template.render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_seconds += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend that reports render time to the metrics."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+class RequestMetricsMiddleware:
+    """Measure each request and report it as Server-Timing and a log line."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_query_ms = getattr(
+            settings, "REQUEST_METRICS_SLOW_QUERY_MS", 100
+        )
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._time_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        view = metrics.view
+        db_ms = metrics.db_seconds * 1000
+        template_ms = metrics.template_seconds * 1000
+        record(view, wall_ms, db_ms, template_ms, metrics.queries)
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={db_ms:.1f};desc="{metrics.queries} queries"',
+                f"tpl;dur={template_ms:.1f}",
+                f"total;dur={wall_ms:.1f}",
+            ]
+        )
+        logger.info(
+            "view=%s method=%s status=%s wall_ms=%.1f db_ms=%.1f "
+            "queries=%d template_ms=%.1f",
+            view,
+            request.method,
+            response.status_code,
+            wall_ms,
+            db_ms,
+            metrics.queries,
+            template_ms,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Remember which view handles the request."""
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view = _view_name(view_func)
+
+    def _time_query(self, execute, sql, params, many, context):
+        metrics = _current.get()
+        if metrics is None:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.queries += 1
+            metrics.db_seconds += elapsed
+            if elapsed * 1000 >= self.slow_query_ms:
+                record_slow_query(
+                    sql, elapsed * 1000, metrics.view, call_site()
+                )
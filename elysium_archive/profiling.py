@@ -0,0 +1,198 @@
+"""On-demand profiling of single requests for staff.
+
+Staff add ``?_profile=1`` or an ``X-Profile: 1`` header to any URL. The
+request then runs under cProfile with every SQL statement traced, and the
+report is kept in a small ring buffer for the performance dashboard. With
+``?_profile=download`` the report is returned as a text attachment instead
+of the page. Disabled with the REQUEST_PROFILING_ENABLED setting.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.urls import reverse
+
+from .metrics import call_site
+
+logger = logging.getLogger(__name__)
+
+# Profiles kept for the performance dashboard.
+PROFILE_BUFFER = 20
+
+# Functions listed in the report, by cumulative time.
+REPORT_FUNCTIONS = 60
+
+PROFILE_PARAM = "_profile"
+PROFILE_HEADER = "X-Profile"
+
+_lock = threading.Lock()
+_profiles: OrderedDict[str, dict] = OrderedDict()
+
+
+def store_profile(profile):
+    """Add a profile to the ring buffer, dropping the oldest."""
+    with _lock:
+        _profiles[profile["id"]] = profile
+        while len(_profiles) > PROFILE_BUFFER:
+            _profiles.popitem(last=False)
+
+
+def get_profile(profile_id):
+    """Return a stored profile or None."""
+    with _lock:
+        return _profiles.get(profile_id)
+
+
+def recent_profiles():
+    """Return the stored profiles without their reports, newest first."""
+    with _lock:
+        profiles = list(_profiles.values())
+    return [
+        {key: value for key, value in profile.items() if key != "report"}
+        for profile in reversed(profiles)
+    ]
+
+
+def clear_profiles():
+    """Drop every stored profile."""
+    with _lock:
+        _profiles.clear()
+
+
+def _requested(request):
+    """Return the requested mode ("store" or "download"), or None."""
+    value = request.GET.get(PROFILE_PARAM) or request.headers.get(
+        PROFILE_HEADER
+    )
+    if not value or value in ("0", "false"):
+        return None
+    return "download" if value == "download" else "store"
+
+
+class _SQLTrace:
+    """execute_wrapper that records every statement of the request."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append(
+                {
+                    "sql": sql,
+                    "params": params,
+                    "duration_ms": (time.perf_counter() - started) * 1000,
+                    "call_site": call_site(),
+                }
+            )
+
+
+def build_report(request, response, profiler, trace, wall_ms):
+    """Return the text report for one profiled request."""
+    output = io.StringIO()
+    db_ms = sum(statement["duration_ms"] for statement in trace.statements)
+    output.write(
+        f"{request.method} {request.get_full_path()}\n"
+        f"status={response.status_code} wall_ms={wall_ms:.1f} "
+        f"queries={len(trace.statements)} db_ms={db_ms:.1f}\n\n"
+    )
+
+    output.write("== Profile (cumulative time) ==\n")
+    stats = pstats.Stats(profiler, stream=output)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(REPORT_FUNCTIONS)
+
+    output.write("\n== SQL trace ==\n")
+    for number, statement in enumerate(trace.statements, start=1):
+        output.write(
+            f"#{number} {statement['duration_ms']:.2f}ms "
+            f"{statement['call_site']}\n"
+            f"{statement['sql']}\n"
+            f"params={statement['params']!r}\n\n"
+        )
+    return output.getvalue()
+
+
+class RequestProfilerMiddleware:
+    """Profile a single request when staff ask for it."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = _requested(request)
+        user = getattr(request, "user", None)
+        if mode is None or not (user and user.is_staff):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        trace = _SQLTrace()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can run per process at a time.
+            logger.warning("Profiling skipped: another profile is running")
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(trace):
+                response = self.get_response(request)
+        finally:
+            profiler.disable()
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        report = build_report(request, response, profiler, trace, wall_ms)
+        profile_id = uuid.uuid4().hex[:12]
+        store_profile(
+            {
+                "id": profile_id,
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "wall_ms": round(wall_ms, 2),
+                "queries": len(trace.statements),
+                "user": user.get_username(),
+                "at": time.time(),
+                "report": report,
+            }
+        )
+        logger.info(
+            "Profiled %s %s as %s",
+            request.method,
+            request.path,
+            profile_id,
+        )
+
+        if mode == "download":
+            return profile_download_response(profile_id, report)
+
+        response["X-Profile-Report"] = reverse(
+            "profile_report", args=[profile_id]
+        )
+        return response
+
+
+def profile_download_response(profile_id, report):
+    """Return a report as a plain-text attachment."""
+    response = HttpResponse(report, content_type="text/plain; charset=utf-8")
+    response["Content-Disposition"] = (
+        f'attachment; filename="profile-{profile_id}.txt"'
+    )
+    return response
@@ -0,0 +1,136 @@
+"""Slow-query logging and repeated-query (N+1) detection.
+
+QueryWatchMiddleware wraps every request in a QueryWatcher. Statements
+slower than QUERY_WATCH_SLOW_MS are logged with their call site, and a SQL
+shape issued more than QUERY_WATCH_DUPLICATE_LIMIT times in one request is
+reported with the Python stack that first crossed the limit. Production
+logs a warning; with QUERY_WATCH_RAISE (on in the test settings) the
+request fails with RepeatedQueryError instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .metrics import is_project_frame
+
+logger = logging.getLogger(__name__)
+
+# Collapse "IN (%s, %s, ...)" lists so batch sizes share one shape.
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Project frames kept in a reported stack.
+_STACK_DEPTH = 8
+
+
+class RepeatedQueryError(AssertionError):
+    """Raised when a request repeats one SQL shape past the limit."""
+
+
+def sql_shape(sql):
+    """Return the statement with placeholder lists and spacing normalised."""
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(...)", sql)).strip()
+
+
+def _project_stack():
+    """Return the innermost project frames of the current stack."""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if is_project_frame(frame.filename)
+    ]
+    return "".join(traceback.format_list(frames[-_STACK_DEPTH:]))
+
+
+class QueryWatcher:
+    """execute_wrapper that tracks slow and repeated statements."""
+
+    def __init__(self, slow_ms=None, duplicate_limit=None):
+        if slow_ms is None:
+            slow_ms = getattr(settings, "QUERY_WATCH_SLOW_MS", 250)
+        if duplicate_limit is None:
+            duplicate_limit = getattr(
+                settings, "QUERY_WATCH_DUPLICATE_LIMIT", 10
+            )
+        self.slow_ms = slow_ms
+        self.duplicate_limit = duplicate_limit
+        self.counts = Counter()
+        self.repeated = {}
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            shape = sql_shape(sql)
+            self.counts[shape] += 1
+            if self.counts[shape] == self.duplicate_limit + 1:
+                self.repeated[shape] = _project_stack()
+            if duration_ms >= self.slow_ms:
+                self.slow.append((duration_ms, shape))
+                logger.warning(
+                    "Slow query (%.1f ms): %s\n%s",
+                    duration_ms,
+                    shape,
+                    _project_stack(),
+                )
+
+    def problems(self):
+        """Return (shape, count, stack) for each repeated statement."""
+        return [
+            (shape, self.counts[shape], stack)
+            for shape, stack in self.repeated.items()
+        ]
+
+    def report(self, label, raise_errors=False):
+        """Log or raise for the repeated statements seen so far."""
+        problems = self.problems()
+        if not problems:
+            return
+
+        message = "\n\n".join(
+            f"{label}: {count}x {shape}\n{stack}"
+            for shape, count, stack in problems
+        )
+        if raise_errors:
+            raise RepeatedQueryError(
+                f"Repeated queries (limit {self.duplicate_limit}):\n{message}"
+            )
+        logger.warning("Repeated queries: %s", message)
+
+
+@contextmanager
+def watch_queries(label="block", raise_errors=None, **options):
+    """Watch the queries run inside the block and report on exit."""
+    if raise_errors is None:
+        raise_errors = getattr(settings, "QUERY_WATCH_RAISE", False)
+    watcher = QueryWatcher(**options)
+    with connection.execute_wrapper(watcher):
+        yield watcher
+    watcher.report(label, raise_errors=raise_errors)
+
+
+class QueryWatchMiddleware:
+    """Watch each request for slow and repeated queries."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_WATCH_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        label = f"{request.method} {request.path}"
+        with watch_queries(label):
+            return self.get_response(request)
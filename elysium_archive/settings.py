@@ -149,11 +149,14 @@ JAZZMIN_SETTINGS = {
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "elysium_archive.metrics.RequestMetricsMiddleware",
+    "elysium_archive.querywatch.QueryWatchMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "elysium_archive.profiling.RequestProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -173,7 +176,8 @@ ROOT_URLCONF = "elysium_archive.urls"
 # Template engine configuration
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates subclass that reports render time to the metrics.
+        "BACKEND": "elysium_archive.metrics.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -204,6 +208,26 @@ if os.environ.get("DATABASE_URL"):
     db_config = dj_database_url.config(conn_max_age=600, ssl_require=True)
     DATABASES["default"] = cast(dict[str, Any], db_config)
 
+# Caches. Granted archive access is kept in the "entitlements" cache. With
+# REDIS_URL it is shared by every worker, so revoking access clears it
+# everywhere; otherwise each process keeps its own copy.
+REDIS_URL = os.environ.get("REDIS_URL", "")
+CACHES: dict[str, Any] = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "entitlements": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "entitlements",
+    },
+}
+if REDIS_URL:
+    CACHES["entitlements"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "elysium",
+    }
+
 # Password validation rules for user accounts
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -373,6 +397,74 @@ STRIPE_SECRET_KEY = os.environ.get(
 )
 STRIPE_WH_SECRET = os.environ.get("STRIPE_WH_SECRET", "")
 
+# Stripe webhook inbox: when async, the webhook view only stores verified
+# events and the process_webhooks worker handles them with retries.
+STRIPE_WEBHOOK_ASYNC = _env_bool(
+    os.environ.get("STRIPE_WEBHOOK_ASYNC"), default=False
+)
+STRIPE_WEBHOOK_MAX_ATTEMPTS = 8
+
+# Checkout status long-poll: how long a request is held open, and how often
+# the order row is re-read while waiting for a webhook notification.
+CHECKOUT_STATUS_WAIT_SECONDS = int(
+    os.environ.get("CHECKOUT_STATUS_WAIT_SECONDS", "20")
+)
+CHECKOUT_STATUS_RECHECK_SECONDS = 2
+
+# Per-request metrics: Server-Timing headers, a log line per request and a
+# staff histogram page. Off unless explicitly enabled.
+REQUEST_METRICS_ENABLED = _env_bool(
+    os.environ.get("REQUEST_METRICS_ENABLED"), default=False
+)
+# Statements at least this slow are kept for the performance dashboard.
+REQUEST_METRICS_SLOW_QUERY_MS = int(
+    os.environ.get("REQUEST_METRICS_SLOW_QUERY_MS", "100")
+)
+
+# Staff can profile one request with ?_profile=1 or an X-Profile header.
+REQUEST_PROFILING_ENABLED = _env_bool(
+    os.environ.get("REQUEST_PROFILING_ENABLED"), default=True
+)
+
+# Log statements slower than QUERY_WATCH_SLOW_MS and any SQL shape repeated
+# more than QUERY_WATCH_DUPLICATE_LIMIT times in one request (N+1 queries).
+# A diagnostic: on with DEBUG, otherwise only when enabled explicitly.
+QUERY_WATCH_ENABLED = _env_bool(
+    os.environ.get("QUERY_WATCH_ENABLED"), default=DEBUG
+)
+QUERY_WATCH_SLOW_MS = int(os.environ.get("QUERY_WATCH_SLOW_MS", "250"))
+QUERY_WATCH_DUPLICATE_LIMIT = int(
+    os.environ.get("QUERY_WATCH_DUPLICATE_LIMIT", "10")
+)
+QUERY_WATCH_RAISE = False
+
+# Product popularity: each sale counts 1 and halves in weight every
+# POPULARITY_HALF_LIFE_DAYS. Rebuilt by the refresh_popularity command.
+POPULARITY_HALF_LIFE_DAYS = int(
+    os.environ.get("POPULARITY_HALF_LIFE_DAYS", "30")
+)
+
+# How long granted access to an entry is remembered by the sectioned
+# reader's endpoints. Revocations clear the shared Redis cache at once;
+# with per-process caches other workers keep access until it expires,
+# so the default is short.
+ENTITLEMENT_CACHE_SECONDS = int(
+    os.environ.get("ENTITLEMENT_CACHE_SECONDS", "300" if REDIS_URL else "30")
+)
+
+# Local card image derivatives, used when Cloudinary is not configured:
+# uploads are cropped to the card sizes and re-encoded as WebP/AVIF, in
+# IMAGE_DERIVATIVE_WORKERS background threads or on first request.
+IMAGE_DERIVATIVES_ENABLED = _env_bool(
+    os.environ.get("IMAGE_DERIVATIVES_ENABLED"),
+    default=not os.environ.get("CLOUDINARY_URL"),
+)
+IMAGE_DERIVATIVE_DIR = "derivatives"
+IMAGE_DERIVATIVE_QUALITY = int(
+    os.environ.get("IMAGE_DERIVATIVE_QUALITY", "80")
+)
+IMAGE_DERIVATIVE_WORKERS = int(os.environ.get("IMAGE_DERIVATIVE_WORKERS", "2"))
+
 # CKEditor 5 rich text editor configuration
 CKEDITOR_5_UPLOAD_PATH = "ckeditor5/"
 
@@ -552,5 +644,15 @@ LOGGING = {
             "level": "ERROR",
             "propagate": False,
         },
+        "elysium_archive.metrics": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "elysium_archive.querywatch": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
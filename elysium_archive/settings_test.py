@@ -32,3 +32,7 @@ PASSWORD_HASHERS = [
 
 # Keep Stripe webhook validation enabled in tests without requiring env vars.
 STRIPE_WH_SECRET = "whsec_test_dummy"  # nosec B105
+
+# Fail any request that repeats one SQL shape past the limit (N+1 queries).
+QUERY_WATCH_ENABLED = True
+QUERY_WATCH_RAISE = True
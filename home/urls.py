@@ -5,6 +5,10 @@ from django.urls import path
 from .views import (
     home_view,
     lore_view,
+    performance_dashboard,
+    performance_dashboard_reset,
+    profile_report,
+    request_metrics,
     test_error_400,
     test_error_403,
     test_error_404,
@@ -21,4 +25,22 @@ urlpatterns = [
     path("_test/errors/403/", test_error_403, name="test_error_403"),
     path("_test/errors/404/", test_error_404, name="test_error_404"),
     path("_test/errors/500/", test_error_500, name="test_error_500"),
+    # Per-view request metrics (staff-only)
+    path("_metrics/", request_metrics, name="request_metrics"),
+    # Performance dashboard (staff-only)
+    path(
+        "_test/performance/",
+        performance_dashboard,
+        name="performance_dashboard",
+    ),
+    path(
+        "_test/performance/reset/",
+        performance_dashboard_reset,
+        name="performance_dashboard_reset",
+    ),
+    path(
+        "_test/performance/profiles/<str:profile_id>/",
+        profile_report,
+        name="profile_report",
+    ),
 ]
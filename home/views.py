@@ -9,18 +9,28 @@ from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.core.mail import EmailMessage
 from django.db.models import Exists, OuterRef, Q
-from django.shortcuts import render
+from django.http import Http404, JsonResponse
+from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 from django.views.decorators.clickjacking import xframe_options_exempt
-from django.views.decorators.http import require_GET
+from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import FormView, TemplateView
 
-from products.models import DealBanner, Product
+from checkout.webhooks import webhook_queue_stats
+from elysium_archive import metrics, profiling
+from products.models import (
+    DealBanner,
+    Product,
+    defer_product_bodies,
+    only_card_fields,
+)
 
 from .forms import ContactForm
 
 logger = logging.getLogger(__name__)
 
+BESTSELLERS_COUNT = 4
+
 
 @require_GET
 def home_view(request):
@@ -31,20 +41,24 @@ def home_view(request):
     - Custom deal banners (admin-managed promotional carousel)
     - Featured archive entries (up to 6)
     - Latest archive entries (up to 3)
+    - Bestsellers by popularity score (up to 4)
     """
-    featured_products = (
+    featured_products = only_card_fields(
         Product.objects.filter(
             is_active=True, is_removed=False, is_featured=True
         )
-        .select_related("category")
-        .order_by("-created_at")
-    )
+    ).order_by("-created_at")
 
-    latest_products = (
+    latest_products = only_card_fields(
         Product.objects.filter(is_active=True, is_removed=False)
-        .select_related("category")
-        .order_by("-created_at")[:3]
-    )
+    ).order_by("-created_at")[:3]
+
+    # Scores are stored by orders.services, so no entitlement aggregation.
+    bestseller_products = only_card_fields(
+        Product.objects.filter(
+            is_active=True, is_removed=False, popularity_score__gt=0
+        )
+    ).order_by("-popularity_score", "-created_at")[:BESTSELLERS_COUNT]
 
     has_any_active_deals = Product.objects.filter(
         is_active=True,
@@ -60,8 +74,8 @@ def home_view(request):
     )
 
     raw_banners = (
-        DealBanner.objects.filter(is_active=True)
-        .select_related("product", "category")
+        defer_product_bodies(DealBanner.objects.filter(is_active=True))
+        .select_related("category")
         .annotate(
             has_active_category_deals=Exists(active_deals_in_banner_category)
         )
@@ -101,6 +115,7 @@ def home_view(request):
     context = {
         "featured_products": featured_products,
         "latest_products": latest_products,
+        "bestseller_products": bestseller_products,
         "deal_banners": deal_banners,
         "user_is_verified": (
             has_verified_email(request.user)
@@ -157,6 +172,56 @@ def test_error_500(request):
     return render(request, "500.html", status=500)
 
 
+@staff_member_required
+@require_GET
+def request_metrics(request):
+    """Return the per-view request metrics collected by this process."""
+    return JsonResponse(
+        {
+            "enabled": getattr(settings, "REQUEST_METRICS_ENABLED", False),
+            "views": metrics.snapshot(),
+        }
+    )
+
+
+@staff_member_required
+@require_GET
+def performance_dashboard(request):
+    """Render latency, slow SQL, cache and webhook figures for staff."""
+    context = {
+        "metrics_enabled": getattr(settings, "REQUEST_METRICS_ENABLED", False),
+        "slow_query_ms": getattr(
+            settings, "REQUEST_METRICS_SLOW_QUERY_MS", 100
+        ),
+        "views": metrics.snapshot(),
+        "slow_queries": metrics.slow_queries(),
+        "caches": metrics.cache_stats(),
+        "webhooks": webhook_queue_stats(),
+        "profiles": profiling.recent_profiles(),
+    }
+    return render(request, "home/performance.html", context)
+
+
+@staff_member_required
+@require_POST
+def performance_dashboard_reset(request):
+    """Clear the in-process metrics and return to the dashboard."""
+    metrics.reset()
+    profiling.clear_profiles()
+    messages.success(request, "Performance metrics cleared.")
+    return redirect("performance_dashboard")
+
+
+@staff_member_required
+@require_GET
+def profile_report(request, profile_id):
+    """Download a stored request profile."""
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise Http404("Profile not found or expired.")
+    return profiling.profile_download_response(profile_id, profile["report"])
+
+
 class PrivacyCovenantView(TemplateView):
     """Privacy of the Covenant footer page."""
 
@@ -1,10 +1,13 @@
 """Admin configuration for the orders app."""
 
-from django.contrib import admin
-from django.db import transaction
+from django.contrib import admin, messages
 from django.utils.html import format_html
 
+from elysium_archive.helpers import forget_access
+
+from .exports import streaming_export_response
 from .models import AccessEntitlement, Order, OrderLineItem
+from .services import mark_orders_paid, refresh_sales_counts
 
 
 class OrderLineItemInline(admin.TabularInline):
@@ -40,6 +43,7 @@ class OrderAdmin(admin.ModelAdmin):
     ]
 
     list_display_links = ["order_number_display"]
+    list_select_related = ["user"]
     list_filter = ["status"]
     search_fields = ["order_number", "user__username", "user__email"]
     readonly_fields = ["order_number", "created_at", "updated_at"]
@@ -68,7 +72,13 @@ class OrderAdmin(admin.ModelAdmin):
         ),
     ]
 
-    actions = ["mark_as_paid", "mark_as_failed"]
+    actions = [
+        "mark_as_paid",
+        "mark_as_failed",
+        "export_as_csv",
+        "export_as_jsonl",
+        "export_line_items_as_csv",
+    ]
 
     @admin.display(description="Order")
     def order_number_display(self, obj):
@@ -117,45 +127,33 @@ class OrderAdmin(admin.ModelAdmin):
 
     def mark_as_paid(self, request, queryset):
         """Mark orders as paid."""
+        outcomes = mark_orders_paid(queryset.values_list("pk", flat=True))
+
         updated = 0
         granted = 0
-        skipped_no_user = 0
-
-        for order in queryset.select_related("user").prefetch_related(
-            "line_items__product"
-        ):
-            with transaction.atomic():
-                locked = Order.objects.select_for_update().get(pk=order.pk)
-
-                if locked.status != "paid":
-                    locked.status = "paid"
-                    locked.save(update_fields=["status", "updated_at"])
-                    updated += 1
-
-                if not locked.user:
-                    skipped_no_user += 1
-                    continue
-
-                for line_item in locked.line_items.all():
-                    if not line_item.product:
-                        continue
-
-                    _, created = AccessEntitlement.objects.get_or_create(
-                        user=locked.user,
-                        product=line_item.product,
-                        defaults={"order": locked},
-                    )
-                    if created:
-                        granted += 1
+        no_user = []
+        for order_number, result in outcomes.items():
+            granted += result["granted"]
+            if result["outcome"] == "paid":
+                updated += 1
+            if result["no_user"]:
+                no_user.append(order_number)
 
         self.message_user(
             request,
             (
                 f"{updated} orders marked as paid. "
                 f"{granted} access entitlements granted. "
-                f"{skipped_no_user} orders had no user."
+                f"{len(no_user)} orders had no user."
             ),
         )
+        if no_user:
+            self.message_user(
+                request,
+                f"No access granted for orders without a user: "
+                f"{', '.join(no_user)}.",
+                level=messages.WARNING,
+            )
 
     mark_as_paid.short_description = "Mark as paid"
 
@@ -166,6 +164,25 @@ class OrderAdmin(admin.ModelAdmin):
 
     mark_as_failed.short_description = "Mark as failed"
 
+    def export_as_csv(self, request, queryset):
+        """Stream selected orders as CSV."""
+        return streaming_export_response(queryset, "orders", "csv")
+
+    export_as_csv.short_description = "Export as CSV"
+
+    def export_as_jsonl(self, request, queryset):
+        """Stream selected orders as JSON lines."""
+        return streaming_export_response(queryset, "orders", "jsonl")
+
+    export_as_jsonl.short_description = "Export as JSONL"
+
+    def export_line_items_as_csv(self, request, queryset):
+        """Stream the line items of selected orders as CSV."""
+        line_items = OrderLineItem.objects.filter(order__in=queryset)
+        return streaming_export_response(line_items, "line_items", "csv")
+
+    export_line_items_as_csv.short_description = "Export line items as CSV"
+
 
 @admin.register(AccessEntitlement)
 class AccessEntitlementAdmin(admin.ModelAdmin):
@@ -185,6 +202,7 @@ class AccessEntitlementAdmin(admin.ModelAdmin):
     ]
 
     list_display_links = ["user_display", "product"]
+    list_select_related = ["user", "product", "order"]
     list_filter = ["order__status"]
     search_fields = [
         "user__username",
@@ -194,6 +212,44 @@ class AccessEntitlementAdmin(admin.ModelAdmin):
     ]
     readonly_fields = ["granted_at"]
     date_hierarchy = "granted_at"
+    actions = ["export_as_csv"]
+
+    def save_model(self, request, obj, form, change):
+        """Save the entitlement and recount its products' sales."""
+        old_pair = (
+            AccessEntitlement.objects.filter(pk=obj.pk)
+            .values_list("user_id", "product_id")
+            .first()
+            if change
+            else None
+        )
+        super().save_model(request, obj, form, change)
+        old_product_pk = old_pair[1] if old_pair else None
+        refresh_sales_counts(
+            pk for pk in (old_product_pk, obj.product_id) if pk
+        )
+        if old_pair:
+            forget_access([old_pair])
+
+    def delete_model(self, request, obj):
+        """Delete the entitlement and recount its product's sales."""
+        product_pk = obj.product_id
+        super().delete_model(request, obj)
+        refresh_sales_counts([product_pk])
+        forget_access([(obj.user_id, product_pk)])
+
+    def delete_queryset(self, request, queryset):
+        """Delete entitlements and recount the affected products' sales."""
+        pairs = list(queryset.values_list("user_id", "product_id"))
+        super().delete_queryset(request, queryset)
+        refresh_sales_counts({product_pk for _, product_pk in pairs})
+        forget_access(pairs)
+
+    def export_as_csv(self, request, queryset):
+        """Stream selected entitlements as CSV."""
+        return streaming_export_response(queryset, "entitlements", "csv")
+
+    export_as_csv.short_description = "Export as CSV"
 
     @admin.display(description="User")
     def user_display(self, obj):
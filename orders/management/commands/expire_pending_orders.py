@@ -0,0 +1,75 @@
+"""Management command to expire abandoned pending orders."""
+
+from datetime import timedelta
+
+import stripe
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from orders.services import expire_stale_pending_orders
+
+
+class Command(BaseCommand):
+    """Mark stale pending orders as failed for all users."""
+
+    help = "Expire pending orders older than a cutoff, in batches"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=30,
+            help="Age in minutes after which pending orders expire",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Orders handled per batch (default: 500)",
+        )
+        parser.add_argument(
+            "--reconcile",
+            action="store_true",
+            help="Ask Stripe first and finalize sessions that were paid",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        cutoff = timezone.now() - timedelta(minutes=options["minutes"])
+
+        paid_lookup = None
+        if options["reconcile"]:
+            paid_lookup = self._build_paid_lookup()
+
+        summary = expire_stale_pending_orders(
+            cutoff,
+            batch_size=options["batch_size"],
+            paid_lookup=paid_lookup,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Expired {summary['expired']} pending order(s), "
+                f"finalized {summary['paid']} paid order(s), "
+                f"skipped {summary['skipped']}."
+            )
+        )
+
+    def _build_paid_lookup(self):
+        """Return a Stripe session lookup sharing one pooled client."""
+        if not getattr(settings, "STRIPE_SECRET_KEY", ""):
+            raise CommandError("STRIPE_SECRET_KEY is required to reconcile.")
+
+        # One client keeps one HTTP session, so connections are reused
+        # across every session lookup in the run.
+        client = stripe.StripeClient(settings.STRIPE_SECRET_KEY)
+
+        def paid_lookup(session_id):
+            session = client.v1.checkout.sessions.retrieve(session_id)
+            if session.get("payment_status") != "paid":
+                return None
+            return session.get("payment_intent") or ""
+
+        return paid_lookup
@@ -0,0 +1,45 @@
+"""Management command to rebuild product popularity scores."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.services import POPULARITY_BATCH_SIZE, refresh_popularity_scores
+
+
+class Command(BaseCommand):
+    """Recompute time-decayed popularity from recent entitlements."""
+
+    help = "Rebuild product popularity scores from access entitlements"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--half-life-days",
+            type=int,
+            default=settings.POPULARITY_HALF_LIFE_DAYS,
+            help=(
+                "Days after which a sale counts half "
+                f"(default: {settings.POPULARITY_HALF_LIFE_DAYS})"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=POPULARITY_BATCH_SIZE,
+            help=f"Rows per UPDATE (default: {POPULARITY_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        """Score every product with sales inside the decay horizon."""
+        if options["half_life_days"] < 1:
+            raise CommandError("--half-life-days must be at least 1.")
+
+        scored = refresh_popularity_scores(
+            half_life_days=options["half_life_days"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Popularity refreshed for {scored} product(s)."
+            )
+        )
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0005_alter_accessentitlement_product"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "status", "created_at"],
+                name="order_user_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["stripe_session_id"], name="order_stripe_session_idx"
+            ),
+        ),
+    ]
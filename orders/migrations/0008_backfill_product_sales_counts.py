@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_sales_counts(apps, schema_editor):
+    """Count each product's existing access entitlements."""
+    Product = apps.get_model("products", "Product")
+    AccessEntitlement = apps.get_model("orders", "AccessEntitlement")
+
+    entitlements = (
+        AccessEntitlement.objects.filter(product=OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Product.objects.update(sales_count=Coalesce(Subquery(entitlements), 0))
+
+
+def noop_reverse(apps, schema_editor):
+    """The column is dropped by the products migration on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0007_order_order_pending_created_idx"),
+        ("products", "0017_product_pricing_and_sales_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sales_counts, reverse_code=noop_reverse),
+    ]
@@ -0,0 +1,51 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_popularity_scores(apps, schema_editor):
+    """Score products from their entitlements of the last ten half-lives."""
+    Product = apps.get_model("products", "Product")
+    AccessEntitlement = apps.get_model("orders", "AccessEntitlement")
+
+    now = timezone.now()
+    half_life = timedelta(days=settings.POPULARITY_HALF_LIFE_DAYS)
+    scores = defaultdict(float)
+    recent_sales = (
+        AccessEntitlement.objects.filter(granted_at__gte=now - half_life * 10)
+        .order_by()
+        .values_list("product_id", "granted_at")
+    )
+    for product_pk, granted_at in recent_sales.iterator():
+        scores[product_pk] += 0.5 ** max((now - granted_at) / half_life, 0)
+
+    Product.objects.bulk_update(
+        [
+            Product(pk=product_pk, popularity_score=score)
+            for product_pk, score in scores.items()
+        ],
+        ["popularity_score"],
+        batch_size=1000,
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    """The column is dropped by the products migration on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0008_backfill_product_sales_counts"),
+        ("products", "0019_product_popularity_score"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_popularity_scores, reverse_code=noop_reverse
+        ),
+    ]
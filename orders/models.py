@@ -79,6 +79,23 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Pending-order lookups and sweeps per user.
+            models.Index(
+                fields=["user", "status", "created_at"],
+                name="order_user_status_idx",
+            ),
+            models.Index(
+                fields=["stripe_session_id"],
+                name="order_stripe_session_idx",
+            ),
+            # Site-wide sweep of abandoned pending orders.
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(status="pending"),
+                name="order_pending_created_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Order {self.order_number}"
@@ -2,9 +2,29 @@
 
 from __future__ import annotations
 
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from itertools import batched
+from typing import Any
+
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from products.models import Product
+
+from .models import AccessEntitlement, Order, OrderLineItem
+
+logger = logging.getLogger(__name__)
 
-from .models import AccessEntitlement, Order
+# Sales older than this many half-lives weigh under 0.1% and are skipped.
+POPULARITY_HORIZON = 10
+
+POPULARITY_BATCH_SIZE = 1000
 
 
 def grant_entitlements_for_order(order: Order, user=None) -> int:
@@ -16,6 +36,7 @@ def grant_entitlements_for_order(order: Order, user=None) -> int:
         return 0
 
     changed = 0
+    granted_product_pks = []
 
     with transaction.atomic():
         locked_order = Order.objects.select_for_update().get(pk=order.pk)
@@ -34,6 +55,7 @@ def grant_entitlements_for_order(order: Order, user=None) -> int:
 
             if created:
                 changed += 1
+                granted_product_pks.append(line_item.product.pk)
                 continue
 
             # Keep entitlement linked to paid order.
@@ -42,4 +64,250 @@ def grant_entitlements_for_order(order: Order, user=None) -> int:
                 entitlement.save(update_fields=["order"])
                 changed += 1
 
+        record_sales(granted_product_pks)
+
     return changed
+
+
+def record_sales(product_pks: Iterable[int]) -> None:
+    """Count newly granted entitlements, one product pk per sale.
+
+    Sales counts are recounted exactly. Each sale adds 1 to the product's
+    popularity score, which refresh_popularity_scores() later decays.
+    """
+    sales = Counter(product_pks)
+    if not sales:
+        return
+
+    refresh_sales_counts(sales)
+    products_by_sales: dict[int, list[int]] = defaultdict(list)
+    for product_pk, count in sales.items():
+        products_by_sales[count].append(product_pk)
+    for count, pks in products_by_sales.items():
+        Product.objects.filter(pk__in=pks).update(
+            popularity_score=F("popularity_score") + count
+        )
+
+
+def refresh_popularity_scores(
+    now: datetime | None = None,
+    half_life_days: int | None = None,
+    batch_size: int = POPULARITY_BATCH_SIZE,
+) -> int:
+    """Rebuild every product's time-decayed popularity score.
+
+    Each entitlement weighs 0.5 ** (age / half-life). Entitlements past the
+    horizon are not read, and products without recent sales drop to zero.
+    Return the number of products with a score.
+    """
+    now = now or timezone.now()
+    if half_life_days is None:
+        half_life_days = settings.POPULARITY_HALF_LIFE_DAYS
+    half_life = timedelta(days=half_life_days)
+
+    scores: dict[int, float] = defaultdict(float)
+    recent_sales = (
+        AccessEntitlement.objects.filter(
+            granted_at__gte=now - half_life * POPULARITY_HORIZON
+        )
+        .order_by()
+        .values_list("product_id", "granted_at")
+    )
+    for product_pk, granted_at in recent_sales.iterator(chunk_size=batch_size):
+        age = max((now - granted_at) / half_life, 0)
+        scores[product_pk] += 0.5**age
+
+    with transaction.atomic():
+        Product.objects.filter(popularity_score__gt=0).update(
+            popularity_score=0
+        )
+        for chunk in batched(scores.items(), batch_size):
+            Product.objects.bulk_update(
+                [
+                    Product(pk=product_pk, popularity_score=score)
+                    for product_pk, score in chunk
+                ],
+                ["popularity_score"],
+            )
+
+    logger.info("Refreshed popularity scores for %s product(s)", len(scores))
+    return len(scores)
+
+
+def refresh_sales_counts(product_pks: Iterable[int] | None = None) -> int:
+    """Recount the entitlements of the given products (default: all).
+
+    One UPDATE with a correlated count, so the result is exact however the
+    entitlements were created or deleted. Return the rows updated.
+    """
+    products = Product.objects.all()
+    if product_pks is not None:
+        product_pks = set(product_pks)
+        if not product_pks:
+            return 0
+        products = products.filter(pk__in=product_pks)
+
+    entitlements = (
+        AccessEntitlement.objects.filter(product=OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return products.update(sales_count=Coalesce(Subquery(entitlements), 0))
+
+
+def mark_order_paid(order_pk: int, payment_intent_id: str = "") -> bool:
+    """Mark a pending order as paid and grant its entitlements.
+
+    Return False when the order is no longer pending.
+    """
+    with transaction.atomic():
+        order = Order.objects.select_for_update().get(pk=order_pk)
+        if order.status != "pending":
+            return False
+
+        order.status = "paid"
+        if payment_intent_id:
+            order.stripe_payment_intent_id = payment_intent_id
+        order.save(
+            update_fields=["status", "stripe_payment_intent_id", "updated_at"]
+        )
+        grant_entitlements_for_order(order)
+
+    return True
+
+
+def mark_orders_paid(order_pks: Iterable[int]) -> dict[str, dict[str, Any]]:
+    """Mark many orders as paid and grant their entitlements in bulk.
+
+    The orders are locked with one query, flipped with one UPDATE and their
+    missing entitlements are inserted with one bulk INSERT. Returns the
+    outcome for each order keyed by order number: "paid" or "already_paid",
+    the number of entitlements granted, and whether it had no user.
+    """
+    with transaction.atomic():
+        orders = list(
+            Order.objects.select_for_update()
+            .filter(pk__in=list(order_pks))
+            .order_by("pk")
+        )
+        if not orders:
+            return {}
+
+        to_flip = [order.pk for order in orders if order.status != "paid"]
+        if to_flip:
+            Order.objects.filter(pk__in=to_flip).update(
+                status="paid",
+                updated_at=timezone.now(),
+            )
+
+        products_by_order: dict[int, list[int]] = {}
+        for order_pk, product_pk in OrderLineItem.objects.filter(
+            order_id__in=[order.pk for order in orders],
+            product__isnull=False,
+        ).values_list("order_id", "product_id"):
+            products_by_order.setdefault(order_pk, []).append(product_pk)
+
+        # The earliest selected order owns an entitlement bought twice.
+        wanted: dict[tuple[int, int], int] = {}
+        for order in orders:
+            if order.user_id is None:
+                continue
+            for product_pk in products_by_order.get(order.pk, []):
+                wanted.setdefault((order.user_id, product_pk), order.pk)
+
+        existing = set(
+            AccessEntitlement.objects.filter(
+                user_id__in={user_pk for user_pk, _ in wanted},
+                product_id__in={product_pk for _, product_pk in wanted},
+            ).values_list("user_id", "product_id")
+        )
+        new_entitlements = [
+            AccessEntitlement(
+                user_id=user_pk,
+                product_id=product_pk,
+                order_id=order_pk,
+            )
+            for (user_pk, product_pk), order_pk in wanted.items()
+            if (user_pk, product_pk) not in existing
+        ]
+        AccessEntitlement.objects.bulk_create(
+            new_entitlements,
+            ignore_conflicts=True,
+        )
+        record_sales(
+            entitlement.product_id for entitlement in new_entitlements
+        )
+
+    granted_by_order: dict[int, int] = {}
+    for entitlement in new_entitlements:
+        order_pk = entitlement.order_id
+        granted_by_order[order_pk] = granted_by_order.get(order_pk, 0) + 1
+
+    return {
+        order.order_number: {
+            "outcome": "already_paid" if order.status == "paid" else "paid",
+            "granted": granted_by_order.get(order.pk, 0),
+            "no_user": order.user_id is None,
+        }
+        for order in orders
+    }
+
+
+def expire_stale_pending_orders(
+    cutoff,
+    batch_size: int = 500,
+    paid_lookup: Callable[[str], str | None] | None = None,
+) -> dict[str, int]:
+    """Fail pending orders created before cutoff, in bounded batches.
+
+    When paid_lookup is given it is called with each order's Stripe session
+    ID and returns the payment intent ID if Stripe reports the session paid.
+    Those orders are finalized instead of failed. Orders whose lookup raises
+    are left pending for the next run.
+    """
+    summary = {"expired": 0, "paid": 0, "skipped": 0}
+    last_pk = 0
+
+    while True:
+        batch = list(
+            Order.objects.filter(
+                status="pending",
+                created_at__lt=cutoff,
+                pk__gt=last_pk,
+            )
+            .order_by("pk")
+            .values_list("pk", "stripe_session_id")[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+
+        to_expire = []
+        for order_pk, session_id in batch:
+            payment_intent_id = None
+            if paid_lookup is not None and session_id:
+                try:
+                    payment_intent_id = paid_lookup(session_id)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning(
+                        "Could not reconcile order %s with Stripe.",
+                        order_pk,
+                        exc_info=exc,
+                    )
+                    summary["skipped"] += 1
+                    continue
+
+            if payment_intent_id is None:
+                to_expire.append(order_pk)
+            elif mark_order_paid(order_pk, payment_intent_id):
+                summary["paid"] += 1
+
+        # Re-check the status so orders paid meanwhile are left alone.
+        summary["expired"] += Order.objects.filter(
+            pk__in=to_expire,
+            status="pending",
+        ).update(status="failed", updated_at=timezone.now())
+
+    return summary
@@ -2,6 +2,8 @@
 
 from django import forms
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
 from django.utils.html import format_html, format_html_join
 from django.utils.safestring import mark_safe
@@ -9,7 +11,14 @@ from django.utils.safestring import mark_safe
 from orders.models import AccessEntitlement
 
 from .admin_utils import admin_display
-from .models import Category, DealBanner, Product
+from .models import (
+    Category,
+    DealBanner,
+    Product,
+    set_products_featured,
+    sync_banner_targets,
+    sync_products_deal_status,
+)
 
 # ============================
 # Product Admin Form
@@ -71,6 +80,11 @@ class CategoryAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        """Annotate categories with their product count."""
+        queryset = super().get_queryset(request)
+        return queryset.annotate(product_total=Count("products"))
+
     @admin_display("Name")
     def name_display(self, obj):
         """Display category name."""
@@ -90,7 +104,9 @@ class CategoryAdmin(admin.ModelAdmin):
     @admin_display("Products")
     def product_count(self, obj):
         """Display number of products."""
-        count = obj.products.count()
+        count = getattr(obj, "product_total", None)
+        if count is None:
+            count = obj.products.count()
         css_class = "category-product-count"
         if count == 0:
             css_class += " category-product-count-zero"
@@ -132,6 +148,7 @@ class ProductAdmin(admin.ModelAdmin):
         "created_at",
     ]
     list_display_links = ["image_thumbnail", "title"]
+    list_select_related = ["category"]
 
     list_filter = [
         "is_active",
@@ -200,12 +217,27 @@ class ProductAdmin(admin.ModelAdmin):
 
     def delete_queryset(self, request, queryset):
         """Convert bulk delete into unpublish."""
-        updated = queryset.update(is_active=False)
+        updated = self._update_and_sync_deals(queryset, is_active=False)
         self.message_user(
             request,
             f"{updated} product(s) removed from catalog (unpublished).",
         )
 
+    @staticmethod
+    def _update_and_sync_deals(queryset, **fields):
+        """Update products in one query and resync their deal status."""
+        product_pks = list(queryset.values_list("pk", flat=True))
+        if not product_pks:
+            return 0
+
+        with transaction.atomic():
+            updated = Product.objects.filter(pk__in=product_pks).update(
+                updated_at=timezone.now(),
+                **fields,
+            )
+            sync_products_deal_status(product_pks=product_pks)
+        return updated
+
     def get_actions(self, request):
         """Remove built-in bulk delete action."""
         actions = super().get_actions(request)
@@ -267,7 +299,11 @@ class ProductAdmin(admin.ModelAdmin):
 
     def publish_products(self, request, queryset):
         """Publish products."""
-        updated = queryset.update(is_active=True)
+        # Removed products stay inactive, as Product.save() enforces.
+        updated = self._update_and_sync_deals(
+            queryset.filter(is_removed=False),
+            is_active=True,
+        )
         self.message_user(
             request,
             f"{updated} product(s) published to catalog.",
@@ -275,7 +311,7 @@ class ProductAdmin(admin.ModelAdmin):
 
     def unpublish_products(self, request, queryset):
         """Unpublish products."""
-        updated = queryset.update(is_active=False)
+        updated = self._update_and_sync_deals(queryset, is_active=False)
         self.message_user(
             request,
             f"{updated} product(s) removed from catalog.",
@@ -283,12 +319,10 @@ class ProductAdmin(admin.ModelAdmin):
 
     def mark_as_featured(self, request, queryset):
         """Mark as featured."""
-        count = 0
-        for product in queryset:
-            if not product.is_featured:
-                product.is_featured = True
-                product.save(update_fields=["is_featured", "updated_at"])
-                count += 1
+        with transaction.atomic():
+            count = set_products_featured(
+                queryset.values_list("pk", flat=True), True
+            )
         self.message_user(
             request,
             f"{count} product(s) marked as featured.",
@@ -296,12 +330,10 @@ class ProductAdmin(admin.ModelAdmin):
 
     def unmark_as_featured(self, request, queryset):
         """Remove featured status."""
-        count = 0
-        for product in queryset:
-            if product.is_featured:
-                product.is_featured = False
-                product.save(update_fields=["is_featured", "updated_at"])
-                count += 1
+        with transaction.atomic():
+            count = set_products_featured(
+                queryset.values_list("pk", flat=True), False
+            )
         self.message_user(
             request,
             f"{count} product(s) unmarked as featured.",
@@ -323,15 +355,12 @@ class ProductAdmin(admin.ModelAdmin):
         to_soft_remove = queryset.filter(pk__in=entitled_ids)
         to_hard_delete = queryset.exclude(pk__in=entitled_ids)
 
-        now = timezone.now()
-        soft_count = 0
-        if to_soft_remove.exists():
-            soft_count = to_soft_remove.update(
-                is_removed=True,
-                is_active=False,
-                is_featured=False,
-                updated_at=now,
-            )
+        soft_count = self._update_and_sync_deals(
+            to_soft_remove,
+            is_removed=True,
+            is_active=False,
+            is_featured=False,
+        )
 
         hard_count = to_hard_delete.count()
         if hard_count:
@@ -374,6 +403,7 @@ class DealBannerAdmin(admin.ModelAdmin):
         "created_at",
     ]
     list_display_links = ["title"]
+    list_select_related = ["product", "category"]
     list_filter = ["is_active", "is_featured", "category"]
     search_fields = ["title", "message", "url"]
     list_editable = ["order", "is_active"]
@@ -386,15 +416,31 @@ class DealBannerAdmin(admin.ModelAdmin):
         "mark_selected_deal_banners_inactive",
     ]
 
+    @staticmethod
+    def _set_banners_active(queryset, is_active):
+        """Toggle banners in one query and resync their targets once."""
+        changed = list(
+            queryset.exclude(is_active=is_active).values_list(
+                "pk", "product_id", "category_id"
+            )
+        )
+        if not changed:
+            return 0
+
+        with transaction.atomic():
+            DealBanner.objects.filter(
+                pk__in=[pk for pk, _, _ in changed]
+            ).update(is_active=is_active)
+            sync_banner_targets(
+                product_pks=[pk for _, pk, _ in changed if pk],
+                category_pks=[pk for _, _, pk in changed if pk],
+            )
+        return len(changed)
+
     @admin.action(description="Mark selected deal banners as active")
     def mark_selected_deal_banners_active(self, request, queryset):
         """Mark selected deal banners as active."""
-        changed = 0
-        for banner in queryset:
-            if not banner.is_active:
-                banner.is_active = True
-                banner.save(update_fields=["is_active"])
-                changed += 1
+        changed = self._set_banners_active(queryset, True)
 
         self.message_user(
             request,
@@ -404,12 +450,7 @@ class DealBannerAdmin(admin.ModelAdmin):
     @admin.action(description="Mark selected deal banners as inactive")
     def mark_selected_deal_banners_inactive(self, request, queryset):
         """Mark selected deal banners as inactive."""
-        changed = 0
-        for banner in queryset:
-            if banner.is_active:
-                banner.is_active = False
-                banner.save(update_fields=["is_active"])
-                changed += 1
+        changed = self._set_banners_active(queryset, False)
 
         self.message_user(
             request,
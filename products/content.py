@@ -0,0 +1,387 @@
+"""Post-processing of CKEditor archive content into reader HTML.
+
+render_content() runs when a product is saved or imported. It keeps
+only allow-listed elements, attributes, URL schemes and inline styles,
+lazy-loads images with responsive Cloudinary srcsets, gives each
+heading an anchor id, collects a table of contents and splits the
+document into sections at its top-level h2 headings. The result is
+stored on the product, so the reading page never reparses the editor
+HTML and can send one section at a time.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html import escape, unescape
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+from django.utils.text import slugify
+
+# Elements dropped together with everything inside them. Any other
+# element that is not allowed below is unwrapped: its text is kept.
+DROPPED_ELEMENTS = frozenset(
+    {
+        "script",
+        "style",
+        "iframe",
+        "object",
+        "embed",
+        "applet",
+        "form",
+        "template",
+        "noscript",
+        "textarea",
+        "select",
+        "svg",
+        "math",
+    }
+)
+
+VOID_ELEMENTS = frozenset(
+    {"area", "br", "col", "hr", "img", "input", "source", "wbr"}
+)
+
+# What the CKEditor configurations in settings can produce.
+GLOBAL_ATTRIBUTES = frozenset({"id", "class", "title", "lang", "dir", "style"})
+ALLOWED_ELEMENTS = {
+    "a": {"href", "target", "rel", "name"},
+    "abbr": set(),
+    "b": set(),
+    "blockquote": {"cite"},
+    "br": set(),
+    "caption": set(),
+    "cite": set(),
+    "code": set(),
+    "col": {"span"},
+    "colgroup": {"span"},
+    "dd": set(),
+    "del": {"cite"},
+    "div": set(),
+    "dl": set(),
+    "dt": set(),
+    "em": set(),
+    "figcaption": set(),
+    "figure": set(),
+    "h1": set(),
+    "h2": set(),
+    "h3": set(),
+    "h4": set(),
+    "h5": set(),
+    "h6": set(),
+    "hr": set(),
+    "i": set(),
+    "img": {"src", "srcset", "sizes", "alt", "width", "height"},
+    "input": {"type", "checked", "disabled"},
+    "ins": {"cite"},
+    "kbd": set(),
+    "label": set(),
+    "li": {"value"},
+    "mark": set(),
+    "oembed": {"url"},
+    "ol": {"start", "reversed", "type"},
+    "p": set(),
+    "pre": set(),
+    "q": {"cite"},
+    "s": set(),
+    "small": set(),
+    "span": set(),
+    "strong": set(),
+    "sub": set(),
+    "sup": set(),
+    "table": set(),
+    "tbody": set(),
+    "td": {"colspan", "rowspan"},
+    "tfoot": set(),
+    "th": {"colspan", "rowspan", "scope"},
+    "thead": set(),
+    "tr": set(),
+    "u": set(),
+    "ul": set(),
+}
+
+URL_ATTRIBUTES = frozenset({"href", "src", "cite", "url"})
+
+SAFE_URL_SCHEMES = ("http:", "https:", "mailto:", "tel:")
+_URL_SCHEME = re.compile(r"^[a-z][a-z0-9+.-]*:")
+# Browsers ignore these around and inside a scheme.
+_URL_IGNORED = re.compile(r"[\x00-\x20\x7f]+")
+# Inline raster images only; SVG documents can carry script.
+_DATA_IMAGE = re.compile(r"^data:image/(?:avif|gif|jpeg|png|webp)[;,]")
+
+# Inline style properties kept for alignment, image sizes and tables.
+STYLE_PROPERTIES = frozenset(
+    {
+        "background-color",
+        "border",
+        "border-color",
+        "border-style",
+        "border-width",
+        "float",
+        "height",
+        "margin-left",
+        "margin-right",
+        "padding",
+        "page-break-after",
+        "text-align",
+        "vertical-align",
+        "width",
+    }
+)
+# Keywords, lengths, hex colours and rgb()/hsl() colours; no url().
+_STYLE_VALUE = re.compile(r"^(?:[\w\s#%.,-]|(?:rgba?|hsla?)\([\w\s%.,-]*\))+$")
+
+TOC_HEADINGS = ("h2", "h3")
+
+# Widths offered in the srcset of Cloudinary images in content.
+CONTENT_IMAGE_WIDTHS = (480, 800, 1200)
+CONTENT_IMAGE_SIZES = "(max-width: 768px) 100vw, 720px"
+
+
+@dataclass
+class RenderedContent:
+    """Reader HTML, its table of contents and its sections."""
+
+    html: str = ""
+    toc: list[dict[str, str | int]] = field(default_factory=list)
+    sections: list[dict[str, str]] = field(default_factory=list)
+
+
+def cloudinary_width_url(url: str, width: int) -> str:
+    """Return a Cloudinary URL scaled down to at most the given width."""
+    base, _, path = url.partition("/upload/")
+    return f"{base}/upload/c_limit,w_{width},q_auto,f_auto/{path}"
+
+
+def _is_safe_url(value: str, attribute: str) -> bool:
+    """Return True for relative URLs and allowed schemes."""
+    url = _URL_IGNORED.sub("", unquote(value)).lower()
+    if not _URL_SCHEME.match(url):
+        return True
+    if attribute == "src" and _DATA_IMAGE.match(url):
+        return True
+    return url.startswith(SAFE_URL_SCHEMES)
+
+
+def _is_safe_srcset(value: str) -> bool:
+    """Return True when every image candidate has a safe URL."""
+    return all(
+        _is_safe_url(candidate.split()[0], "src")
+        for candidate in value.split(",")
+        if candidate.strip()
+    )
+
+
+def _clean_style(value: str) -> str:
+    """Return the allowed declarations of an inline style."""
+    declarations = []
+    for declaration in value.split(";"):
+        name, _, css = declaration.partition(":")
+        name, css = name.strip().lower(), css.strip()
+        if name in STYLE_PROPERTIES and _STYLE_VALUE.match(css):
+            declarations.append(f"{name}:{css}")
+    return ";".join(declarations)
+
+
+class _ContentRenderer(HTMLParser):
+    """Re-serialise editor HTML with the reader transformations applied."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.output: list[str] = []
+        self.toc: list[dict[str, str | int]] = []
+        self._dropped_depth = 0
+        self._depth = 0
+        self._heading: dict | None = None
+        self._used_ids: set[str] = set()
+        # Output offset, title and anchor of each top-level h2.
+        self._section_starts: list[dict] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._dropped_depth or tag in DROPPED_ELEMENTS:
+            if tag not in VOID_ELEMENTS:
+                self._dropped_depth += 1
+            return
+        if tag not in ALLOWED_ELEMENTS:
+            return
+
+        attributes = self._clean_attributes(tag, attrs)
+        if tag == "input" and attributes.get("type") != "checkbox":
+            # Only the read-only checkboxes of to-do lists.
+            return
+
+        if tag == "img":
+            self._prepare_image(attributes)
+        elif tag == "a" and attributes.get("target") == "_blank":
+            attributes["rel"] = "noopener noreferrer"
+        elif tag in TOC_HEADINGS and self._heading is None:
+            self._heading = {
+                "tag": tag,
+                "attributes": attributes,
+                "start": len(self.output),
+                "text": [],
+            }
+            if tag == "h2" and self._depth == 0:
+                self._section_starts.append(
+                    {"start": len(self.output), "title": "", "anchor": ""}
+                )
+                self._heading["section"] = True
+
+        self.output.append(self._start_tag(tag, attributes))
+        if tag not in VOID_ELEMENTS:
+            self._depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._dropped_depth or tag in DROPPED_ELEMENTS:
+            # Self-closed, so there is nothing inside it to drop.
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._dropped_depth:
+            if tag not in VOID_ELEMENTS:
+                self._dropped_depth -= 1
+            return
+        if tag in VOID_ELEMENTS or tag not in ALLOWED_ELEMENTS:
+            return
+        self._depth = max(self._depth - 1, 0)
+        self.output.append(f"</{tag}>")
+        if self._heading and tag == self._heading["tag"]:
+            self._finish_heading()
+
+    def handle_data(self, data):
+        self._append_text(data, escape(data, quote=False))
+
+    def handle_entityref(self, name):
+        # The parser only matches names made of letters, digits, "." and "-".
+        self._append_text(f"&{name};", f"&{name};")
+
+    def handle_charref(self, name):
+        # The parser only matches decimal or "x"-prefixed hex digits.
+        self._append_text(f"&#{name};", f"&#{name};")
+
+    def handle_comment(self, data):
+        return
+
+    def close(self):
+        # An unterminated tag or comment would be flushed as text.
+        if self.rawdata.startswith("<"):
+            self.rawdata = ""
+        super().close()
+
+    def _append_text(self, text, markup):
+        if self._dropped_depth:
+            return
+        if self._heading is not None:
+            self._heading["text"].append(text)
+        self.output.append(markup)
+
+    @staticmethod
+    def _clean_attributes(tag, attrs):
+        allowed = ALLOWED_ELEMENTS[tag]
+        attributes = {}
+        for name, value in attrs:
+            value = value or ""
+            if name not in allowed and name not in GLOBAL_ATTRIBUTES:
+                continue
+            if name in URL_ATTRIBUTES and not _is_safe_url(value, name):
+                continue
+            if name == "srcset" and not _is_safe_srcset(value):
+                continue
+            if name == "style":
+                value = _clean_style(value)
+                if not value:
+                    continue
+            attributes[name] = value
+        if tag == "input":
+            attributes["disabled"] = "disabled"
+        return attributes
+
+    @staticmethod
+    def _start_tag(tag, attributes):
+        rendered = "".join(
+            f' {name}="{escape(value, quote=True)}"'
+            for name, value in attributes.items()
+        )
+        return f"<{tag}{rendered}>"
+
+    def _prepare_image(self, attributes):
+        attributes.setdefault("loading", "lazy")
+        attributes.setdefault("decoding", "async")
+        src = attributes.get("src", "")
+        if "/upload/" in src and "srcset" not in attributes:
+            src = src.replace("http://", "https://", 1)
+            attributes["src"] = cloudinary_width_url(
+                src, CONTENT_IMAGE_WIDTHS[1]
+            )
+            attributes["srcset"] = ", ".join(
+                f"{cloudinary_width_url(src, width)} {width}w"
+                for width in CONTENT_IMAGE_WIDTHS
+            )
+            attributes["sizes"] = CONTENT_IMAGE_SIZES
+
+    def _finish_heading(self):
+        heading, self._heading = self._heading, None
+        text = " ".join(unescape("".join(heading["text"])).split())
+        attributes = heading["attributes"]
+        anchor = attributes.get("id") or slugify(text) or "section"
+        candidate, suffix = anchor, 2
+        while candidate in self._used_ids:
+            candidate, suffix = f"{anchor}-{suffix}", suffix + 1
+        self._used_ids.add(candidate)
+        attributes["id"] = candidate
+        self.output[heading["start"]] = self._start_tag(
+            heading["tag"], attributes
+        )
+        if heading.get("section"):
+            self._section_starts[-1].update(title=text, anchor=candidate)
+        if text:
+            self.toc.append(
+                {
+                    "id": candidate,
+                    "title": text,
+                    "level": int(heading["tag"][1]),
+                    "section": len(self._section_starts) - 1,
+                }
+            )
+
+    def sections(self):
+        """Split the output at the top-level h2 headings.
+
+        Content before the first of them becomes an untitled first
+        section, and TOC entries are renumbered to match.
+        """
+        starts = list(self._section_starts)
+        intro = "".join(self.output[: starts[0]["start"]] if starts else [])
+        if not starts or intro.strip():
+            starts.insert(0, {"start": 0, "title": "", "anchor": ""})
+            for entry in self.toc:
+                entry["section"] += 1
+        else:
+            starts[0] = {**starts[0], "start": 0}
+
+        ends = [start["start"] for start in starts[1:]] + [len(self.output)]
+        return [
+            {
+                "title": start["title"],
+                "anchor": start["anchor"],
+                "html": "".join(self.output[start["start"] : end]),
+            }
+            for start, end in zip(starts, ends)
+        ]
+
+
+def render_content(html: str) -> RenderedContent:
+    """Return the reader HTML and table of contents for editor HTML."""
+    if not html:
+        return RenderedContent()
+    renderer = _ContentRenderer()
+    renderer.feed(html)
+    renderer.close()
+    sections = renderer.sections()
+    return RenderedContent(
+        html="".join(renderer.output), toc=renderer.toc, sections=sections
+    )
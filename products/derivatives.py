@@ -0,0 +1,158 @@
+"""Local card image derivatives for deployments without Cloudinary.
+
+With FileSystemStorage a card would otherwise download the full-size
+upload. Here Pillow crops an upload to a card size, the same way
+Cloudinary's c_fill,g_auto transformation does, and encodes it as WebP,
+or as AVIF for browsers that accept it.
+
+Derivatives are stored under a directory named after a hash of the
+upload's content. Re-uploading the same picture reuses them, and a
+changed picture gets new URLs. They are generated in a thread pool
+once a product's image is saved. The image_derivative view also
+generates any that are missing on first request.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+# Output formats, preferred first when the browser accepts both.
+DERIVATIVE_FORMATS = ("avif", "webp")
+DEFAULT_DERIVATIVE_FORMAT = "webp"
+
+# Upload directory of Product.image; nothing else is processed.
+SOURCE_PREFIX = "products/"
+
+# Raised for missing, truncated, corrupt or oversized uploads.
+DERIVATIVE_ERRORS = (
+    OSError,
+    EOFError,
+    ValueError,
+    Image.DecompressionBombError,
+)
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def derivatives_enabled() -> bool:
+    """Return True when card images are served as local derivatives."""
+    return settings.IMAGE_DERIVATIVES_ENABLED
+
+
+@lru_cache(maxsize=1024)
+def content_digest(storage, name: str) -> str:
+    """Return a short hash of a stored file's content.
+
+    Uploads are never overwritten in place, so the hash of a name is
+    memoised.
+    """
+    digest = hashlib.sha256()
+    with storage.open(name, "rb") as source:
+        for chunk in source.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+
+def derivative_path(digest: str, width: int, height: int, fmt: str) -> str:
+    """Return the storage name of one derivative."""
+    directory = settings.IMAGE_DERIVATIVE_DIR
+    return f"{directory}/{digest}/{width}x{height}.{fmt}"
+
+
+def derivative_url(storage, name: str, width: int, height: int) -> str:
+    """Return the URL serving a fill-cropped derivative of an upload."""
+    digest = content_digest(storage, name)
+    url = reverse(
+        "image_derivative",
+        kwargs={"width": width, "height": height, "name": name},
+    )
+    return f"{url}?v={digest}"
+
+
+def negotiate_format(accept: str) -> str:
+    """Return the best derivative format for an Accept header."""
+    for fmt in DERIVATIVE_FORMATS:
+        if f"image/{fmt}" in accept and features.check(fmt):
+            return fmt
+    return DEFAULT_DERIVATIVE_FORMAT
+
+
+def _fill(source, width: int, height: int, fmt: str) -> bytes:
+    """Crop an image to fill width x height and encode it."""
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert(
+                "RGBA" if "transparency" in image.info else "RGB"
+            )
+        image = ImageOps.fit(
+            image, (width, height), method=Image.Resampling.LANCZOS
+        )
+        output = io.BytesIO()
+        image.save(
+            output,
+            format=fmt.upper(),
+            quality=settings.IMAGE_DERIVATIVE_QUALITY,
+        )
+    return output.getvalue()
+
+
+def ensure_derivative(
+    storage, name: str, width: int, height: int, fmt: str
+) -> str:
+    """Return the storage name of a derivative, generating it if needed."""
+    path = derivative_path(content_digest(storage, name), width, height, fmt)
+    if storage.exists(path):
+        return path
+
+    with storage.open(name, "rb") as source:
+        data = _fill(source, width, height, fmt)
+    saved = storage.save(path, ContentFile(data))
+    if saved != path:
+        # Another worker stored it first; keep theirs.
+        storage.delete(saved)
+    logger.info("Generated image derivative %s", path)
+    return path
+
+
+def generate_derivatives(name: str, sizes, storage=default_storage) -> int:
+    """Generate the default-format derivatives of an upload.
+
+    Return the number of sizes generated or already present.
+    """
+    generated = 0
+    for width, height in sizes:
+        try:
+            ensure_derivative(
+                storage, name, width, height, DEFAULT_DERIVATIVE_FORMAT
+            )
+        except Exception:
+            logger.exception(
+                "Image derivative %sx%s of %s failed", width, height, name
+            )
+            continue
+        generated += 1
+    return generated
+
+
+def schedule_derivatives(name: str, sizes):
+    """Generate an upload's derivatives in the background thread pool."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+            thread_name_prefix="image-derivatives",
+        )
+    return _executor.submit(generate_derivatives, name, list(sizes))
@@ -0,0 +1,122 @@
+"""Cloudinary fill-cropped URLs for product card images.
+
+URLs are memoised on the stored file name and size, so the storage URL
+and the string handling run once per image and size in a process. The
+sizes the product cards use are also stored on the product when it is
+saved, so listing pages render them without building any URL. Without
+Cloudinary, card sizes point at local derivatives (see derivatives.py).
+"""
+
+import logging
+from functools import lru_cache
+
+from .derivatives import SOURCE_PREFIX, derivative_url, derivatives_enabled
+
+logger = logging.getLogger(__name__)
+
+# Distinct (image, width, height) URLs kept per process.
+FILL_URL_CACHE_SIZE = 4096
+
+# Fill sizes of the card srcset, smallest first.
+CARD_IMAGE_SIZES = ((400, 225), (600, 338), (800, 450))
+# Stored card URL keys and their sizes.
+CARD_IMAGE_URLS = {"card": (400, 225), "feature": (800, 450)}
+
+
+@lru_cache(maxsize=FILL_URL_CACHE_SIZE)
+def _fill_url(storage, name, width, height):
+    """Return the fill URL of a stored file; memoised per process."""
+    base_url = storage.url(name)
+    if not base_url:
+        logger.warning("cloudinary_fill: Empty URL for image %s", name)
+        return ""
+    if "/upload/" not in base_url and _has_local_derivative(
+        name, width, height
+    ):
+        try:
+            return derivative_url(storage, name, width, height)
+        except OSError as exc:
+            logger.warning("Image %s has no derivatives: %s", name, exc)
+    return _transform(base_url, width, height)
+
+
+def _has_local_derivative(name, width, height):
+    """Return True when a local upload is served as a card derivative."""
+    return (
+        derivatives_enabled()
+        and name.startswith(SOURCE_PREFIX)
+        and (width, height) in CARD_IMAGE_SIZES
+    )
+
+
+def _transform(base_url, width, height):
+    """Insert the fill transformation into a Cloudinary URL."""
+    # Force HTTPS for mixed content prevention
+    if base_url.startswith("http://"):
+        base_url = base_url.replace("http://", "https://", 1)
+
+    if "/upload/" not in base_url:
+        # Not a Cloudinary URL: serve the original.
+        return base_url
+
+    head, _, tail = base_url.partition("/upload/")
+    transformations = f"c_fill,g_auto,w_{width},h_{height},q_auto,f_auto"
+    return f"{head}/upload/{transformations}/{tail}"
+
+
+def build_cloudinary_fill_url(image, width, height):
+    """Build a fill-cropped Cloudinary URL with error handling."""
+    if not image:
+        return ""
+
+    try:
+        name = getattr(image, "name", None)
+        storage = getattr(image, "storage", None)
+        if name and storage is not None:
+            return _fill_url(storage, name, int(width), int(height))
+        return _transform(str(image), width, height)
+    except Exception as exc:
+        logger.error("cloudinary_fill error: %s", exc, exc_info=True)
+        # Return empty string to trigger {% else %} block in template
+        return ""
+
+
+def build_fill_srcset(image, sizes):
+    """Return a srcset string for (width, height) fill sizes."""
+    srcset_parts = []
+    for width, height in sizes:
+        url = build_cloudinary_fill_url(image, width, height)
+        if url:
+            srcset_parts.append(f"{url} {width}w")
+    return ", ".join(srcset_parts)
+
+
+def image_backend(image):
+    """Return a key for the storage and derivative setup URLs come from.
+
+    Stored URLs built under another backend are stale.
+    """
+    backend = image.storage.__class__.__name__
+    return f"{backend}+derivatives" if derivatives_enabled() else backend
+
+
+def card_image_urls(image):
+    """Return the card URLs and srcset stored on a product."""
+    if not image:
+        return {}
+    urls = {
+        key: build_cloudinary_fill_url(image, width, height)
+        for key, (width, height) in CARD_IMAGE_URLS.items()
+    }
+    urls["srcset"] = build_fill_srcset(image, CARD_IMAGE_SIZES)
+    urls["backend"] = image_backend(image)
+    return urls
+
+
+def current_image_urls(image, stored):
+    """Return stored card URLs, rebuilt if their backend has changed."""
+    if not image:
+        return {}
+    if stored and stored.get("backend") == image_backend(image):
+        return stored
+    return card_image_urls(image)
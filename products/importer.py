@@ -0,0 +1,253 @@
+"""Bulk catalog import for products and categories.
+
+Rows are validated in batches, upserted on slug with one INSERT ... ON
+CONFLICT per batch, and the deal and featured flags are resynced once after
+the last batch. Product.save() is never called, so nothing runs per row.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models import (
+    Category,
+    DealBanner,
+    Product,
+    replace_product_sections,
+    sync_banner_featured_to_products,
+    sync_categories_featured_to_products,
+    sync_products_deal_status,
+)
+
+REQUIRED_COLUMNS = ("title", "tagline", "description", "content", "price")
+
+OPTIONAL_COLUMNS = (
+    "slug",
+    "image_alt",
+    "is_active",
+    "is_removed",
+    "is_featured",
+)
+
+IMPORT_BATCH_SIZE = 1000
+
+Row = tuple[int, dict[str, Any]]
+
+
+def read_catalog_rows(
+    path: str | Path, fmt: str | None = None
+) -> Iterator[Row]:
+    """Yield (line number, row) pairs from a CSV or JSONL file."""
+    path = Path(path)
+    fmt = fmt or path.suffix.lstrip(".").lower()
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported catalog format: {fmt}")
+
+    with path.open(encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(handle, start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+
+
+def _category_name(row: dict[str, Any]) -> str:
+    """Return the stripped category name of a row."""
+    return str(row.get("category") or "").strip()
+
+
+def _ensure_categories(names: set[str]) -> dict[str, int]:
+    """Create missing categories in bulk and return name to pk."""
+    if not names:
+        return {}
+
+    existing = dict(
+        Category.objects.filter(name__in=names).values_list("name", "pk")
+    )
+    missing = names - existing.keys()
+    if missing:
+        Category.objects.bulk_create(
+            [Category(name=name, slug=slugify(name)) for name in missing],
+            ignore_conflicts=True,
+        )
+        existing = dict(
+            Category.objects.filter(name__in=names).values_list("name", "pk")
+        )
+    return existing
+
+
+def _build_product(
+    row: dict[str, Any], category_pks: dict[str, int]
+) -> Product:
+    """Return an unsaved, validated product for an import row."""
+    missing = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+    if missing:
+        raise ValidationError(f"Missing column(s): {', '.join(missing)}.")
+
+    fields = {
+        column: row[column]
+        for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+        if row.get(column) not in (None, "")
+    }
+    fields["slug"] = slugify(fields.get("slug") or fields["title"])
+    product = Product(**fields)
+
+    category_name = _category_name(row)
+    if category_name:
+        if category_name not in category_pks:
+            raise ValidationError(
+                f"Category '{category_name}' clashes with an existing slug."
+            )
+        product.category_id = category_pks[category_name]
+
+    # The category is resolved above; validating the FK would query per row.
+    product.full_clean(
+        exclude=["category"],
+        validate_unique=False,
+        validate_constraints=False,
+    )
+    # Same rules Product.save() applies.
+    if product.is_removed:
+        product.is_active = False
+    product.render_content()
+    return product
+
+
+def _error_text(exc: ValidationError) -> str:
+    """Flatten a validation error into one line."""
+    if hasattr(exc, "error_dict"):
+        return "; ".join(
+            f"{field}: {' '.join(messages)}"
+            for field, messages in exc.message_dict.items()
+        )
+    return " ".join(exc.messages)
+
+
+def _import_batch(
+    batch: Iterable[Row],
+    summary: dict[str, Any],
+) -> tuple[list[int], set[int]]:
+    """Validate and upsert one batch; return touched product/category pks."""
+    batch = list(batch)
+    category_pks = _ensure_categories(
+        {_category_name(row) for _, row in batch} - {""}
+    )
+
+    products: dict[str, Product] = {}
+    columns: set[str] = set()
+    for line_number, row in batch:
+        try:
+            product = _build_product(row, category_pks)
+        except ValidationError as exc:
+            summary["errors"].append((line_number, _error_text(exc)))
+            continue
+        # A slug repeated within the batch keeps its last row.
+        products[product.slug] = product
+        columns.update(row)
+
+    summary["imported"] += len(products)
+    if not products:
+        return [], set()
+
+    # Columns missing from the file keep their stored values.
+    update_fields = [
+        column
+        for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS + ("category",)
+        if column in columns and column != "slug"
+    ]
+    if "is_removed" in update_fields and "is_active" not in update_fields:
+        update_fields.append("is_active")
+    update_fields += ["content_html", "content_toc", "section_count"]
+    update_fields.append("updated_at")
+
+    Product.objects.bulk_create(
+        list(products.values()),
+        update_conflicts=True,
+        unique_fields=["slug"],
+        update_fields=update_fields,
+    )
+
+    touched = list(
+        Product.objects.filter(slug__in=list(products)).values_list(
+            "pk", "slug", "category_id"
+        )
+    )
+    # Rows updated on conflict come back without a pk.
+    for pk, slug, _ in touched:
+        products[slug].pk = pk
+    replace_product_sections(products.values())
+    return (
+        [pk for pk, _, _ in touched],
+        {category_pk for _, _, category_pk in touched if category_pk},
+    )
+
+
+def resync_imported_products(
+    product_pks: list[int],
+    category_pks: set[int],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> None:
+    """Resync deal and banner-driven featured flags after an import."""
+    featured_category_pks = set(
+        DealBanner.objects.filter(
+            category_id__in=category_pks,
+            is_active=True,
+            is_featured=True,
+        ).values_list("category_id", flat=True)
+    )
+    sync_categories_featured_to_products(featured_category_pks, True)
+
+    for chunk in batched(product_pks, batch_size):
+        sync_banner_featured_to_products(chunk)
+        sync_products_deal_status(product_pks=chunk)
+
+
+def import_catalog(
+    rows: Iterable[Row],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Import catalog rows and return a summary.
+
+    The summary holds the rows read and imported, the invalid rows as
+    (line number, message) pairs and the elapsed seconds. A dry run does
+    the full import and rolls it back.
+    """
+    started = time.perf_counter()
+    summary: dict[str, Any] = {"rows": 0, "imported": 0, "errors": []}
+    product_pks: list[int] = []
+    category_pks: set[int] = set()
+
+    with transaction.atomic():
+        for batch in batched(rows, batch_size):
+            summary["rows"] += len(batch)
+            batch_product_pks, batch_category_pks = _import_batch(
+                batch, summary
+            )
+            product_pks.extend(batch_product_pks)
+            category_pks.update(batch_category_pks)
+
+        if product_pks:
+            resync_imported_products(
+                product_pks, category_pks, batch_size=batch_size
+            )
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    summary["seconds"] = time.perf_counter() - started
+    return summary
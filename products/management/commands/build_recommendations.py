@@ -0,0 +1,65 @@
+"""Management command to build "customers also unlocked" recommendations."""
+
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from products.recommendations import (
+    RECOMMENDATIONS_PER_PRODUCT,
+    rebuild_recommendations,
+    refresh_recommendations,
+)
+
+
+def _parse_since(value):
+    """Return an aware datetime from an ISO date or datetime string."""
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Invalid --since value: {value!r}")
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    """Store each product's top co-purchased neighbours."""
+
+    help = "Build product recommendations from access entitlements"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--since",
+            help=(
+                "Only refresh products bought by users with entitlements "
+                "granted since this ISO date or datetime"
+            ),
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=RECOMMENDATIONS_PER_PRODUCT,
+            help=(
+                "Neighbours kept per product "
+                f"(default: {RECOMMENDATIONS_PER_PRODUCT})"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Rebuild every row, or refresh the products touched since."""
+        if options["top"] < 1:
+            raise CommandError("--top must be at least 1.")
+
+        if options["since"]:
+            since = _parse_since(options["since"])
+            refreshed = refresh_recommendations(since, top_k=options["top"])
+            message = f"Recommendations refreshed for {refreshed} product(s)."
+        else:
+            stored = rebuild_recommendations(top_k=options["top"])
+            message = f"{stored} recommendation(s) stored."
+        self.stdout.write(self.style.SUCCESS(message))
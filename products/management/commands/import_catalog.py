@@ -0,0 +1,69 @@
+"""Management command to bulk import products from CSV or JSONL."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importer import (
+    IMPORT_BATCH_SIZE,
+    import_catalog,
+    read_catalog_rows,
+)
+
+# Invalid rows listed in the output before the rest are summarised.
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    """Upsert catalog entries keyed on slug, creating categories as needed."""
+
+    help = "Bulk import products and categories from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument("path", help="CSV or JSONL file to import")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help=f"Rows per upsert batch (default: {IMPORT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and import, then roll everything back",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        try:
+            rows = read_catalog_rows(options["path"], options["format"])
+            summary = import_catalog(
+                rows,
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not import catalog: {exc}") from exc
+
+        errors = summary["errors"]
+        for line_number, message in errors[:MAX_REPORTED_ERRORS]:
+            self.stderr.write(f"  Line {line_number}: {message}")
+        if len(errors) > MAX_REPORTED_ERRORS:
+            self.stderr.write(
+                f"  ... and {len(errors) - MAX_REPORTED_ERRORS} more."
+            )
+
+        seconds = summary["seconds"]
+        rate = summary["rows"] / seconds if seconds else 0
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {summary['imported']} of {summary['rows']} row(s) "
+                f"in {seconds:.2f}s ({rate:,.0f} rows/s), "
+                f"{len(errors)} invalid."
+            )
+        )
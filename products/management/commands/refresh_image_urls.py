@@ -0,0 +1,52 @@
+"""Management command to rebuild stored card image URLs."""
+
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+
+from products.images import current_image_urls
+from products.models import Product
+
+REFRESH_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Rebuild image_urls after the storage or derivative setup changes."""
+
+    help = (
+        "Rebuild stored card image URLs, e.g. after setting CLOUDINARY_URL "
+        "or IMAGE_DERIVATIVES_ENABLED"
+    )
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REFRESH_BATCH_SIZE,
+            help=f"Rows per UPDATE (default: {REFRESH_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        """Store fresh URLs for products whose stored ones are stale."""
+        batch_size = options["batch_size"]
+        products = Product.objects.only("pk", "image", "image_urls").order_by(
+            "pk"
+        )
+        refreshed = 0
+        for chunk in batched(
+            products.iterator(chunk_size=batch_size), batch_size
+        ):
+            stale = []
+            for product in chunk:
+                urls = current_image_urls(product.image, product.image_urls)
+                if urls != product.image_urls:
+                    product.image_urls = urls
+                    stale.append(product)
+            Product.objects.bulk_update(stale, ["image_urls"])
+            refreshed += len(stale)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed image URLs of {refreshed} product(s)."
+            )
+        )
@@ -0,0 +1,43 @@
+"""Management command to re-render stored archive reader HTML."""
+
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+
+from products.models import Product, replace_product_sections
+
+RENDER_BATCH_SIZE = 200
+
+
+class Command(BaseCommand):
+    """Rebuild the reader HTML, contents and sections after changes."""
+
+    help = "Re-render the stored reader HTML of every product"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RENDER_BATCH_SIZE,
+            help=f"Products written per UPDATE (default: {RENDER_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        """Render each product's content and store it in batches."""
+        batch_size = options["batch_size"]
+        products = Product.objects.only("pk", "content").order_by("pk")
+        rendered = 0
+        for chunk in batched(
+            products.iterator(chunk_size=batch_size), batch_size
+        ):
+            for product in chunk:
+                product.render_content()
+            Product.objects.bulk_update(
+                chunk, ["content_html", "content_toc", "section_count"]
+            )
+            replace_product_sections(chunk)
+            rendered += len(chunk)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rendered content for {rendered} product(s).")
+        )
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0014_product_is_removed"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dealbanner",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-is_featured", "order", "-created_at"],
+                name="dealbanner_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_removed", False)),
+                fields=["-created_at"],
+                name="product_listing_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True),
+                    ("is_featured", True),
+                    ("is_removed", False),
+                ),
+                fields=["-created_at"],
+                name="product_featured_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True),
+                    ("is_deal", True),
+                    ("is_removed", False),
+                ),
+                fields=["-created_at"],
+                name="product_deal_idx",
+            ),
+        ),
+    ]
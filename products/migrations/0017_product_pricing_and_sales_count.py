@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0016_product_review_aggregates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="discount_percent",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="effective_price",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=6
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="sales_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_removed", False)),
+                fields=["effective_price", "-created_at"],
+                name="product_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_removed", False)),
+                fields=["-discount_percent", "-created_at"],
+                name="product_discount_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_removed", False)),
+                fields=["-sales_count", "-created_at"],
+                name="product_popular_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_product_pricing(apps, schema_editor):
+    """Store each product's banner discount and discounted price."""
+    Product = apps.get_model("products", "Product")
+    DealBanner = apps.get_model("products", "DealBanner")
+
+    ordering = ["-is_featured", "order", "-created_at"]
+    active_banners = DealBanner.objects.filter(is_active=True).order_by(
+        *ordering
+    )
+    products = Product.objects.annotate(
+        product_banner_discount=Subquery(
+            active_banners.filter(product=OuterRef("pk")).values(
+                "discount_percentage"
+            )[:1]
+        ),
+        category_banner_discount=Subquery(
+            active_banners.filter(category=OuterRef("category")).values(
+                "discount_percentage"
+            )[:1]
+        ),
+    )
+
+    changed = []
+    for product in products.iterator():
+        discount = 0
+        if product.is_deal:
+            for banner_discount in (
+                product.product_banner_discount,
+                product.category_banner_discount,
+            ):
+                if banner_discount and banner_discount > 0:
+                    discount = int(banner_discount)
+                    break
+        price = product.price
+        if discount:
+            price = (
+                price - price * Decimal(discount) / Decimal(100)
+            ).quantize(Decimal("0.01"))
+        product.discount_percent = discount
+        product.effective_price = price
+        changed.append(product)
+
+    Product.objects.bulk_update(
+        changed, ["discount_percent", "effective_price"], batch_size=500
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    """The columns are dropped by the previous migration on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0017_product_pricing_and_sales_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_product_pricing, reverse_code=noop_reverse
+        ),
+    ]
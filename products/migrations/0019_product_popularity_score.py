@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-19 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0018_backfill_product_pricing"),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name="product",
+            new_name="product_sales_idx",
+            old_name="product_popular_idx",
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="popularity_score",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_removed", False)),
+                fields=["-popularity_score", "-created_at"],
+                name="product_popularity_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.2 on 2026-10-19 01:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0019_product_popularity_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductRecommendation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("co_purchases", models.PositiveIntegerField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommendations",
+                        to="products.product",
+                    ),
+                ),
+                (
+                    "recommended",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["product", "-score"],
+                "indexes": [
+                    models.Index(
+                        fields=["product", "-score"],
+                        name="recommendation_product_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("product", "recommended"),
+                        name="unique_product_recommendation",
+                    )
+                ],
+            },
+        ),
+    ]
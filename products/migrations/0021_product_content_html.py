@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0020_productrecommendation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="content_toc",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
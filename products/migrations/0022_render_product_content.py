@@ -0,0 +1,36 @@
+from itertools import batched
+
+from django.db import migrations
+
+from products.content import render_content
+
+
+def render_existing_content(apps, schema_editor):
+    """Render the reader HTML of every existing product."""
+    Product = apps.get_model("products", "Product")
+
+    products = Product.objects.only("pk", "content").order_by("pk")
+    for chunk in batched(products.iterator(chunk_size=200), 200):
+        for product in chunk:
+            rendered = render_content(product.content)
+            product.content_html = rendered.html
+            product.content_toc = rendered.toc
+        Product.objects.bulk_update(chunk, ["content_html", "content_toc"])
+
+
+def noop_reverse(apps, schema_editor):
+    """The columns are dropped by the previous migration on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0021_product_content_html"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            render_existing_content, reverse_code=noop_reverse
+        ),
+    ]
@@ -0,0 +1,43 @@
+from itertools import batched
+
+from django.db import migrations
+
+from products.content import render_content
+
+
+def split_existing_content(apps, schema_editor):
+    """Store the sections and section-aware contents of every product."""
+    Product = apps.get_model("products", "Product")
+    ProductSection = apps.get_model("products", "ProductSection")
+
+    products = Product.objects.only("pk", "content").order_by("pk")
+    for chunk in batched(products.iterator(chunk_size=200), 200):
+        sections = []
+        for product in chunk:
+            rendered = render_content(product.content)
+            product.content_toc = rendered.toc
+            product.section_count = len(rendered.sections)
+            sections += [
+                ProductSection(product=product, position=position, **section)
+                for position, section in enumerate(rendered.sections)
+            ]
+        Product.objects.bulk_update(chunk, ["content_toc", "section_count"])
+        ProductSection.objects.bulk_create(sections, batch_size=500)
+
+
+def remove_sections(apps, schema_editor):
+    """Clear the stored sections."""
+    apps.get_model("products", "ProductSection").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0023_product_sections_reading_progress"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            split_existing_content, reverse_code=remove_sections
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0024_split_product_sections"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="image_urls",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
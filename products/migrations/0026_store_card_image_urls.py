@@ -0,0 +1,37 @@
+from itertools import batched
+
+from django.db import migrations
+
+from products.images import card_image_urls
+
+
+def store_card_image_urls(apps, schema_editor):
+    """Build the card image URLs of every product with an image."""
+    Product = apps.get_model("products", "Product")
+
+    products = (
+        Product.objects.exclude(image="")
+        .exclude(image__isnull=True)
+        .only("pk", "image")
+        .order_by("pk")
+    )
+    for chunk in batched(products.iterator(chunk_size=500), 500):
+        for product in chunk:
+            product.image_urls = card_image_urls(product.image)
+        Product.objects.bulk_update(chunk, ["image_urls"])
+
+
+def noop_reverse(apps, schema_editor):
+    """The column is dropped by the previous migration on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0025_product_image_urls"),
+    ]
+
+    operations = [
+        migrations.RunPython(store_card_image_urls, reverse_code=noop_reverse),
+    ]
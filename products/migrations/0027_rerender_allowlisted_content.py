@@ -0,0 +1,45 @@
+from itertools import batched
+
+from django.db import migrations
+
+from products.content import render_content
+
+
+def rerender_content(apps, schema_editor):
+    """Re-render stored reader HTML with the allow-list sanitiser."""
+    Product = apps.get_model("products", "Product")
+    ProductSection = apps.get_model("products", "ProductSection")
+
+    products = Product.objects.only("pk", "content").order_by("pk")
+    for chunk in batched(products.iterator(chunk_size=200), 200):
+        sections = []
+        for product in chunk:
+            rendered = render_content(product.content)
+            product.content_html = rendered.html
+            product.content_toc = rendered.toc
+            product.section_count = len(rendered.sections)
+            sections += [
+                ProductSection(product=product, position=position, **section)
+                for position, section in enumerate(rendered.sections)
+            ]
+        Product.objects.bulk_update(
+            chunk, ["content_html", "content_toc", "section_count"]
+        )
+        ProductSection.objects.filter(product__in=chunk).delete()
+        ProductSection.objects.bulk_create(sections, batch_size=500)
+
+
+def noop_reverse(apps, schema_editor):
+    """The previous rendering is not restored on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0026_store_card_image_urls"),
+    ]
+
+    operations = [
+        migrations.RunPython(rerender_content, reverse_code=noop_reverse),
+    ]
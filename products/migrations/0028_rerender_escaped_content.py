@@ -0,0 +1,24 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# Same re-render as 0027, run again with text escaping and URL fixes.
+rerender_content = import_module(
+    "products.migrations.0027_rerender_allowlisted_content"
+).rerender_content
+
+
+def noop_reverse(apps, schema_editor):
+    """The previous rendering is not restored on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0027_rerender_allowlisted_content"),
+    ]
+
+    operations = [
+        migrations.RunPython(rerender_content, reverse_code=noop_reverse),
+    ]
@@ -2,13 +2,14 @@
 
 from decimal import Decimal
 
+from django.conf import settings
 from django.core.validators import (
     MaxLengthValidator,
     MaxValueValidator,
     MinValueValidator,
 )
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q, Subquery
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
@@ -16,6 +17,10 @@ from django.utils import timezone
 from django.utils.text import slugify
 from django_ckeditor_5.fields import CKEditor5Field
 
+from .content import render_content
+from .derivatives import derivatives_enabled, schedule_derivatives
+from .images import CARD_IMAGE_SIZES, card_image_urls
+
 
 class Category(models.Model):
     """Product category model."""
@@ -40,6 +45,24 @@ class Category(models.Model):
         super().save(*args, **kwargs)
 
 
+# Denormalised Product columns that reviews.services and orders.services
+# maintain with targeted UPDATEs. A full save() leaves them alone.
+SERVICE_MAINTAINED_FIELDS = frozenset(
+    {
+        "review_count",
+        "rating_sum",
+        "rating_avg",
+        "rating_1",
+        "rating_2",
+        "rating_3",
+        "rating_4",
+        "rating_5",
+        "sales_count",
+        "popularity_score",
+    }
+)
+
+
 class Product(models.Model):
     """Archive entry (product) model."""
 
@@ -59,8 +82,14 @@ class Product(models.Model):
         blank=True,
         related_name="products",
     )
+    # Reader HTML and table of contents, rendered from content on save.
+    content_html = models.TextField(blank=True, editable=False)
+    content_toc = models.JSONField(default=list, blank=True, editable=False)
+    section_count = models.PositiveIntegerField(default=0, editable=False)
     price = models.DecimalField(max_digits=6, decimal_places=2)
     image = models.ImageField(upload_to="products/", blank=True, null=True)
+    # Card image URLs and srcset, built from image on save.
+    image_urls = models.JSONField(default=dict, blank=True, editable=False)
     image_alt = models.CharField(
         max_length=255,
         blank=True,
@@ -79,11 +108,87 @@ class Product(models.Model):
         default=False,
         help_text="Deal status (used by filters and UI)",
     )
+    # Review aggregates, maintained by reviews.services.
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False
+    )
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+    # Pricing, maintained by sync_products_deal_status().
+    discount_percent = models.PositiveSmallIntegerField(
+        default=0, editable=False
+    )
+    effective_price = models.DecimalField(
+        max_digits=6, decimal_places=2, default=0, editable=False
+    )
+    # Sales figures, maintained by orders.services.
+    sales_count = models.PositiveIntegerField(default=0, editable=False)
+    popularity_score = models.FloatField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        # Partial indexes: Django renders boolean filters as bare column
+        # tests, which SQLite and PostgreSQL can only match against an
+        # index predicate, not against boolean key columns.
+        indexes = [
+            # Archive listing: public products, newest first.
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_active=True, is_removed=False),
+                name="product_listing_idx",
+            ),
+            # Homepage featured section.
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(
+                    is_active=True, is_removed=False, is_featured=True
+                ),
+                name="product_featured_idx",
+            ),
+            # Deal filters, deals context and banner visibility checks.
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_active=True, is_removed=False, is_deal=True),
+                name="product_deal_idx",
+            ),
+            # Archive sorted by rating.
+            models.Index(
+                fields=["-rating_avg", "-review_count", "-created_at"],
+                condition=Q(is_active=True, is_removed=False),
+                name="product_rating_idx",
+            ),
+            # Archive sorted by price; scanned backwards for high-to-low.
+            models.Index(
+                fields=["effective_price", "-created_at"],
+                condition=Q(is_active=True, is_removed=False),
+                name="product_price_idx",
+            ),
+            # Archive sorted by discount.
+            models.Index(
+                fields=["-discount_percent", "-created_at"],
+                condition=Q(is_active=True, is_removed=False),
+                name="product_discount_idx",
+            ),
+            # Archive sorted by all-time sales.
+            models.Index(
+                fields=["-sales_count", "-created_at"],
+                condition=Q(is_active=True, is_removed=False),
+                name="product_sales_idx",
+            ),
+            # Homepage bestsellers and archive sorted by popularity.
+            models.Index(
+                fields=["-popularity_score", "-created_at"],
+                condition=Q(is_active=True, is_removed=False),
+                name="product_popularity_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -113,6 +218,7 @@ class Product(models.Model):
 
         is_featured_changed = False
         category_changed = False
+        content_changed = is_create
 
         if not is_create and self.pk:
             try:
@@ -126,12 +232,65 @@ class Product(models.Model):
                 )
                 new_category_pk = self.category.pk if self.category else None
                 category_changed = old_category_pk != new_category_pk
+                content_changed = old_product.content != self.content
             except Product.DoesNotExist:
-                pass
+                content_changed = True
+
+        if update_fields_set is None or "content" in update_fields_set:
+            self.render_content()
+            if update_fields_set is not None:
+                kwargs["update_fields"] = [
+                    *kwargs["update_fields"],
+                    "content_html",
+                    "content_toc",
+                    "section_count",
+                ]
+
+        if update_fields_set is None or "price" in update_fields_set:
+            self.effective_price = discounted_price(
+                self.price, self.get_discount_percentage()
+            )
+            if update_fields_set is not None:
+                kwargs["update_fields"] = [
+                    *kwargs["update_fields"],
+                    "effective_price",
+                ]
+
+        if update_fields_set is None and not self._state.adding:
+            # Never write back stale copies of counters kept by UPDATEs.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in SERVICE_MAINTAINED_FIELDS
+            ]
 
         super().save(*args, **kwargs)
 
-        deal_fields = {"category", "category_id", "is_active", "is_removed"}
+        if content_changed:
+            replace_product_sections([self])
+
+        # After super().save(), so a new upload has its final file name.
+        if update_fields_set is None or "image" in update_fields_set:
+            image_urls = card_image_urls(self.image)
+            if image_urls != self.image_urls:
+                self.image_urls = image_urls
+                Product.objects.filter(pk=self.pk).update(
+                    image_urls=image_urls
+                )
+                if self.image and derivatives_enabled():
+                    name = self.image.name
+                    transaction.on_commit(
+                        lambda: schedule_derivatives(name, CARD_IMAGE_SIZES)
+                    )
+
+        deal_fields = {
+            "category",
+            "category_id",
+            "is_active",
+            "is_removed",
+            "price",
+        }
         should_sync_deals = (
             is_create
             or update_fields_set is None
@@ -150,10 +309,30 @@ class Product(models.Model):
         if category_changed and not skip_sync:
             sync_product_featured_from_category_banner(product_pk=self.pk)
 
+    def render_content(self):
+        """Render the content into reader HTML, contents and sections.
+
+        The sections are kept on the instance until
+        replace_product_sections() stores them.
+        """
+        rendered = render_content(self.content)
+        self.content_html = rendered.html
+        self.content_toc = rendered.toc
+        self.section_count = len(rendered.sections)
+        self._rendered_sections = rendered.sections
+
     def get_absolute_url(self):
         """Return the canonical URL for this product."""
         return reverse("product_detail", kwargs={"slug": self.slug})
 
+    @property
+    def rating_histogram(self):
+        """Return (stars, count) pairs from 5 stars down to 1."""
+        return [
+            (stars, getattr(self, f"rating_{stars}"))
+            for stars in range(5, 0, -1)
+        ]
+
     def get_discount_percentage(self):
         """
         Get the discount percentage for this product from active deal banners.
@@ -162,32 +341,19 @@ class Product(models.Model):
         """
         if not self.is_deal:
             return 0
-
-        active_banners = DealBanner.objects.filter(is_active=True)
-
-        product_banner = active_banners.filter(product=self).first()
-        if product_banner and product_banner.discount_percentage > 0:
-            return int(product_banner.discount_percentage)
-
-        if self.category:
-            category_banner = active_banners.filter(
-                category=self.category
-            ).first()
-            if category_banner and category_banner.discount_percentage > 0:
-                return int(category_banner.discount_percentage)
-
-        return 0
+        return self.discount_percent
 
     def get_discounted_price(self):
         """Calculate and return the discounted price."""
-        discount_percentage = self.get_discount_percentage()
-        if discount_percentage > 0:
-            discount_amount = (
-                self.price * Decimal(discount_percentage) / Decimal(100)
-            )
-            discounted_price = self.price - discount_amount
-            return discounted_price.quantize(Decimal("0.01"))
-        return self.price
+        return discounted_price(self.price, self.get_discount_percentage())
+
+
+def discounted_price(price, discount_percentage):
+    """Return price less a whole-number percentage, to the cent."""
+    if discount_percentage > 0:
+        discount_amount = price * Decimal(discount_percentage) / Decimal(100)
+        return (price - discount_amount).quantize(Decimal("0.01"))
+    return price
 
 
 class DealBanner(models.Model):
@@ -251,6 +417,14 @@ class DealBanner(models.Model):
         ordering = ["-is_featured", "order", "-created_at"]
         verbose_name = "Deal Banner"
         verbose_name_plural = "Deal Banners"
+        indexes = [
+            # Active banners in carousel order (see Meta.ordering).
+            models.Index(
+                fields=["-is_featured", "order", "-created_at"],
+                condition=Q(is_active=True),
+                name="dealbanner_active_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title}: {self.message}"
@@ -409,6 +583,196 @@ class DealBanner(models.Model):
         return self.get_effective_destination()[3]
 
 
+class ProductSection(models.Model):
+    """One heading-delimited section of a product's reader HTML."""
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="sections",
+    )
+    position = models.PositiveIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    anchor = models.CharField(max_length=255, blank=True)
+    html = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["product", "position"]
+        constraints = [
+            # Also the index behind the per-section lookup.
+            models.UniqueConstraint(
+                fields=["product", "position"],
+                name="unique_product_section_position",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.product} §{self.position}"
+
+
+class ReadingProgress(models.Model):
+    """The furthest section of an entry a reader has reached."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="reading_progress",
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="reading_progress",
+    )
+    section = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "product"],
+                name="unique_reading_progress",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user} read {self.product} to §{self.section}"
+
+    def percent(self, section_count):
+        """Return the share of sections reached, as a whole percentage."""
+        if not section_count:
+            return 0
+        return min(100, round((self.section + 1) * 100 / section_count))
+
+
+def replace_product_sections(products):
+    """Store the sections rendered by Product.render_content().
+
+    Products that were not rendered in this process are skipped.
+    """
+    rendered = [
+        product
+        for product in products
+        if getattr(product, "_rendered_sections", None) is not None
+    ]
+    if not rendered:
+        return
+    ProductSection.objects.filter(
+        product_id__in=[product.pk for product in rendered]
+    ).delete()
+    ProductSection.objects.bulk_create(
+        [
+            ProductSection(product_id=product.pk, position=position, **section)
+            for product in rendered
+            for position, section in enumerate(product._rendered_sections)
+        ],
+        batch_size=500,
+    )
+
+
+class ProductRecommendation(models.Model):
+    """A product often unlocked by the buyers of another product.
+
+    Rows are written by products.recommendations; each product keeps its
+    top neighbours by cosine similarity of their buyer sets.
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="recommendations",
+    )
+    recommended = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    score = models.FloatField()
+    co_purchases = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["product", "-score"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "recommended"],
+                name="unique_product_recommendation",
+            )
+        ]
+        indexes = [
+            # Detail page: one product's neighbours, best first.
+            models.Index(
+                fields=["product", "-score"],
+                name="recommendation_product_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product} -> {self.recommended} ({self.score:.3f})"
+
+
+# Columns rendered by product cards: the archive and home listings, the
+# cart, checkout and recommendations. The editor and reader HTML are left
+# in the database.
+CARD_FIELDS = (
+    "title",
+    "slug",
+    "tagline",
+    "price",
+    "image",
+    "image_alt",
+    "image_urls",
+    "is_active",
+    "is_removed",
+    "is_featured",
+    "is_deal",
+    "discount_percent",
+    "effective_price",
+    "rating_avg",
+    "review_count",
+    "popularity_score",
+    "created_at",
+    "category__name",
+    "category__slug",
+)
+
+# Columns only the reading page needs.
+READER_FIELDS = ("content", "content_html", "content_toc")
+
+
+def card_fields(prefix=""):
+    """Return CARD_FIELDS, prefixed for a lookup through a relation."""
+    return [f"{prefix}{name}" for name in CARD_FIELDS]
+
+
+def only_card_fields(queryset):
+    """Load products with their category and only the card columns."""
+    return queryset.select_related("category").only(*card_fields())
+
+
+def defer_product_bodies(queryset, relation="product"):
+    """Select a related product without its description or reader HTML."""
+    return queryset.select_related(relation).defer(
+        *(f"{relation}__{name}" for name in ("description", *READER_FIELDS))
+    )
+
+
+def with_banner_discounts(queryset):
+    """Annotate products with the discount of their first active banners.
+
+    sync_product_pricing() reads these to store each product's discount.
+    """
+    active_banners = DealBanner.objects.filter(is_active=True)
+    product_banner = active_banners.filter(product=OuterRef("pk"))
+    category_banner = active_banners.filter(category=OuterRef("category"))
+    return queryset.annotate(
+        product_banner_discount=Subquery(
+            product_banner.values("discount_percentage")[:1]
+        ),
+        category_banner_discount=Subquery(
+            category_banner.values("discount_percentage")[:1]
+        ),
+    )
+
+
 def sync_products_deal_status(product_pks=None, category_pks=None):
     """Recalculate deal status for affected products."""
     product_pks = list(product_pks or [])
@@ -419,124 +783,171 @@ def sync_products_deal_status(product_pks=None, category_pks=None):
 
     qs = Product.objects.filter(
         Q(pk__in=product_pks) | Q(category__pk__in=category_pks)
-    ).select_related("category")
+    )
 
     active_banners = DealBanner.objects.filter(is_active=True)
-    banner_product_pks = set(
-        active_banners.filter(product__isnull=False).values_list(
-            "product__pk",
-            flat=True,
-        )
-    )
-    banner_category_pks = set(
-        active_banners.filter(category__isnull=False).values_list(
-            "category__pk",
-            flat=True,
-        )
+    effective = Q(is_active=True, is_removed=False) & (
+        Exists(active_banners.filter(product=OuterRef("pk")))
+        | Exists(active_banners.filter(category=OuterRef("category")))
     )
 
+    # Two set-based updates, so bulk admin actions stay cheap.
     now = timezone.now()
-    true_pks = []
-    false_pks = []
-
-    for product in qs:
-        from_product_banner = product.pk in banner_product_pks
+    qs.filter(effective, is_deal=False).update(is_deal=True, updated_at=now)
+    qs.filter(is_deal=True).exclude(effective).update(
+        is_deal=False,
+        updated_at=now,
+    )
+    sync_product_pricing(qs)
 
-        category_pk = (
-            product.category.pk if product.category is not None else None
-        )
-        from_category_banner = category_pk in banner_category_pks
 
-        effective = (
-            product.is_active
-            and not product.is_removed
-            and (from_product_banner or from_category_banner)
-        )
+def sync_product_pricing(queryset):
+    """Store the banner discount and discounted price of products.
 
-        if product.is_deal and not effective:
-            false_pks.append(product.pk)
-        elif not product.is_deal and effective:
-            true_pks.append(product.pk)
+    A deal takes its product banner's discount, else its category banner's;
+    other products sell at list price. Only changed rows are written.
+    """
+    changed = []
+    rows = with_banner_discounts(queryset).only(
+        "pk", "price", "is_deal", "discount_percent", "effective_price"
+    )
+    for product in rows:
+        discount = 0
+        if product.is_deal:
+            for banner_discount in (
+                product.product_banner_discount,
+                product.category_banner_discount,
+            ):
+                if banner_discount and banner_discount > 0:
+                    discount = int(banner_discount)
+                    break
+        price = discounted_price(product.price, discount)
+        if (product.discount_percent, product.effective_price) != (
+            discount,
+            price,
+        ):
+            product.discount_percent = discount
+            product.effective_price = price
+            changed.append(product)
 
-    if true_pks:
-        Product.objects.filter(pk__in=true_pks).update(
-            is_deal=True,
-            updated_at=now,
-        )
-    if false_pks:
-        Product.objects.filter(pk__in=false_pks).update(
-            is_deal=False,
-            updated_at=now,
-        )
+    Product.objects.bulk_update(
+        changed, ["discount_percent", "effective_price"], batch_size=500
+    )
+    return len(changed)
 
 
 def sync_banner_featured_to_product(product_pk):
     """Sync featured status from banners to product."""
-    try:
-        product = Product.objects.get(pk=product_pk)
-    except Product.DoesNotExist:
-        return
-
-    if product.is_removed:
-        if product.is_featured:
-            product.is_featured = False
-            product.save(
-                update_fields=["is_featured", "updated_at"],
-                _skip_featured_sync=True,
-            )
-        return
+    sync_banner_featured_to_products([product_pk])
 
-    has_featured_banner = DealBanner.objects.filter(
-        product=product,
-        is_active=True,
-        is_featured=True,
-    ).exists()
 
-    if has_featured_banner and not product.is_featured:
-        product.is_featured = True
-        product.save(
-            update_fields=["is_featured", "updated_at"],
-            _skip_featured_sync=True,
-        )
-    elif not has_featured_banner and product.is_featured:
-        has_any_banner = DealBanner.objects.filter(
-            product=product,
-            is_active=True,
-        ).exists()
+def sync_banner_featured_to_products(product_pks):
+    """Sync featured status from product banners to many products."""
+    products = Product.objects.filter(pk__in=list(product_pks))
+    banners = DealBanner.objects.filter(product=OuterRef("pk"), is_active=True)
+    has_banner = Exists(banners)
+    has_featured_banner = Exists(banners.filter(is_featured=True))
+    now = timezone.now()
 
-        if has_any_banner:
-            product.is_featured = False
-            product.save(
-                update_fields=["is_featured", "updated_at"],
-                _skip_featured_sync=True,
-            )
+    products.filter(is_removed=True, is_featured=True).update(
+        is_featured=False,
+        updated_at=now,
+    )
+    products.filter(
+        has_featured_banner,
+        is_removed=False,
+        is_featured=False,
+    ).update(is_featured=True, updated_at=now)
+    products.filter(
+        ~has_featured_banner,
+        has_banner,
+        is_removed=False,
+        is_featured=True,
+    ).update(is_featured=False, updated_at=now)
 
 
 def sync_product_featured_to_banners(product_pk, is_featured):
     """Sync featured status from product to its banners."""
-    banners = DealBanner.objects.filter(product_id=product_pk, is_active=True)
+    sync_products_featured_to_banners([product_pk], is_featured)
+
+
+def sync_products_featured_to_banners(product_pks, is_featured):
+    """Sync featured status from many products to their active banners."""
+    DealBanner.objects.filter(
+        product_id__in=list(product_pks),
+        is_active=True,
+    ).exclude(is_featured=is_featured).update(is_featured=is_featured)
+
+
+def set_products_featured(product_pks, is_featured):
+    """Set featured status on products and mirror it on their banners.
 
-    for banner in banners:
-        if banner.is_featured != is_featured:
-            banner.is_featured = is_featured
-            banner.save(_skip_featured_sync=True)
+    Set-based equivalent of saving each product with a new is_featured
+    value. Returns the number of products that changed.
+    """
+    changed_pks = list(
+        Product.objects.filter(pk__in=list(product_pks))
+        .exclude(is_featured=is_featured)
+        .values_list("pk", flat=True)
+    )
+    if not changed_pks:
+        return 0
+
+    Product.objects.filter(pk__in=changed_pks).update(
+        is_featured=is_featured,
+        updated_at=timezone.now(),
+    )
+    sync_products_featured_to_banners(changed_pks, is_featured)
+    return len(changed_pks)
 
 
 def sync_category_banner_featured_to_products(category_pk, is_featured):
     """Sync featured status from category banner to active products."""
-    products = Product.objects.filter(
-        category_id=category_pk,
+    sync_categories_featured_to_products([category_pk], is_featured)
+
+
+def sync_categories_featured_to_products(category_pks, is_featured):
+    """Sync featured status from category banners to active products."""
+    Product.objects.filter(
+        category_id__in=list(category_pks),
         is_active=True,
         is_removed=False,
+    ).exclude(is_featured=is_featured).update(
+        is_featured=is_featured,
+        updated_at=timezone.now(),
     )
 
-    for product in products:
-        if product.is_featured != is_featured:
-            product.is_featured = is_featured
-            product.save(
-                update_fields=["is_featured", "updated_at"],
-                _skip_featured_sync=True,
-            )
+
+def sync_banner_targets(product_pks=None, category_pks=None):
+    """Resync featured and deal status after bulk banner updates.
+
+    Category products follow whether any active featured banner still
+    targets their category.
+    """
+    product_pks = list(dict.fromkeys(product_pks or []))
+    category_pks = list(dict.fromkeys(category_pks or []))
+
+    if product_pks:
+        sync_banner_featured_to_products(product_pks)
+
+    if category_pks:
+        featured_category_pks = set(
+            DealBanner.objects.filter(
+                category_id__in=category_pks,
+                is_active=True,
+                is_featured=True,
+            ).values_list("category_id", flat=True)
+        )
+        sync_categories_featured_to_products(featured_category_pks, True)
+        sync_categories_featured_to_products(
+            [pk for pk in category_pks if pk not in featured_category_pks],
+            False,
+        )
+
+    sync_products_deal_status(
+        product_pks=product_pks,
+        category_pks=category_pks,
+    )
 
 
 def sync_product_featured_from_category_banner(product_pk):
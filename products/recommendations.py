@@ -0,0 +1,165 @@
+"""Item-to-item "customers also unlocked" recommendations.
+
+Two products are similar when the same users hold entitlements to both.
+The similarity of products i and j is the cosine of their buyer sets,
+co(i, j) / sqrt(n_i * n_j), computed from a sparse co-occurrence count so
+only pairs that were actually bought together are visited. The top
+neighbours of each product are stored in ProductRecommendation and read
+on the detail page with one indexed lookup.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from heapq import nlargest
+
+from django.db import transaction
+from django.db.models import Count
+
+from orders.models import AccessEntitlement
+
+from .models import Product, ProductRecommendation, card_fields
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS_PER_PRODUCT = 6
+
+
+def _baskets(entitlements) -> dict[int, set[int]]:
+    """Return the products owned by each user in the entitlements."""
+    baskets: dict[int, set[int]] = defaultdict(set)
+    for user_pk, product_pk in (
+        entitlements.order_by().values_list("user_id", "product_id").iterator()
+    ):
+        baskets[user_pk].add(product_pk)
+    return baskets
+
+
+def _neighbours(
+    product_pks: set[int] | None,
+    baskets: dict[int, set[int]],
+    top_k: int,
+) -> dict[int, list[tuple[int, float, int]]]:
+    """Return the top (product, score, co-purchases) for each product.
+
+    Only rows of product_pks are built (default: every product).
+    """
+    co_purchases: dict[int, Counter] = defaultdict(Counter)
+    for basket in baskets.values():
+        for product_pk in basket:
+            if product_pks is not None and product_pk not in product_pks:
+                continue
+            row = co_purchases[product_pk]
+            for other_pk in basket:
+                if other_pk != product_pk:
+                    row[other_pk] += 1
+
+    involved = set(co_purchases)
+    for row in co_purchases.values():
+        involved.update(row)
+    buyers = dict(
+        AccessEntitlement.objects.filter(product_id__in=involved)
+        .order_by()
+        .values("product_id")
+        .annotate(total=Count("pk"))
+        .values_list("product_id", "total")
+    )
+
+    neighbours = {}
+    for product_pk, row in co_purchases.items():
+        scored = (
+            (
+                other_pk,
+                count / math.sqrt(buyers[product_pk] * buyers[other_pk]),
+                count,
+            )
+            for other_pk, count in row.items()
+        )
+        neighbours[product_pk] = nlargest(
+            top_k, scored, key=lambda item: (item[1], item[2], -item[0])
+        )
+    return neighbours
+
+
+def _store(neighbours, product_pks: Iterable[int] | None) -> int:
+    """Replace the stored rows of the given products (default: all)."""
+    rows = [
+        ProductRecommendation(
+            product_id=product_pk,
+            recommended_id=other_pk,
+            score=score,
+            co_purchases=count,
+        )
+        for product_pk, ranked in neighbours.items()
+        for other_pk, score, count in ranked
+    ]
+    with transaction.atomic():
+        stale = ProductRecommendation.objects.all()
+        if product_pks is not None:
+            stale = stale.filter(product_id__in=list(product_pks))
+        stale.delete()
+        ProductRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild_recommendations(top_k: int = RECOMMENDATIONS_PER_PRODUCT) -> int:
+    """Recompute every product's neighbours and return the rows stored."""
+    baskets = _baskets(AccessEntitlement.objects.all())
+    stored = _store(_neighbours(None, baskets, top_k), None)
+    logger.info("Rebuilt %s product recommendation(s)", stored)
+    return stored
+
+
+def refresh_recommendations(
+    since: datetime,
+    top_k: int = RECOMMENDATIONS_PER_PRODUCT,
+) -> int:
+    """Recompute the neighbours of products touched since a point in time.
+
+    A product is touched when a user granted an entitlement since then
+    owns it. Only the buyers of touched products are read, so the cost
+    follows the new sales rather than the whole entitlement table. Rows of
+    untouched products keep their scores until the next full rebuild.
+    Return the number of products refreshed.
+    """
+    new_buyers = AccessEntitlement.objects.filter(
+        granted_at__gte=since
+    ).values("user_id")
+    touched = set(
+        AccessEntitlement.objects.filter(user_id__in=new_buyers)
+        .order_by()
+        .values_list("product_id", flat=True)
+        .distinct()
+    )
+    if not touched:
+        return 0
+
+    baskets = _baskets(
+        AccessEntitlement.objects.filter(
+            user_id__in=AccessEntitlement.objects.filter(
+                product_id__in=touched
+            ).values("user_id")
+        )
+    )
+    _store(_neighbours(touched, baskets, top_k), touched)
+    logger.info("Refreshed recommendations for %s product(s)", len(touched))
+    return len(touched)
+
+
+def recommendations_for(product: Product, limit: int = 4):
+    """Return the public products recommended for a product, best first."""
+    return [
+        recommendation.recommended
+        for recommendation in ProductRecommendation.objects.filter(
+            product=product,
+            recommended__is_active=True,
+            recommended__is_removed=False,
+        )
+        .select_related("recommended__category")
+        .only("recommended", *card_fields("recommended__"))
+        .order_by("-score")[:limit]
+    ]
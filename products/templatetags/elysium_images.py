@@ -4,52 +4,16 @@ import logging
 
 from django import template
 
+from products.images import (
+    build_cloudinary_fill_url,
+    build_fill_srcset,
+    current_image_urls,
+)
+
 register = template.Library()
 logger = logging.getLogger(__name__)
 
 
-def build_cloudinary_fill_url(image, width, height):
-    """Build a fill-cropped Cloudinary URL with error handling."""
-    if not image:
-        logger.debug("cloudinary_fill: image is None or empty")
-        return ""
-
-    try:
-        # Get URL from CloudinaryField
-        base_url = str(image.url) if hasattr(image, "url") else str(image)
-
-        if not base_url:
-            logger.warning("cloudinary_fill: Empty URL for image %s", image)
-            return ""
-
-        # Force HTTPS for mixed content prevention
-        if base_url.startswith("http://"):
-            base_url = base_url.replace("http://", "https://", 1)
-            logger.debug("cloudinary_fill: Converted HTTP to HTTPS")
-
-        # Check if it's a Cloudinary URL
-        if "/upload/" not in base_url:
-            logger.warning(
-                "cloudinary_fill: URL missing /upload/: %s",
-                base_url[:100],
-            )
-            # Return original URL as fallback
-            return base_url
-
-        # Build transformed URL
-        parts = base_url.split("/upload/")
-        transformations = f"c_fill,g_auto,w_{width},h_{height},q_auto,f_auto"
-        transformed_url = f"{parts[0]}/upload/{transformations}/{parts[1]}"
-
-        logger.debug("cloudinary_fill: Generated %s", transformed_url[:100])
-        return transformed_url
-
-    except Exception as exc:
-        logger.error("cloudinary_fill error: %s", exc, exc_info=True)
-        # Return empty string to trigger {% else %} block in template
-        return ""
-
-
 @register.simple_tag
 def cloudinary_fill(image, width, height):
     """Return a fill-cropped Cloudinary URL."""
@@ -69,19 +33,17 @@ def cloudinary_fill_srcset(image, *dimensions):
         )
         return ""
 
-    srcset_parts = []
-    for i in range(0, len(dims), 2):
-        width = dims[i]
-        height = dims[i + 1]
-        url = build_cloudinary_fill_url(image, width, height)
-        if url:  # Only add if URL generated successfully
-            srcset_parts.append(f"{url} {width}w")
+    return build_fill_srcset(image, zip(dims[::2], dims[1::2]))
+
+
+@register.simple_tag
+def card_images(product):
+    """Return a product's stored card image URLs.
 
-    result = ", ".join(srcset_parts)
-    logger.debug(
-        "cloudinary_fill_srcset: Generated %s URLs", len(srcset_parts)
-    )
-    return result
+    URLs missing or stored under another image backend are built here
+    until refresh_image_urls stores them again.
+    """
+    return current_image_urls(product.image, product.image_urls)
 
 
 @register.filter
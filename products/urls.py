@@ -2,13 +2,31 @@
 
 from django.urls import path
 
-from reviews.views import create_review, delete_review, edit_review
+from reviews.views import (
+    create_review,
+    delete_review,
+    edit_review,
+    review_list,
+)
 
-from .views import ArchiveReadView, ProductDetailView, ProductListView
+from .views import (
+    ArchiveReadView,
+    ProductDetailView,
+    ProductListView,
+    archive_progress,
+    archive_section,
+    image_derivative,
+)
 
 urlpatterns = [
     path("", ProductListView.as_view(), name="archive"),
+    path(
+        "images/<int:width>x<int:height>/<path:name>",
+        image_derivative,
+        name="image_derivative",
+    ),
     path("<slug:slug>/review/", create_review, name="create_review"),
+    path("<slug:slug>/reviews/", review_list, name="review_list"),
     path(
         "<slug:slug>/review/<int:review_id>/edit/",
         edit_review,
@@ -20,5 +38,15 @@ urlpatterns = [
         name="delete_review",
     ),
     path("<slug:slug>/read/", ArchiveReadView.as_view(), name="archive_read"),
+    path(
+        "<slug:slug>/read/sections/<int:position>/",
+        archive_section,
+        name="archive_section",
+    ),
+    path(
+        "<slug:slug>/read/progress/",
+        archive_progress,
+        name="archive_progress",
+    ),
     path("<slug:slug>/", ProductDetailView.as_view(), name="product_detail"),
 ]
@@ -2,22 +2,70 @@
 
 from __future__ import annotations
 
+from decimal import Decimal, InvalidOperation
 from typing import Any, cast
 
 from allauth.account.utils import has_verified_email
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.core.files.storage import default_storage
 from django.db.models import Q, QuerySet
-from django.http import Http404
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import redirect
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView, ListView
 
-from elysium_archive.helpers import user_has_access
+from elysium_archive.helpers import cached_user_has_access, user_has_access
 from elysium_archive.type_guards import is_authenticated_user
 from reviews.forms import ReviewForm
-
-from .models import Category, Product
+from reviews.pagination import review_page
+
+from .derivatives import (
+    DERIVATIVE_ERRORS,
+    SOURCE_PREFIX,
+    derivatives_enabled,
+    ensure_derivative,
+    negotiate_format,
+)
+from .images import CARD_IMAGE_SIZES
+from .models import (
+    READER_FIELDS,
+    Category,
+    Product,
+    ProductSection,
+    ReadingProgress,
+    only_card_fields,
+)
+from .recommendations import recommendations_for
+
+# Archive sort keys and their orderings; the first is the default. Each
+# ordering matches one of the Product listing indexes.
+ARCHIVE_SORTS = {
+    "newest": ("-created_at",),
+    "price_low": ("effective_price", "-created_at"),
+    "price_high": ("-effective_price", "created_at"),
+    "discount": ("-discount_percent", "-created_at"),
+    "rating": ("-rating_avg", "-review_count", "-created_at"),
+    "popular": ("-popularity_score", "-created_at"),
+    "bestselling": ("-sales_count", "-created_at"),
+}
+
+
+def _archive_sort(request) -> str:
+    """Return the requested archive sort key, falling back to the default."""
+    sort = request.GET.get("sort", "").strip()
+    return sort if sort in ARCHIVE_SORTS else next(iter(ARCHIVE_SORTS))
+
+
+def _price_bound(request, name) -> Decimal | None:
+    """Return a non-negative price from the query string, or None."""
+    try:
+        value = Decimal(request.GET.get(name, "").strip())
+    except InvalidOperation:
+        return None
+    return value if value.is_finite() and value >= 0 else None
 
 
 class ProductListView(ListView):
@@ -29,15 +77,10 @@ class ProductListView(ListView):
     paginate_by = 12
 
     def get_queryset(self) -> QuerySet[Product]:
-        """Return active products, optionally filtered by search, category, or.
-
-        deals.
-        """
-        queryset = (
+        """Filter active products by search, category, deal and price."""
+        queryset = only_card_fields(
             Product.objects.filter(is_active=True, is_removed=False)
-            .select_related("category")
-            .order_by("-created_at")
-        )
+        ).order_by(*ARCHIVE_SORTS[_archive_sort(self.request)])
 
         search_query = self.request.GET.get("q", "").strip()
         category_slug = self.request.GET.get("cat", "").strip()
@@ -48,6 +91,13 @@ class ProductListView(ListView):
         if show_deals:
             queryset = queryset.filter(is_deal=True)
 
+        min_price = _price_bound(self.request, "min_price")
+        max_price = _price_bound(self.request, "max_price")
+        if min_price is not None:
+            queryset = queryset.filter(effective_price__gte=min_price)
+        if max_price is not None:
+            queryset = queryset.filter(effective_price__lte=max_price)
+
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
 
@@ -83,6 +133,9 @@ class ProductListView(ListView):
         context["categories"] = categories
         context["active_category"] = active_category
         context["show_deals"] = show_deals
+        context["sort"] = _archive_sort(self.request)
+        context["min_price"] = _price_bound(self.request, "min_price")
+        context["max_price"] = _price_bound(self.request, "max_price")
 
         return context
 
@@ -97,15 +150,8 @@ class ProductDetailView(DetailView):
     slug_url_kwarg = "slug"
 
     def get_queryset(self) -> QuerySet[Product]:
-        """Return all products and prefetch related data for the detail.
-
-        view.
-        """
-        return (
-            Product.objects.all()
-            .select_related("category")
-            .prefetch_related("reviews", "reviews__user")
-        )
+        """Return products with their category, without the reader HTML."""
+        return Product.objects.select_related("category").defer(*READER_FIELDS)
 
     def get_object(self, queryset: QuerySet[Product] | None = None) -> Product:
         """Return a product if it is accessible, raise 404 otherwise."""
@@ -140,7 +186,7 @@ class ProductDetailView(DetailView):
         raise Http404("Product not found")
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
-        """Add cart, purchase status, and reviews to context."""
+        """Add cart, purchase status, reviews and recommendations."""
         context = super().get_context_data(**kwargs)
         product = cast(Product, context["product"])
 
@@ -148,17 +194,25 @@ class ProductDetailView(DetailView):
         cart_product_ids = set(self.request.session.get("cart", {}).keys())
 
         reviews = []
+        reviews_next_cursor = None
         user_review = None
         can_review = False
         form = None
 
         if not product.is_removed:
-            reviews = product.reviews.all()  # type: ignore[attr-defined]
+            can_have_review = (
+                is_authenticated_user(self.request.user) and purchased
+            )
+            # The first page and the viewer's own review in one query.
+            page = review_page(
+                product,
+                viewer=self.request.user if can_have_review else None,
+            )
+            reviews = page.reviews
+            reviews_next_cursor = page.next_cursor
 
-            if is_authenticated_user(self.request.user) and purchased:
-                user_review = product.reviews.filter(
-                    user=cast(Any, self.request.user)
-                ).first()  # type: ignore[attr-defined]
+            if can_have_review:
+                user_review = page.viewer_review
                 can_review = not user_review
                 if can_review:
                     form = ReviewForm()
@@ -166,9 +220,13 @@ class ProductDetailView(DetailView):
         context["in_cart"] = str(product.pk) in cart_product_ids
         context["purchased"] = purchased
         context["reviews"] = reviews
+        context["reviews_next_cursor"] = reviews_next_cursor
         context["user_review"] = user_review
         context["can_review"] = can_review
         context["form"] = form
+        context["recommended_products"] = (
+            [] if product.is_removed else recommendations_for(product)
+        )
 
         return context
 
@@ -200,6 +258,21 @@ class ArchiveReadView(LoginRequiredMixin, DetailView):
 
         return super().dispatch(request, *args, **kwargs)
 
+    def _full(self) -> bool:
+        """Return True when the whole entry is shown on one page."""
+        return self.request.GET.get("full") == "1"
+
+    def get_queryset(self) -> QuerySet[Product]:
+        """Return products without the raw editor HTML.
+
+        The page renders the stored content_html, so the source is never
+        loaded. In the sectioned mode only the first section is sent, so
+        the rendered HTML is not loaded either.
+        """
+        if self._full():
+            return Product.objects.defer("content")
+        return Product.objects.defer("content", "content_html")
+
     def get_object(self, queryset: QuerySet[Product] | None = None) -> Product:
         """Return product and verify user has access."""
         obj = cast(Product, super().get_object(queryset))
@@ -209,7 +282,8 @@ class ArchiveReadView(LoginRequiredMixin, DetailView):
         ):
             return obj
 
-        if not user_has_access(self.request.user, obj):
+        # Warms the cache read by the section and progress endpoints.
+        if not cached_user_has_access(self.request.user, obj.pk):
             raise PermissionDenied(
                 "You must purchase this archive to read it."
             )
@@ -222,4 +296,127 @@ class ArchiveReadView(LoginRequiredMixin, DetailView):
         context["from_my_archive"] = (
             self.request.GET.get("from") == "my_archive"
         )
+        product = self.object
+        context["full"] = self._full()
+        if not context["full"]:
+            context["first_section"] = ProductSection.objects.filter(
+                product=product, position=0
+            ).first()
+        progress = ReadingProgress.objects.filter(
+            user=self.request.user, product=product
+        ).first()
+        context["reading_progress"] = progress
+        context["reading_percent"] = (
+            progress.percent(product.section_count) if progress else 0
+        )
         return context
+
+
+@require_GET
+def archive_section(request, slug, position):
+    """Return one section of a purchased entry as JSON.
+
+    The reading page fetches the sections after the first as the reader
+    scrolls. Access comes from the entitlement cache, so a warm request
+    runs a single query.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Login required"}, status=401)
+
+    section = (
+        ProductSection.objects.filter(product__slug=slug, position=position)
+        .values(
+            "product_id",
+            "position",
+            "title",
+            "anchor",
+            "html",
+            "product__section_count",
+        )
+        .first()
+    )
+    if section is None:
+        raise Http404("No such section.")
+    if not cached_user_has_access(request.user, section["product_id"]):
+        raise PermissionDenied("You must purchase this archive to read it.")
+
+    next_position = position + 1
+    return JsonResponse(
+        {
+            "position": section["position"],
+            "title": section["title"],
+            "anchor": section["anchor"],
+            "html": section["html"],
+            "next": (
+                next_position
+                if next_position < section["product__section_count"]
+                else None
+            ),
+        }
+    )
+
+
+@require_POST
+def archive_progress(request, slug):
+    """Record the furthest section of an entry the reader has reached."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Login required"}, status=401)
+
+    product = (
+        Product.objects.filter(slug=slug)
+        .values_list("pk", "section_count")
+        .first()
+    )
+    if product is None:
+        raise Http404("No such archive entry.")
+    product_pk, section_count = product
+    if not cached_user_has_access(request.user, product_pk):
+        raise PermissionDenied("You must purchase this archive to read it.")
+
+    try:
+        section = int(request.POST.get("section", ""))
+    except ValueError:
+        return JsonResponse({"error": "Invalid section"}, status=400)
+    if not 0 <= section < max(section_count, 1):
+        return JsonResponse({"error": "Invalid section"}, status=400)
+
+    progress, created = ReadingProgress.objects.get_or_create(
+        user=request.user, product_id=product_pk, defaults={"section": section}
+    )
+    if not created and section > progress.section:
+        progress.section = section
+        progress.save(update_fields=["section", "updated_at"])
+    return JsonResponse(
+        {
+            "section": progress.section,
+            "percent": progress.percent(section_count),
+        }
+    )
+
+
+@require_GET
+def image_derivative(request, width, height, name):
+    """Serve a card-sized WebP or AVIF derivative of a product image.
+
+    Missing derivatives are generated on first request. The URL carries
+    the content hash, so responses may be cached indefinitely.
+    """
+    if (
+        not derivatives_enabled()
+        or (width, height) not in CARD_IMAGE_SIZES
+        or not name.startswith(SOURCE_PREFIX)
+    ):
+        raise Http404("No such image.")
+
+    fmt = negotiate_format(request.headers.get("Accept", ""))
+    try:
+        path = ensure_derivative(default_storage, name, width, height, fmt)
+    except (*DERIVATIVE_ERRORS, SuspiciousFileOperation) as exc:
+        raise Http404("No such image.") from exc
+
+    response = FileResponse(
+        default_storage.open(path, "rb"), content_type=f"image/{fmt}"
+    )
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    patch_vary_headers(response, ["Accept"])
+    return response
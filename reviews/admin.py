@@ -1,9 +1,18 @@
 """Admin configuration for the reviews app."""
 
 from django.contrib import admin
+from django.db.models import Exists, OuterRef
 from django.utils.html import format_html, format_html_join
 
+from orders.models import AccessEntitlement
+
 from .models import Review
+from .services import (
+    add_review,
+    remove_review,
+    remove_reviews,
+    update_review,
+)
 
 
 @admin.register(Review)
@@ -68,6 +77,31 @@ class ReviewAdmin(admin.ModelAdmin):
 
     actions = ["delete_selected"]
 
+    def get_queryset(self, request):
+        """Load users and products, and annotate purchase verification."""
+        queryset = super().get_queryset(request)
+        entitlements = AccessEntitlement.objects.filter(
+            user=OuterRef("user"), product=OuterRef("product")
+        )
+        return queryset.select_related("user", "product").annotate(
+            has_purchased=Exists(entitlements)
+        )
+
+    def save_model(self, request, obj, form, change):
+        """Save through the service so product rating aggregates follow."""
+        if change:
+            update_review(obj)
+        else:
+            add_review(obj)
+
+    def delete_model(self, request, obj):
+        """Delete through the service so product rating aggregates follow."""
+        remove_review(obj)
+
+    def delete_queryset(self, request, queryset):
+        """Bulk delete and recompute the affected products once."""
+        remove_reviews(queryset)
+
     def rating_display(self, obj):
         """Display star rating."""
         full_stars = obj.rating
@@ -116,16 +150,21 @@ class ReviewAdmin(admin.ModelAdmin):
 
     def verified_badge(self, obj):
         """Check if user has purchased the product."""
-        has_purchased = obj.user.entitlements.filter(
-            product=obj.product
-        ).exists()
+        has_purchased = getattr(obj, "has_purchased", None)
+        if has_purchased is None:
+            has_purchased = obj.user.entitlements.filter(
+                product=obj.product
+            ).exists()
 
         if has_purchased:
             return format_html(
                 '<span class="review-verified-badge">{}</span>',
                 "✓ Verified Purchase",
             )
-        return format_html('<span class="badge-muted">Not Verified</span>')
+        return format_html(
+            '<span class="badge-muted">{}</span>',
+            "Not Verified",
+        )
 
     verified_badge.short_description = "Status"
 
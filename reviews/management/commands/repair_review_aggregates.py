@@ -0,0 +1,53 @@
+"""Management command to recompute product review aggregates."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.models import Product
+from reviews.services import REFRESH_BATCH_SIZE, refresh_review_aggregates
+
+
+class Command(BaseCommand):
+    """Rebuild review counts, sums, averages and histograms from reviews."""
+
+    help = "Recompute product review aggregates from the Review table"
+
+    def add_arguments(self, parser):
+        """Register command options."""
+        parser.add_argument(
+            "--product",
+            action="append",
+            dest="slugs",
+            metavar="SLUG",
+            help="Only repair this product (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REFRESH_BATCH_SIZE,
+            help=(
+                f"Products written per UPDATE (default: {REFRESH_BATCH_SIZE})"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Recompute the aggregates in one pass over the reviews."""
+        product_pks = None
+        if options["slugs"]:
+            found = dict(
+                Product.objects.filter(slug__in=options["slugs"]).values_list(
+                    "slug", "pk"
+                )
+            )
+            missing = sorted(set(options["slugs"]) - found.keys())
+            if missing:
+                raise CommandError(f"Unknown product(s): {', '.join(missing)}")
+            product_pks = found.values()
+
+        refreshed = refresh_review_aggregates(
+            product_pks, batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Review aggregates refreshed for {refreshed} product(s)."
+            )
+        )
@@ -0,0 +1,48 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+def backfill_review_aggregates(apps, schema_editor):
+    """Fill the new product review aggregates from existing reviews."""
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("reviews", "Review")
+
+    rows = (
+        Review.objects.values("product_id")
+        .order_by("product_id")
+        .annotate(
+            review_count=Count("pk"),
+            rating_sum=Sum("rating"),
+            **{
+                f"rating_{stars}": Count("pk", filter=Q(rating=stars))
+                for stars in range(1, 6)
+            },
+        )
+    )
+    for row in rows:
+        product_pk = row.pop("product_id")
+        row["rating_avg"] = (
+            Decimal(row["rating_sum"]) / row["review_count"]
+        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        Product.objects.filter(pk=product_pk).update(**row)
+
+
+def noop_reverse(apps, schema_editor):
+    """The columns are dropped by the products migration on reverse."""
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0016_product_review_aggregates"),
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_review_aggregates, reverse_code=noop_reverse
+        ),
+    ]
@@ -0,0 +1,116 @@
+"""Keyset pagination of a product's reviews.
+
+Reviews are listed newest first on (created_at, id). A page is fetched with
+one query that also returns the viewer's own review, so the detail page
+never loads more than one page of reviews and their authors.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models import Review
+
+REVIEWS_PAGE_SIZE = 10
+MAX_REVIEWS_PAGE_SIZE = 50
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class ReviewPage:
+    """One page of reviews plus the viewer's own review."""
+
+    reviews: list[Review] = field(default_factory=list)
+    next_cursor: str | None = None
+    viewer_review: Review | None = None
+
+
+def encode_cursor(review: Review) -> str:
+    """Return an opaque cursor pointing just after the given review."""
+    raw = f"{review.created_at.isoformat()}|{review.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Return the (created_at, id) position encoded in a cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = (
+            base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def review_page(
+    product,
+    cursor: str | None = None,
+    page_size: int = REVIEWS_PAGE_SIZE,
+    viewer=None,
+) -> ReviewPage:
+    """Return a page of a product's reviews, newest first.
+
+    With a viewer, their own review is fetched by the same query: it is
+    ordered ahead of the page and returned separately, and it also stays in
+    the page when it falls there.
+    """
+    page_size = max(1, min(page_size, MAX_REVIEWS_PAGE_SIZE))
+    reviews = Review.objects.filter(product=product).select_related(
+        "user__profile"
+    )
+
+    position = decode_cursor(cursor) if cursor else None
+    after = Q()
+    if position is not None:
+        created_at, pk = position
+        after = Q(created_at__lt=created_at) | Q(
+            created_at=created_at, pk__lt=pk
+        )
+
+    limit = page_size + 1
+    if viewer is not None:
+        if position is not None:
+            reviews = reviews.filter(after | Q(user=viewer))
+        reviews = reviews.annotate(
+            is_viewer=Case(
+                When(user=viewer, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        ordering = ["-is_viewer", "-created_at", "-pk"]
+        limit += 1
+    else:
+        reviews = reviews.filter(after)
+        ordering = ["-created_at", "-pk"]
+
+    rows = list(reviews.order_by(*ordering)[:limit])
+
+    viewer_review = None
+    if viewer is not None and rows and rows[0].is_viewer:
+        viewer_review = rows[0]
+        if position is not None and not _is_after(viewer_review, position):
+            rows = rows[1:]
+        rows.sort(
+            key=lambda review: (review.created_at, review.pk), reverse=True
+        )
+
+    page = rows[:page_size]
+    next_cursor = encode_cursor(page[-1]) if len(rows) > page_size else None
+    return ReviewPage(
+        reviews=page, next_cursor=next_cursor, viewer_review=viewer_review
+    )
+
+
+def _is_after(review: Review, position: tuple[datetime, int]) -> bool:
+    """Return True when a review sorts after the cursor position."""
+    return (review.created_at, review.pk) < position
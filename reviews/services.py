@@ -0,0 +1,181 @@
+"""Review writes that keep the product review aggregates in step.
+
+Product.review_count, rating_sum, rating_avg and rating_1..rating_5 are
+denormalized from the Review table. Every review write goes through these
+functions, which update the review and its product's aggregates in one
+transaction with the product row locked.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import batched
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from products.models import Product
+
+from .models import Review
+
+logger = logging.getLogger(__name__)
+
+RATING_FIELDS = {stars: f"rating_{stars}" for stars in range(1, 6)}
+
+AGGREGATE_FIELDS = [
+    "review_count",
+    "rating_sum",
+    "rating_avg",
+    *RATING_FIELDS.values(),
+]
+
+REFRESH_BATCH_SIZE = 1000
+
+
+def _average(rating_sum: int, review_count: int) -> Decimal:
+    """Return the mean rating rounded to two places."""
+    if not review_count:
+        return Decimal("0.00")
+    return (Decimal(rating_sum) / review_count).quantize(
+        Decimal("0.01"), rounding=ROUND_HALF_UP
+    )
+
+
+def _adjust_aggregates(changes: dict[int, list[tuple[int, int]]]) -> None:
+    """Apply (rating, +1/-1) changes to each product's aggregates.
+
+    The product rows are locked in primary-key order so concurrent writers
+    cannot lose updates or deadlock.
+    """
+    products = (
+        Product.objects.select_for_update()
+        .filter(pk__in=changes)
+        .order_by("pk")
+        .only("pk", *AGGREGATE_FIELDS)
+    )
+    for product in products:
+        values = {field: getattr(product, field) for field in AGGREGATE_FIELDS}
+        for rating, step in changes[product.pk]:
+            values["review_count"] += step
+            values["rating_sum"] += rating * step
+            values[RATING_FIELDS[rating]] += step
+        values["rating_avg"] = _average(
+            values["rating_sum"], values["review_count"]
+        )
+        Product.objects.filter(pk=product.pk).update(**values)
+
+
+def add_review(review: Review) -> Review:
+    """Save a new review and count it in its product's aggregates."""
+    with transaction.atomic():
+        review.save()
+        _adjust_aggregates({review.product_id: [(review.rating, 1)]})
+    return review
+
+
+def update_review(review: Review) -> Review:
+    """Save changes to a review and move its rating in the aggregates."""
+    with transaction.atomic():
+        stored = (
+            Review.objects.select_for_update()
+            .values("product_id", "rating")
+            .get(pk=review.pk)
+        )
+        review.save()
+
+        changes: dict[int, list[tuple[int, int]]] = {}
+        changes.setdefault(stored["product_id"], []).append(
+            (stored["rating"], -1)
+        )
+        changes.setdefault(review.product_id, []).append((review.rating, 1))
+        _adjust_aggregates(changes)
+    return review
+
+
+def remove_review(review: Review) -> None:
+    """Delete a review and take it out of its product's aggregates."""
+    with transaction.atomic():
+        stored = (
+            Review.objects.select_for_update()
+            .values("product_id", "rating")
+            .filter(pk=review.pk)
+            .first()
+        )
+        review.delete()
+        if stored:
+            _adjust_aggregates(
+                {stored["product_id"]: [(stored["rating"], -1)]}
+            )
+
+
+def remove_reviews(queryset) -> int:
+    """Delete a queryset of reviews and recompute the affected products."""
+    with transaction.atomic():
+        product_pks = set(queryset.values_list("product_id", flat=True))
+        deleted, _details = queryset.delete()
+        refresh_review_aggregates(product_pks)
+    return deleted
+
+
+def _aggregate_rows(product_pks: Iterable[int] | None):
+    """Return per-product review aggregates computed from the Review table."""
+    reviews = Review.objects.all()
+    if product_pks is not None:
+        reviews = reviews.filter(product_id__in=product_pks)
+    return (
+        reviews.values("product_id")
+        .order_by("product_id")
+        .annotate(
+            review_count=Count("pk"),
+            rating_sum=Sum("rating"),
+            **{
+                field: Count("pk", filter=Q(rating=stars))
+                for stars, field in RATING_FIELDS.items()
+            },
+        )
+        .iterator()
+    )
+
+
+def refresh_review_aggregates(
+    product_pks: Iterable[int] | None = None,
+    batch_size: int = REFRESH_BATCH_SIZE,
+) -> int:
+    """Recompute the aggregates of the given products (default: all).
+
+    One grouped query reads the Review table, products without reviews are
+    reset in one UPDATE, and the rest are written with bulk_update. Return
+    the number of products that have reviews.
+    """
+    if product_pks is not None:
+        product_pks = set(product_pks)
+        if not product_pks:
+            return 0
+
+    with transaction.atomic():
+        targets = Product.objects.all()
+        if product_pks is not None:
+            targets = targets.filter(pk__in=product_pks)
+        targets.update(
+            review_count=0,
+            rating_sum=0,
+            rating_avg=Decimal("0.00"),
+            **{field: 0 for field in RATING_FIELDS.values()},
+        )
+
+        refreshed = 0
+        for rows in batched(_aggregate_rows(product_pks), batch_size):
+            products = []
+            for row in rows:
+                product = Product(pk=row.pop("product_id"), **row)
+                product.rating_avg = _average(
+                    product.rating_sum, product.review_count
+                )
+                products.append(product)
+            Product.objects.bulk_update(products, AGGREGATE_FIELDS)
+            refreshed += len(products)
+
+    logger.info("Refreshed review aggregates for %s product(s)", refreshed)
+    return refreshed
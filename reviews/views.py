@@ -2,8 +2,10 @@
 
 from django.contrib import messages
 from django.db import IntegrityError
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.http import require_http_methods
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_GET, require_http_methods
 
 from accounts.decorators import verified_email_required
 from orders.models import AccessEntitlement
@@ -11,6 +13,8 @@ from products.models import Product
 
 from .forms import ReviewForm
 from .models import Review
+from .pagination import InvalidCursor, review_page
+from .services import add_review, remove_review, update_review
 
 
 def _user_has_entitlement(user, product) -> bool:
@@ -45,7 +49,7 @@ def create_review(request, slug):
         review.user = request.user
         review.product = product
         try:
-            review.save()
+            add_review(review)
             messages.success(request, "Your review has been submitted.")
         except IntegrityError:
             messages.info(
@@ -69,7 +73,7 @@ def edit_review(request, slug, review_id):
     if request.method == "POST":
         form = ReviewForm(request.POST, instance=review)
         if form.is_valid():
-            form.save()
+            update_review(form.save(commit=False))
             messages.success(request, "Your review has been updated.")
             return redirect("product_detail", slug=slug)
         messages.error(request, "Please correct the errors in your review.")
@@ -94,6 +98,52 @@ def delete_review(request, slug, review_id):
         Review, id=review_id, product=product, user=request.user
     )
 
-    review.delete()
+    remove_review(review)
     messages.success(request, "Your review has been deleted.")
     return redirect("product_detail", slug=slug)
+
+
+def _author_name(user) -> str:
+    """Return the reviewer's display name, tolerating a missing profile."""
+    profile = getattr(user, "profile", None)
+    return profile.get_display_name() if profile else user.username
+
+
+@require_GET
+def review_list(request, slug):
+    """Return a page of a product's reviews as JSON and an HTML fragment."""
+    product_pk = (
+        Product.objects.filter(slug=slug, is_active=True, is_removed=False)
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if product_pk is None:
+        raise Http404("No such archive entry.")
+
+    try:
+        page = review_page(product_pk, cursor=request.GET.get("after") or None)
+    except InvalidCursor:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+    html = render_to_string(
+        "reviews/review_cards.html",
+        {"reviews": page.reviews},
+        request=request,
+    )
+    return JsonResponse(
+        {
+            "reviews": [
+                {
+                    "id": review.pk,
+                    "title": review.title,
+                    "body": review.body,
+                    "rating": review.rating,
+                    "created_at": review.created_at.isoformat(),
+                    "author": _author_name(review.user),
+                }
+                for review in page.reviews
+            ],
+            "html": html,
+            "next": page.next_cursor,
+        }
+    )
@@ -0,0 +1,101 @@
+// Archive Reader - Loads the sections of an archive entry as the reader
+// scrolls and records the furthest section reached
+
+(() => {
+  const container = document.getElementById('archive-sections');
+  if (!container) return;
+
+  const sectionUrl = container.getAttribute('data-section-url');
+  const progressUrl = container.getAttribute('data-progress-url');
+  const csrfToken = container.getAttribute('data-csrf-token');
+  const sentinel = document.getElementById('archive-sections-sentinel');
+  let next = container.getAttribute('data-next-section');
+  let furthest = Number(container.getAttribute('data-progress') || 0);
+  let loading = null;
+
+  const urlFor = (position) => sectionUrl.replace(/\d+\/$/, `${position}/`);
+
+  const saveProgress = (position) => {
+    if (position <= furthest) return;
+    furthest = position;
+    const body = new URLSearchParams({ section: String(position) });
+    fetch(progressUrl, {
+      method: 'POST',
+      credentials: 'same-origin',
+      headers: { 'X-CSRFToken': csrfToken },
+      body,
+    }).catch(() => {
+      // Progress is best effort; the next section seen will retry.
+      furthest = position - 1;
+    });
+  };
+
+  const seen = new IntersectionObserver((entries) => {
+    entries.forEach((entry) => {
+      if (!entry.isIntersecting) return;
+      saveProgress(Number(entry.target.getAttribute('data-position')));
+      seen.unobserve(entry.target);
+    });
+  });
+  container.querySelectorAll('.archive-section').forEach((section) => {
+    seen.observe(section);
+  });
+
+  const loadNext = async () => {
+    if (loading) return loading;
+    if (!next) return false;
+
+    loading = (async () => {
+      try {
+        const res = await fetch(urlFor(next), {
+          method: 'GET',
+          credentials: 'same-origin',
+          headers: { Accept: 'application/json' },
+        });
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+
+        const data = await res.json();
+        const section = document.createElement('section');
+        section.id = `archive-section-${data.position}`;
+        section.className = 'archive-section';
+        section.setAttribute('data-position', data.position);
+        section.innerHTML = data.html;
+        container.appendChild(section);
+        seen.observe(section);
+
+        next = data.next === null ? '' : String(data.next);
+        if (!next && sentinel) sentinel.remove();
+        return true;
+      } catch (err) {
+        // Keep the sentinel so scrolling back to it retries.
+        return false;
+      } finally {
+        loading = null;
+      }
+    })();
+    return loading;
+  };
+
+  const loadThrough = async (position) => {
+    while (next && Number(next) <= position) {
+      if (!(await loadNext())) return;
+    }
+  };
+
+  if (sentinel) {
+    new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) loadNext();
+    }, { rootMargin: '600px 0px' }).observe(sentinel);
+  }
+
+  document.querySelectorAll('a[data-section]').forEach((link) => {
+    link.addEventListener('click', async (event) => {
+      const target = link.getAttribute('href').slice(1);
+      if (document.getElementById(target)) return;
+      event.preventDefault();
+      await loadThrough(Number(link.getAttribute('data-section')));
+      const element = document.getElementById(target);
+      if (element) element.scrollIntoView();
+    });
+  });
+})();
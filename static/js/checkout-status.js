@@ -1,65 +1,65 @@
-// Checkout Status Poller - Auto-refreshes the page when payment status changes
+// Checkout Status Watcher - Long-polls the server and refreshes the page when payment status changes
 
 (() => {
   const panel = document.getElementById('paymentStatusPanel');
   if (!panel) return;
 
-  const statusUrl = panel.getAttribute('data-status-url');
-  if (!statusUrl) return;
+  const waitUrl = panel.getAttribute('data-wait-url');
+  if (!waitUrl) return;
 
   const statusText = document.getElementById('paymentStatusText');
   const statusHint = document.getElementById('paymentStatusHint');
 
+  const knownStatus = panel.getAttribute('data-status') || 'pending';
+
+  // Each request is held open by the server until the status changes,
+  // so a handful of rounds covers several minutes of waiting.
   let attempts = 0;
-  const maxAttempts = 30;
-  const intervalMs = 2500;
+  const maxAttempts = 8;
+  const retryDelayMs = 2500;
+
+  const showMessage = (text) => {
+    if (statusText) statusText.textContent = text;
+    if (statusHint) statusHint.textContent = '';
+  };
 
-  const poll = async () => {
+  const waitForChange = async () => {
     attempts += 1;
 
     try {
-      const res = await fetch(statusUrl, {
+      const url = `${waitUrl}?since=${encodeURIComponent(knownStatus)}`;
+      const res = await fetch(url, {
         method: 'GET',
         credentials: 'same-origin',
         headers: { Accept: 'application/json' },
       });
 
-      if (!res.ok) {
-        if (attempts >= maxAttempts && statusText) {
-          statusText.textContent = 'Still processing. You can refresh, or check again later.';
+      if (res.ok) {
+        const data = await res.json();
+        if (data.status && data.status !== knownStatus) {
+          window.location.reload();
+          return;
         }
-        return;
       }
 
-      const data = await res.json();
-      const status = data.status;
-
-      if (status === 'paid' || status === 'failed') {
-        window.location.reload();
+      if (attempts >= maxAttempts) {
+        showMessage(
+          'Payment is taking longer than expected. You can refresh now, or come back later from your dashboard.'
+        );
         return;
       }
 
-      if (attempts >= maxAttempts) {
-        if (statusText) {
-          statusText.textContent =
-            'Payment is taking longer than expected. You can refresh now, or come back later from your dashboard.';
-        }
-        if (statusHint) statusHint.textContent = '';
-      }
+      // The server already waited, so ask again straight away.
+      // Back off briefly only when the request itself failed.
+      setTimeout(waitForChange, res.ok ? 0 : retryDelayMs);
     } catch (err) {
-      if (attempts >= maxAttempts && statusText) {
-        statusText.textContent = 'Connection issue while checking status. Please refresh.';
+      if (attempts >= maxAttempts) {
+        showMessage('Connection issue while checking status. Please refresh.');
+        return;
       }
+      setTimeout(waitForChange, retryDelayMs);
     }
   };
 
-  poll();
-
-  const timer = setInterval(() => {
-    if (attempts >= maxAttempts) {
-      clearInterval(timer);
-      return;
-    }
-    poll();
-  }, intervalMs);
+  waitForChange();
 })();
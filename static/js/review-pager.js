@@ -0,0 +1,40 @@
+// Review Pager - Appends the next page of reviews from the review list endpoint
+
+(() => {
+  const button = document.getElementById('load-more-reviews');
+  const list = document.getElementById('review-list');
+  if (!button || !list) return;
+
+  const reviewsUrl = button.getAttribute('data-reviews-url');
+
+  const loadMore = async () => {
+    const cursor = button.getAttribute('data-next-cursor');
+    if (!reviewsUrl || !cursor) return;
+
+    button.disabled = true;
+    try {
+      const url = `${reviewsUrl}?after=${encodeURIComponent(cursor)}`;
+      const res = await fetch(url, {
+        method: 'GET',
+        credentials: 'same-origin',
+        headers: { Accept: 'application/json' },
+      });
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+
+      const data = await res.json();
+      list.insertAdjacentHTML('beforeend', data.html);
+
+      if (data.next) {
+        button.setAttribute('data-next-cursor', data.next);
+        button.disabled = false;
+      } else {
+        button.remove();
+      }
+    } catch (err) {
+      // Leave the button enabled so the reader can retry.
+      button.disabled = false;
+    }
+  };
+
+  button.addEventListener('click', loadMore);
+})();